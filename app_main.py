@@ -11,8 +11,8 @@ from PIL import Image
 
 # 로컬 모듈
 import constants as const
-import utils
 import updater
+import video_engine
 from ui_widgets import TimelineSlider, QueueWindow
 from logic_media import MediaMixin
 from logic_player import PlayerMixin
@@ -28,18 +28,22 @@ except ImportError:
     # except ImportError:
     #     pass
 
-# Drag & Drop
-if utils.HAS_DND:
+# Drag & Drop 라이브러리 가용성 확인 (UI 전용: 헤드리스 실행에서는 로드하지 않도록 여기서 확인)
+HAS_DND = False
+try:
     from tkinterdnd2 import DND_FILES, TkinterDnD
+    HAS_DND = True
+except (ImportError, RuntimeError, Exception):
+    HAS_DND = False
 
 class VideoToGifApp(ctk.CTk, 
-                    TkinterDnD.DnDWrapper if utils.HAS_DND else object,
+                    TkinterDnD.DnDWrapper if HAS_DND else object,
                     MediaMixin, PlayerMixin, ConverterMixin):
     
     def __init__(self):
         ctk.CTk.__init__(self)
         ctk.set_appearance_mode("Dark")
-        if utils.HAS_DND:
+        if HAS_DND:
             TkinterDnD.DnDWrapper.__init__(self)
             try:
                 self.TkdndVersion = TkinterDnD._require(self)
@@ -74,7 +78,8 @@ class VideoToGifApp(ctk.CTk,
         self.is_proxy_active = False 
         self.is_proxy_generating = False 
         self.stop_proxy_request = False 
-        self.frame_cache = {} 
+        self.frame_cache = video_engine.PreviewFrameCache() 
+        self.playback_engine = None
         self.proxy_files = [] 
         self.proxy_thread = None
         
@@ -88,10 +93,14 @@ class VideoToGifApp(ctk.CTk,
         self.crop_coords = [0.0, 0.0, 1.0, 1.0]
         self.last_preview_time = -1.0
         self.preview_update_timer = None 
+        self._scrub_target = 0.0
+        self._color_preview_timer = None
         self.active_crop_handle = None
         self.crop_start_pos = None
         self.last_preview_img_data = None
         self.last_preview_img = None
+        self._preview_image_item = None
+        self._crop_overlay_items = []
         self.orig_crop_coords = None
         self.latest_update_data = None
         
@@ -124,6 +133,9 @@ class VideoToGifApp(ctk.CTk,
         # WebP 최적화 관련 추가 변수 (Quality 0~100, Lossless 여부)
         self.webp_quality_var = ctk.StringVar(value="80")
         self.webp_lossless_var = ctk.BooleanVar(value=False)
+
+        # GIF 디더링 방식 (FFMPEG paletteuse)
+        self.gif_dither_var = ctk.StringVar(value=const.GIF_DITHER_DEFAULT)
         
         # 색보정 변수
         self.exposure_var = ctk.DoubleVar(value=0.0)
@@ -252,6 +264,12 @@ class VideoToGifApp(ctk.CTk,
         self.entry_webp_quality = ctk.CTkEntry(self.webp_opt_container, width=35, textvariable=self.webp_quality_var)
         self.entry_webp_quality.pack(side="left", padx=2)
 
+        # GIF 전용 컨테이너 (Dither)
+        self.gif_opt_container = ctk.CTkFrame(self.dynamic_opt_frame, fg_color="transparent")
+        ctk.CTkLabel(self.gif_opt_container, text="Dither:", font=("Arial", 11)).pack(side="left", padx=(5, 2))
+        self.combo_gif_dither = ctk.CTkComboBox(self.gif_opt_container, values=const.GIF_DITHER_OPTIONS, width=120, variable=self.gif_dither_var, state="readonly")
+        self.combo_gif_dither.pack(side="left", padx=2)
+
         self._update_export_ui(self.export_format_var.get())
         
         etc_frame = ctk.CTkFrame(self.bottom_options, fg_color="#2b2b2b", corner_radius=8)
@@ -318,10 +336,10 @@ class VideoToGifApp(ctk.CTk,
                     val = float(e.get())
                     clamped = max(mi, min(ma, val))
                     v.set(clamped)
-                    self.update_preview_frame(self.last_preview_time)
+                    self.schedule_color_preview()
                 except ValueError: pass
             var.trace_add("write", update_entry)
-            var.trace_add("write", lambda *args: self.update_preview_frame(self.last_preview_time))
+            var.trace_add("write", lambda *args: self.schedule_color_preview())
             entry.bind("<Return>", on_entry_change)
             entry.bind("<FocusOut>", on_entry_change)
 
@@ -333,7 +351,7 @@ class VideoToGifApp(ctk.CTk,
         self.exposure_var.set(0.0); self.gamma_var.set(1.0); self.contrast_var.set(0.0); self.saturation_var.set(1.0); self.tint_var.set(0.0); self.temperature_var.set(0.0)
 
     def _update_export_ui(self, choice):
-        self.check_alpha.pack_forget(); self.combo_seq_format.pack_forget(); self.bitrate_container.pack_forget(); self.loop_container.pack_forget(); self.webp_opt_container.pack_forget();
+        self.check_alpha.pack_forget(); self.combo_seq_format.pack_forget(); self.bitrate_container.pack_forget(); self.loop_container.pack_forget(); self.webp_opt_container.pack_forget(); self.gif_opt_container.pack_forget()
 
         fps_state = "disabled" if choice == "Thumbnail" else "normal"
         self.fps_slider.configure(state=fps_state)
@@ -342,6 +360,7 @@ class VideoToGifApp(ctk.CTk,
         
         if choice == "GIF":
             self.check_alpha.pack(side="left", padx=10); self.loop_container.pack(side="left", padx=5)
+            self.gif_opt_container.pack(side="left", padx=5)
         elif choice == "WebM":
             self.check_alpha.pack(side="left", padx=10); self.bitrate_container.pack(side="left", padx=5)
         elif choice == "WebP":
@@ -393,12 +412,12 @@ class VideoToGifApp(ctk.CTk,
             self.color_panel.grid()
         else: 
             self.color_panel.grid_remove()
-        if self.clip: self.update_preview_frame(self.last_preview_time)
+        self.schedule_color_preview()
 
     def on_crop_switch_toggle(self):
         if not self.crop_enabled_var.get():
             self.reset_crop()
-        self.update_preview_frame(self.last_preview_time)
+        else: self.refresh_crop_overlay()
 
     def on_proxy_switch_toggle(self):
         if self.proxy_enabled_var.get():
@@ -427,7 +446,7 @@ class VideoToGifApp(ctk.CTk,
                 if self.is_playing: self.toggle_playback()
                 self.clip = target_clip
                 self.is_proxy_active = is_proxy
-                self.frame_cache = {}
+                self.frame_cache.clear()
         self.after(0, lambda: self.on_timeline_change(self.timeline.in_point * self.duration, self.timeline.out_point * self.duration, self.timeline.play_head * self.duration))
 
     def _create_proxy_background(self, original_path, proxy_path, load_id):
@@ -0,0 +1,189 @@
+"""
+헤드리스 일괄 변환 실행기 (customtkinter / tkinterdnd2 없이 동작)
+
+사용 예:
+    python batch_cli.py queue.json -o out/                  # 대기열 내보내기(JSON) 파일 변환
+    python batch_cli.py renders/ -o out/ --preset gif.json  # 폴더 스캔 + 설정 프리셋(JSON, 작업 필드)
+    python batch_cli.py renders/ -o out/ --format WebM --width 960 --fps 15
+    python batch_cli.py dropbox/ -o out/ --preset gif.json --watch   # 감시 모드: 새로 들어오는 렌더를 계속 변환
+
+진행 상황은 표준 출력에 한 줄에 하나씩 JSON 이벤트로 출력됩니다.
+    {"event": "start" | "progress" | "done" | "failed" | "cancelled" | "summary", ...}
+    감시 모드는 새 소스를 찾을 때마다 "queued", 첫 종료 신호에 "stopping"을 출력합니다.
+종료 코드: 모두 성공 0, 실패한 작업이 있으면 1, 중단 시 130, 입력 오류 2
+감시 모드에서 첫 SIGINT/SIGTERM은 새 작업을 받지 않고 진행 중인 작업을 마친 뒤 종료하며, 두 번째 신호는 즉시 중단합니다.
+"""
+import os
+import sys
+import json
+import time
+import signal
+import argparse
+import threading
+import multiprocessing
+import convert_engine
+import batch_worker
+import batch_scheduler
+import folder_watcher
+import constants as const
+
+class _CliControl:
+    """배치 제어 상태 (SIGINT/SIGTERM 시 취소, 감시 모드는 첫 신호에 중지)"""
+    cancel_requested = False
+    batch_paused = False
+    stop_requested = False
+
+class _JsonProgressLogger:
+    """작업 진행률을 1% 단위로 JSON 이벤트로 출력하는 로거"""
+    def __init__(self, emit, index):
+        self.emit, self.index, self.last_percent = emit, index, -1
+
+    def bars_update(self, bar, index, total=None):
+        if not total: return
+        percent = max(0, min(100, int(index * 100 / total)))
+        if percent != self.last_percent:
+            self.last_percent = percent
+            self.emit("progress", index=self.index, percent=percent)
+
+def _make_emitter(stream=None):
+    stream = stream or sys.stdout  # 호출 시점의 표준 출력 (가져올 때 고정하지 않음)
+    lock = threading.Lock()
+    def emit(event, **fields):
+        line = json.dumps(dict(event=event, time=round(time.time(), 3), **fields), ensure_ascii=False)
+        with lock:
+            stream.write(line + "\n"); stream.flush()
+    return emit
+
+def _resolve(path, base_dir):
+    return path if os.path.isabs(path) or not base_dir else os.path.normpath(os.path.join(base_dir, path))
+
+def load_queue_json(path):
+    """대기열 JSON을 읽어 작업 목록을 돌려줍니다. 상대 경로는 JSON 파일 위치 기준으로 해석합니다."""
+    base_dir = os.path.dirname(os.path.abspath(path))
+    with open(path, 'r', encoding='utf-8') as f:
+        jobs = json.load(f)
+    for job in jobs:
+        if job.get('is_sequence') and job.get('sequence_paths'):
+            job['sequence_paths'] = [_resolve(p, base_dir) for p in job['sequence_paths']]
+        elif job.get('path'):
+            job['path'] = _resolve(job['path'], base_dir)
+        job['status'] = "대기"
+    return jobs
+
+def build_preset(args):
+    preset = {}
+    if args.preset:
+        with open(args.preset, 'r', encoding='utf-8') as f: preset.update(json.load(f))
+    if args.format: preset['export_format'] = args.format
+    if args.width: preset['width'] = args.width
+    if args.fps: preset['fps'] = args.fps
+    return preset
+
+def watch_jobs(watcher, preset, emit, control, poll_interval=const.WATCH_POLL_INTERVAL):
+    """감시 폴더에서 쓰기가 끝난 새 소스를 작업으로 만들어 차례로 내보냅니다. 중지/취소 요청 시 끝납니다."""
+    stopped = lambda: control.stop_requested or control.cancel_requested
+    while not stopped():
+        for source in watcher.poll():
+            job = convert_engine.make_job(source, preset)
+            emit("queued", file=job['filename'], source=source if isinstance(source, str) else os.path.dirname(source[0]),
+                 frames=None if isinstance(source, str) else len(source))
+            yield job
+        deadline = time.time() + poll_interval
+        while time.time() < deadline and not stopped():
+            time.sleep(0.2)
+
+def run_batch(jobs, out_dir, emit, control, cpu_threads=None, max_jobs=None):
+    """
+    작업 목록을 예산 스케줄러 + 작업 프로세스로 실행합니다. (성공 수, 실패 수) 반환
+    jobs는 목록 외에 watch_jobs 같은 생성기도 되며, 이때는 예산이 허락할 때마다 다음 작업을 받습니다.
+    """
+    budget = batch_scheduler.BatchResourceBudget(cpu_threads=cpu_threads, max_jobs=max_jobs or const.BATCH_MAX_PARALLEL_JOBS)
+    lock, counts = threading.Lock(), {'done': 0, 'failed': 0}
+
+    def run_job(index, job, threads, memory):
+        out_path = None
+        try:
+            out_path = convert_engine.reserve_output_path(out_dir, job, lock)
+            emit("start", index=index, file=job.get('filename'), output=out_path, format=job.get('export_format', "GIF"), threads=threads)
+            batch_worker.run_job_isolated(job, out_path, control, _JsonProgressLogger(emit, index),
+                                          threads=threads, memory_limit=batch_worker.job_memory_limit(memory))
+            with lock: counts['done'] += 1
+            emit("done", index=index, file=job.get('filename'), output=out_path)
+        except Exception as e:
+            convert_engine.discard_reserved_output(out_path)
+            if str(e) == "CANCEL_REQUESTED":
+                emit("cancelled", index=index, file=job.get('filename'))
+            else:
+                with lock: counts['failed'] += 1
+                emit("failed", index=index, file=job.get('filename'), message=str(e))
+
+    def on_error(index, job, exc):
+        with lock: counts['failed'] += 1
+        emit("failed", index=index, file=job.get('filename') if isinstance(job, dict) else None, message=str(exc))
+
+    emit("batch", total=len(jobs) if isinstance(jobs, list) else None, output_dir=out_dir,
+         cpu_threads=budget.cpu_threads, memory_budget=budget.memory_bytes)
+    batch_scheduler.run_batch_scheduled(jobs, run_job, budget, is_cancelled=lambda: control.cancel_requested or control.stop_requested,
+                                        on_error=on_error)
+    return counts['done'], counts['failed']
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="gifMaker 헤드리스 일괄 변환")
+    parser.add_argument("source", help="대기열 JSON 파일 또는 미디어 폴더")
+    parser.add_argument("-o", "--output", required=True, help="출력 폴더")
+    parser.add_argument("--preset", help="폴더 스캔 시 작업에 덮어쓸 설정(JSON 객체: export_format, width, fps, color_settings 등)")
+    parser.add_argument("--format", choices=const.EXPORT_FORMATS, help="출력 형식 (프리셋보다 우선)")
+    parser.add_argument("--width", type=int, help="출력 폭")
+    parser.add_argument("--fps", type=int, help="출력 fps")
+    parser.add_argument("--cpu-threads", type=int, help="전체 CPU 스레드 예산 (기본: 코어 수)")
+    parser.add_argument("--max-jobs", type=int, help="동시 작업 수 상한")
+    parser.add_argument("--watch", action="store_true", help="폴더를 계속 감시하며 새로 들어오는 영상/시퀀스를 변환")
+    parser.add_argument("--settle", type=float, default=const.WATCH_SETTLE_SECONDS, help="파일이 이 시간(초) 동안 변하지 않으면 완료로 판단 (감시 모드)")
+    parser.add_argument("--include-existing", action="store_true", help="감시 시작 시 이미 있던 파일도 변환 (감시 모드)")
+    args = parser.parse_args(argv)
+
+    emit = _make_emitter()
+    out_dir = os.path.abspath(args.output)
+    try:
+        if args.watch:
+            if not os.path.isdir(args.source): raise ValueError(f"감시할 폴더가 없습니다: {args.source}")
+            preset = build_preset(args)
+            # 출력 폴더가 감시 폴더 안에 있어도 결과물을 다시 변환하지 않도록 제외
+            watcher = folder_watcher.FolderWatcher(args.source, settle_seconds=args.settle,
+                                                   include_existing=args.include_existing, exclude=[out_dir])
+        elif os.path.isdir(args.source):
+            preset = build_preset(args)
+            sequences, videos = convert_engine.collect_folder_media(args.source)
+            jobs = [convert_engine.make_job(paths, preset) for paths in sequences]
+            jobs += [convert_engine.make_job(v, preset) for v in videos]
+        else:
+            jobs = load_queue_json(args.source)
+            overrides = build_preset(args)
+            for job in jobs: job.update(overrides)
+    except (OSError, ValueError) as e:
+        emit("error", message=str(e))
+        return 2
+    os.makedirs(out_dir, exist_ok=True)
+
+    control = _CliControl()
+    def request_cancel(signum, frame):
+        if args.watch and not control.stop_requested:
+            control.stop_requested = True
+            emit("stopping")
+        else:
+            control.cancel_requested = True
+    signal.signal(signal.SIGINT, request_cancel)
+    if hasattr(signal, 'SIGTERM'): signal.signal(signal.SIGTERM, request_cancel)
+
+    if args.watch:
+        jobs = watch_jobs(watcher, preset, emit, control)
+    done, failed = run_batch(jobs, out_dir, emit, control, args.cpu_threads, args.max_jobs)
+    total = len(jobs) if isinstance(jobs, list) else done + failed
+    emit("summary", total=total, succeeded=done, failed=failed, cancelled=control.cancel_requested)
+    if control.cancel_requested: return 130
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    # 패키징(PyInstaller) 환경의 작업 프로세스 지원
+    multiprocessing.freeze_support()
+    sys.exit(main())
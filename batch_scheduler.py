@@ -0,0 +1,202 @@
+import os
+import threading
+from PIL import Image
+import constants as const
+import video_engine
+import convert_engine
+
+# -------------------------------------------------------------------------
+# 일괄 변환 스케줄러 (CPU/메모리 예산)
+# -------------------------------------------------------------------------
+def get_system_memory():
+    """물리 메모리 크기(바이트). 확인할 수 없으면 None"""
+    try:
+        if os.name == 'nt':
+            import ctypes
+            class MEMORYSTATUSEX(ctypes.Structure):
+                _fields_ = [("dwLength", ctypes.c_ulong), ("dwMemoryLoad", ctypes.c_ulong),
+                            ("ullTotalPhys", ctypes.c_ulonglong), ("ullAvailPhys", ctypes.c_ulonglong),
+                            ("ullTotalPageFile", ctypes.c_ulonglong), ("ullAvailPageFile", ctypes.c_ulonglong),
+                            ("ullTotalVirtual", ctypes.c_ulonglong), ("ullAvailVirtual", ctypes.c_ulonglong),
+                            ("ullAvailExtendedVirtual", ctypes.c_ulonglong)]
+            stat = MEMORYSTATUSEX(); stat.dwLength = ctypes.sizeof(MEMORYSTATUSEX)
+            if ctypes.windll.kernel32.GlobalMemoryStatusEx(ctypes.byref(stat)):
+                return int(stat.ullTotalPhys)
+            return None
+        return os.sysconf('SC_PAGE_SIZE') * os.sysconf('SC_PHYS_PAGES')
+    except (AttributeError, ValueError, OSError):
+        return None
+
+def _job_frame_sizes(job):
+    """(원본 픽셀 수, 출력 픽셀 수). 원본 크기는 메타데이터 캐시에서 가져오며 없으면 출력 폭 기준 16:9로 가정"""
+    out_w = max(16, int(job.get('width') or 1280))
+    src_w, src_h = None, None
+    if job.get('is_sequence') and job.get('sequence_paths'):
+        try:
+            with Image.open(job['sequence_paths'][0]) as img: src_w, src_h = img.size
+        except Exception: pass
+    elif job.get('path'):
+        meta = video_engine.get_video_metadata(job['path'])
+        if meta: src_w, src_h = meta.get('width'), meta.get('height')
+    if not src_w or not src_h:
+        src_w, src_h = out_w, out_w * 9 // 16
+    if job.get('crop_enabled') and job.get('crop'):
+        x1, y1, x2, y2 = job['crop']
+        crop_w, crop_h = max(0.01, abs(x2 - x1)), max(0.01, abs(y2 - y1))
+    else:
+        crop_w, crop_h = 1.0, 1.0
+    out_h = max(16, int(out_w * (src_h * crop_h) / max(1, src_w * crop_w)))
+    return src_w * src_h, out_w * out_h
+
+def _estimate_direct_threads(job, src_px, out_px):
+    """다이렉트 FFMPEG 작업의 (디코드 측, 인코드 측) 스레드 수 추정"""
+    fmt = job.get('export_format', "GIF")
+    # 디코더는 원본 2MP당 1스레드 + 크롭/스케일/색보정 필터 그래프 1스레드
+    decode_threads = max(1, min(8, -(-src_px // 2073600))) + 1
+    if fmt == "MP4":
+        # x264는 출력 360p 분량당 1스레드 정도에서 선형으로 확장
+        encode_threads = max(1, min(16, -(-out_px // 230400)))
+    elif fmt == "WebM":
+        # VP9는 타일 열(256px 이상) 수만큼 병렬화
+        encode_threads = max(1, min(16, 2 * max(1, int(job.get('width') or 1280) // 256)))
+    else:
+        # palettegen/paletteuse는 단일 스레드 필터
+        encode_threads = 1
+    return decode_threads, encode_threads
+
+def split_job_threads(job, threads):
+    """
+    스케줄러가 배정한 스레드 수를 (디코드 측, 인코드 측)으로 나눕니다. 추정치 비율대로 나누며
+    합이 배정값을 넘지 않습니다. (각 측 최소 1스레드이므로 배정이 1이면 2)
+    """
+    src_px, out_px = _job_frame_sizes(job)
+    decode, encode = _estimate_direct_threads(job, src_px, out_px)
+    if threads >= decode + encode: return decode, encode
+    decode = max(1, min(threads - 1, round(threads * decode / (decode + encode))))
+    return decode, max(1, threads - decode)
+
+def estimate_job_resources(job):
+    """
+    작업 하나가 쓸 (CPU 스레드 수, 최대 메모리 바이트)를 형식과 해상도로 추정합니다.
+    - 다이렉트 FFMPEG(MP4/WebM/GIF): 디코더(+필터 그래프)와 인코더 스레드의 합 (split_job_threads로 다시 나눔)
+    - MoviePy(WebP/Sequence/Thumbnail): Python 프레임 처리 1스레드 + FFMPEG 리더 1스레드
+    메모리는 스레드별 프레임 버퍼와 인코더 lookahead(x264)/전체 프레임 버퍼링(GIF 1패스)을 포함합니다.
+    """
+    fmt = job.get('export_format', "GIF")
+    src_px, out_px = _job_frame_sizes(job)
+    base_memory = 64 * 1024 * 1024
+
+    if fmt in convert_engine.DIRECT_EXPORTS:
+        decode_threads, encode_threads = _estimate_direct_threads(job, src_px, out_px)
+        if fmt == "MP4":
+            encode_memory = out_px * 3 // 2 * 50  # rc-lookahead(medium=40) + 참조 프레임
+        elif fmt == "WebM":
+            encode_memory = out_px * 3 // 2 * 30
+        else:
+            encode_memory = out_px * 4 * 4
+            if not job.get('gif_two_pass', True):
+                # 1패스(split)는 팔레트 생성 전까지 모든 출력 프레임을 버퍼링
+                duration = job.get('end', -1)
+                if duration is None or duration < 0:
+                    meta = video_engine.get_video_metadata(job['path']) if job.get('path') and not job.get('is_sequence') else None
+                    duration = meta['duration'] if meta else 10.0
+                frames = max(1, int((duration - job.get('start', 0)) * float(job.get('fps', 24))))
+                encode_memory += out_px * 4 * frames
+        threads = decode_threads + encode_threads
+        memory = base_memory + src_px * 3 // 2 * (decode_threads + 3) + encode_memory
+    else:
+        threads = 2
+        # 원본 RGB 프레임 + 마스크 + 크롭/리사이즈/색보정 중간 버퍼
+        memory = base_memory * 2 + src_px * 4 * 6 + out_px * 4 * 4
+    return threads, int(memory)
+
+class BatchResourceBudget:
+    """
+    일괄 변환용 CPU 스레드/메모리 예산.
+    작업은 시작 전에 추정치만큼 예약(acquire)하고 끝나면 반환(release)합니다.
+    예산보다 큰 작업도 다른 작업이 없을 때는 단독으로 실행되어 대기열이 멈추지 않습니다.
+    """
+    def __init__(self, cpu_threads=None, memory_bytes=None, max_jobs=const.BATCH_MAX_PARALLEL_JOBS):
+        self.cpu_threads = max(1, cpu_threads or os.cpu_count() or 1)
+        if memory_bytes is None:
+            total = get_system_memory()
+            memory_bytes = int(total * const.BATCH_MEMORY_FRACTION) if total else const.BATCH_DEFAULT_MEMORY_BYTES
+        self.memory_bytes = memory_bytes
+        self.max_jobs = max(1, max_jobs)
+        self.used_threads, self.used_memory, self.running = 0, 0, 0
+        self._cond = threading.Condition()
+
+    def fit_threads(self, threads):
+        """단일 작업이 쓸 수 있는 스레드 수는 전체 예산을 넘지 않음"""
+        return max(1, min(threads, self.cpu_threads))
+
+    def _fits_locked(self, threads, memory):
+        if self.running == 0: return True
+        if self.running >= self.max_jobs: return False
+        return (self.used_threads + threads <= self.cpu_threads and
+                self.used_memory + memory <= self.memory_bytes)
+
+    def acquire(self, threads, memory, is_cancelled=None, is_paused=None, timeout=0.5):
+        """
+        예산이 생길 때까지 기다렸다가 예약합니다. 일시정지 중에는 새 작업을 시작하지 않으며,
+        취소되면 예약 없이 False를 반환합니다.
+        """
+        threads = self.fit_threads(threads)
+        with self._cond:
+            while True:
+                if is_cancelled and is_cancelled(): return False
+                if not (is_paused and is_paused()) and self._fits_locked(threads, memory):
+                    self.used_threads += threads; self.used_memory += memory; self.running += 1
+                    return True
+                self._cond.wait(timeout)
+
+    def release(self, threads, memory):
+        threads = self.fit_threads(threads)
+        with self._cond:
+            self.used_threads -= threads; self.used_memory -= memory; self.running -= 1
+            self._cond.notify_all()
+
+    def wait_idle(self):
+        with self._cond:
+            while self.running: self._cond.wait(0.5)
+
+def run_batch_scheduled(jobs, run_job, budget=None, is_cancelled=None, is_paused=None, on_error=None):
+    """
+    jobs의 각 항목을 예산이 허락하는 만큼 동시에 실행하고, 모두 끝날 때까지 기다립니다. (대기열 순서대로 시작)
+    jobs는 생성기여도 되며, 다음 항목은 앞 작업의 예산 예약이 끝난 뒤에 꺼냅니다.
+    run_job(index, job, threads, memory): 작업마다 별도 스레드에서 호출되며 이 작업에 배정된 CPU 스레드 수와 추정 메모리(바이트)를 받습니다.
+    예외 처리와 상태 기록은 run_job이 맡으며, 자원 추정이나 run_job 밖으로 새어 나온 예외는
+    on_error(index, job, exc)로 알리고 그 작업만 실패로 건너뜁니다. 반환값은 시작한 작업 수.
+    """
+    budget = budget or BatchResourceBudget()
+    started = 0
+
+    def fail(index, job, exc):
+        if on_error:
+            try: on_error(index, job, exc)
+            except Exception: pass
+
+    def worker(index, job, threads, memory):
+        try: run_job(index, job, budget.fit_threads(threads), memory)
+        except Exception as e: fail(index, job, e)
+        finally: budget.release(threads, memory)
+
+    try:
+        for index, job in enumerate(jobs):
+            try:
+                threads, memory = estimate_job_resources(job)
+            except Exception as e:
+                fail(index, job, e)
+                continue
+            if not budget.acquire(threads, memory, is_cancelled, is_paused): break
+            try:
+                threading.Thread(target=worker, args=(index, job, threads, memory), daemon=True, name=f"batch-job-{index}").start()
+            except Exception as e:
+                budget.release(threads, memory)
+                fail(index, job, e)
+                continue
+            started += 1
+    finally:
+        # 대기열 생성기 등에서 예외가 나도 이미 시작한 작업은 끝까지 기다림
+        budget.wait_idle()
+    return started
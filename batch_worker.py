@@ -0,0 +1,213 @@
+import os
+import sys
+import time
+import signal
+import subprocess
+import multiprocessing
+import constants as const
+
+# -------------------------------------------------------------------------
+# 작업 프로세스 (자식 측)
+# -------------------------------------------------------------------------
+def _worker_main(job, out_path, threads, conn):
+    """작업 프로세스 진입점. 결과는 ('done', None) 또는 ('error', 메시지)로 보냅니다."""
+    if hasattr(os, 'setpgrp'):
+        # FFMPEG 하위 프로세스까지 한 프로세스 그룹으로 묶어 한 번에 정지/종료
+        os.setpgrp()
+    try:
+        import convert_engine
+        # 취소/일시정지는 부모가 프로세스 트리를 종료/정지하는 방식으로 처리하므로 토큰은 쓰이지 않습니다.
+        logger = convert_engine.ProgressCallbackLogger(lambda index, total: conn.send(('progress', index, total)))
+        convert_engine.convert(dict(job, output_path=out_path), logger, convert_engine.CancelToken(), threads)
+        conn.send(('done', None))
+    except BaseException as e:
+        try: conn.send(('error', str(e) or type(e).__name__))
+        except Exception: pass
+    finally:
+        conn.close()
+
+# -------------------------------------------------------------------------
+# 프로세스 트리 제어 (부모 측)
+# -------------------------------------------------------------------------
+if sys.platform == "win32":
+    import ctypes
+    from ctypes import wintypes
+
+    class _PROCESSENTRY32(ctypes.Structure):
+        _fields_ = [("dwSize", wintypes.DWORD), ("cntUsage", wintypes.DWORD), ("th32ProcessID", wintypes.DWORD),
+                    ("th32DefaultHeapID", ctypes.c_void_p), ("th32ModuleID", wintypes.DWORD), ("cntThreads", wintypes.DWORD),
+                    ("th32ParentProcessID", wintypes.DWORD), ("pcPriClassBase", ctypes.c_long), ("dwFlags", wintypes.DWORD),
+                    ("szExeFile", ctypes.c_char * 260)]
+
+    class _PROCESS_MEMORY_COUNTERS(ctypes.Structure):
+        _fields_ = [("cb", wintypes.DWORD), ("PageFaultCount", wintypes.DWORD), ("PeakWorkingSetSize", ctypes.c_size_t),
+                    ("WorkingSetSize", ctypes.c_size_t), ("QuotaPeakPagedPoolUsage", ctypes.c_size_t),
+                    ("QuotaPagedPoolUsage", ctypes.c_size_t), ("QuotaPeakNonPagedPoolUsage", ctypes.c_size_t),
+                    ("QuotaNonPagedPoolUsage", ctypes.c_size_t), ("PagefileUsage", ctypes.c_size_t),
+                    ("PeakPagefileUsage", ctypes.c_size_t)]
+
+    _PROCESS_ALL_ACCESS = 0x1F0FFF
+    _kernel32 = ctypes.windll.kernel32
+    _ntdll = ctypes.windll.ntdll
+    _psapi = ctypes.windll.psapi
+
+def _process_tree(pid):
+    """pid와 모든 하위 프로세스의 pid 목록 (확인할 수 없으면 pid만)"""
+    if sys.platform == "win32":
+        snapshot = _kernel32.CreateToolhelp32Snapshot(0x2, 0)  # TH32CS_SNAPPROCESS
+        parents = {}
+        try:
+            entry = _PROCESSENTRY32(); entry.dwSize = ctypes.sizeof(_PROCESSENTRY32)
+            ok = _kernel32.Process32First(snapshot, ctypes.byref(entry))
+            while ok:
+                parents.setdefault(entry.th32ParentProcessID, []).append(entry.th32ProcessID)
+                ok = _kernel32.Process32Next(snapshot, ctypes.byref(entry))
+        finally:
+            _kernel32.CloseHandle(snapshot)
+        get_children = lambda p: parents.get(p, [])
+    elif os.path.isdir(f"/proc/{pid}/task"):
+        def get_children(p):
+            children = []
+            try:
+                for tid in os.listdir(f"/proc/{p}/task"):
+                    with open(f"/proc/{p}/task/{tid}/children") as f:
+                        children.extend(int(c) for c in f.read().split())
+            except (OSError, ValueError):
+                pass
+            return children
+    else:
+        return [pid]
+    tree, stack = [], [pid]
+    while stack:
+        p = stack.pop()
+        tree.append(p)
+        stack.extend(c for c in get_children(p) if c not in tree)
+    return tree
+
+def get_process_tree_memory(pid):
+    """프로세스 트리의 상주 메모리 합계(바이트). 확인할 수 없으면 0"""
+    total = 0
+    if sys.platform == "win32":
+        for p in _process_tree(pid):
+            handle = _kernel32.OpenProcess(0x0410, False, p)  # QUERY_INFORMATION | VM_READ
+            if not handle: continue
+            counters = _PROCESS_MEMORY_COUNTERS(); counters.cb = ctypes.sizeof(_PROCESS_MEMORY_COUNTERS)
+            if _psapi.GetProcessMemoryInfo(handle, ctypes.byref(counters), counters.cb):
+                total += counters.WorkingSetSize
+            _kernel32.CloseHandle(handle)
+        return total
+    if os.path.isdir("/proc"):
+        page = os.sysconf('SC_PAGE_SIZE')
+        for p in _process_tree(pid):
+            try:
+                with open(f"/proc/{p}/statm") as f: total += int(f.read().split()[1]) * page
+            except (OSError, ValueError, IndexError):
+                pass
+        return total
+    try:
+        # macOS 등: 프로세스 그룹 전체의 RSS(KB)
+        out = subprocess.run(['ps', '-o', 'rss=', '-g', str(pid)], capture_output=True, text=True, timeout=2).stdout
+        return sum(int(v) for v in out.split()) * 1024
+    except (OSError, ValueError, subprocess.SubprocessError):
+        return 0
+
+def _signal_tree(pid, sig):
+    """POSIX: 작업 프로세스 그룹 전체에 시그널 전달 (그룹 생성 전이면 작업 프로세스에만)"""
+    try:
+        os.killpg(pid, sig)
+    except (ProcessLookupError, PermissionError, OSError):
+        try: os.kill(pid, sig)
+        except OSError: pass
+
+def suspend_process_tree(pid):
+    if sys.platform == "win32":
+        for p in _process_tree(pid):
+            handle = _kernel32.OpenProcess(_PROCESS_ALL_ACCESS, False, p)
+            if handle: _ntdll.NtSuspendProcess(handle); _kernel32.CloseHandle(handle)
+    else:
+        _signal_tree(pid, signal.SIGSTOP)
+
+def resume_process_tree(pid):
+    if sys.platform == "win32":
+        for p in _process_tree(pid):
+            handle = _kernel32.OpenProcess(_PROCESS_ALL_ACCESS, False, p)
+            if handle: _ntdll.NtResumeProcess(handle); _kernel32.CloseHandle(handle)
+    else:
+        _signal_tree(pid, signal.SIGCONT)
+
+def kill_process_tree(pid):
+    if sys.platform == "win32":
+        # 하위 프로세스부터 종료
+        for p in reversed(_process_tree(pid)):
+            handle = _kernel32.OpenProcess(_PROCESS_ALL_ACCESS, False, p)
+            if handle: _kernel32.TerminateProcess(handle, 1); _kernel32.CloseHandle(handle)
+    else:
+        _signal_tree(pid, signal.SIGCONT)  # 정지된 프로세스도 바로 종료되도록
+        _signal_tree(pid, signal.SIGKILL)
+
+# -------------------------------------------------------------------------
+# 격리 실행
+# -------------------------------------------------------------------------
+def job_memory_limit(estimated_bytes):
+    """작업 추정 메모리에 여유를 둔 프로세스 메모리 한도"""
+    return max(const.BATCH_JOB_MIN_MEMORY_BYTES, int(estimated_bytes * const.BATCH_JOB_MEMORY_LIMIT_FACTOR))
+
+def run_job_isolated(job, out_path, control, logger=None, threads=None, memory_limit=None, poll_interval=0.2):
+    """
+    convert_engine.convert를 별도 프로세스(spawn)에서 실행하고 끝날 때까지 감시합니다.
+    - 취소: control.cancel_requested가 켜지면 FFMPEG를 포함한 프로세스 트리를 즉시 종료
+    - 일시정지: control.batch_paused 동안 프로세스 트리를 정지(SIGSTOP/NtSuspendProcess)
+    - 메모리: 트리 상주 메모리가 memory_limit을 넘으면 종료하고 실패 처리
+    - 작업 프로세스가 죽어도 앱은 영향을 받지 않으며 이 작업만 실패로 기록됩니다.
+    진행률은 logger.bars_update('main', ...)로 전달됩니다.
+    """
+    ctx = multiprocessing.get_context("spawn")
+    recv_conn, send_conn = ctx.Pipe(duplex=False)
+    # 미리보기 썸네일 등 변환에 필요 없는 값은 넘기지 않음
+    job = {k: v for k, v in job.items() if k != 'thumb_img'}
+    proc = ctx.Process(target=_worker_main, args=(job, out_path, threads, send_conn), daemon=True, name="gifmaker-job")
+    proc.start()
+    send_conn.close()
+
+    result, paused, last_memory_check = None, False, 0.0
+    try:
+        while True:
+            if control.cancel_requested:
+                kill_process_tree(proc.pid)
+                raise RuntimeError("CANCEL_REQUESTED")
+            if control.batch_paused != paused:
+                paused = control.batch_paused
+                (suspend_process_tree if paused else resume_process_tree)(proc.pid)
+
+            try:
+                while recv_conn.poll(0 if paused else poll_interval):
+                    msg = recv_conn.recv()
+                    if msg[0] == 'progress':
+                        if logger: logger.bars_update('main', index=msg[1], total=msg[2])
+                    else:
+                        result = msg
+                        break
+            except (EOFError, OSError):
+                pass  # 작업 프로세스 종료 (결과 없이 죽은 경우 아래에서 처리)
+            if result is not None or not proc.is_alive():
+                break
+            if paused:
+                time.sleep(poll_interval); continue
+
+            now = time.time()
+            if memory_limit and now - last_memory_check >= 0.5:
+                last_memory_check = now
+                used = get_process_tree_memory(proc.pid)
+                if used > memory_limit:
+                    kill_process_tree(proc.pid)
+                    raise RuntimeError(f"메모리 한도 초과 ({used // (1024 * 1024)}MB > {memory_limit // (1024 * 1024)}MB)")
+    finally:
+        if proc.is_alive() and result is None:
+            kill_process_tree(proc.pid)
+        proc.join(5)
+        recv_conn.close()
+
+    if result is None:
+        raise RuntimeError(f"작업 프로세스 비정상 종료 (코드 {proc.exitcode})")
+    if result[0] == 'error':
+        raise RuntimeError(result[1])
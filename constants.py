@@ -5,6 +5,52 @@ GITHUB_USER = "seonkukim-dexter"
 GITHUB_REPO = "gifMaker"
 VERSION_CHECK_URL = f"https://raw.githubusercontent.com/{GITHUB_USER}/{GITHUB_REPO}/main/version.json"
 
+# 사용자 캐시 설정 (메타데이터 등)
+APP_CACHE_NAME = "DexterGifMaker"
+METADATA_CACHE_MAX_ENTRIES = 50000
+THUMBNAIL_CACHE_MAX_BYTES = 256 * 1024 * 1024
+
+# 프리뷰 프레임 캐시 용량 (바이트)
+PREVIEW_CACHE_MAX_BYTES = 256 * 1024 * 1024
+PLAYBACK_BUFFER_FRAMES = 8
+# 재생 프리롤 최대 대기 시간 (초, 첫 프레임 준비가 실패해도 재생 시계를 시작)
+PLAYBACK_PREROLL_TIMEOUT = 1.0
+
+# 이미지 시퀀스 프레임 캐시 (프레임 수) / 미리 읽기 (프레임 수, 최대 바이트)
+SEQUENCE_FRAME_CACHE_SIZE = 8
+SEQUENCE_PREFETCH_FRAMES = 8
+SEQUENCE_PREFETCH_MAX_BYTES = 256 * 1024 * 1024
+
+# JPEG 시퀀스 저해상도(DCT 축소) 디코딩 배율 후보 (큰 배율부터)
+JPEG_DRAFT_SCALES = (8, 4, 2)
+
+# 미디어 분석 스케줄링 (GIF가 이보다 적으면 프로세스 풀 기동 비용이 더 큼 / 파일 stat 평균이 이보다 느리면 네트워크 드라이브로 간주, 초)
+ANALYSIS_PROCESS_MIN_ITEMS = 4
+ANALYSIS_SLOW_IO_SECONDS = 0.005
+
+# 색보정 LUT 캐시 크기 (설정값 조합 수, 슬라이더 조작 중 생기는 조합 수만큼만 유지)
+COLOR_LUT_CACHE_SIZE = 64
+
+# 색보정 슬라이더 프리뷰 갱신 간격 (ms, 약 60Hz)
+COLOR_PREVIEW_INTERVAL_MS = 16
+
+# 일괄 변환 스케줄러 (동시 작업 메모리 예산 비율 / 메모리를 알 수 없을 때의 예산 / 동시 작업 상한)
+BATCH_MEMORY_FRACTION = 0.7
+BATCH_DEFAULT_MEMORY_BYTES = 4 * 1024 * 1024 * 1024
+BATCH_MAX_PARALLEL_JOBS = 16
+# 작업 프로세스 메모리 한도 (추정치 배수, 최소값)
+BATCH_JOB_MEMORY_LIMIT_FACTOR = 3
+BATCH_JOB_MIN_MEMORY_BYTES = 1024 * 1024 * 1024
+
+# 감시 폴더 (폴링 간격 / 파일 크기·수정 시각이 이 시간 동안 그대로면 완료로 판단 / 전체 재검사 주기, 초)
+WATCH_POLL_INTERVAL = 2.0
+WATCH_SETTLE_SECONDS = 10.0
+WATCH_FULL_RESCAN_SECONDS = 60.0
+
+# 타임라인 필름스트립 (프레임 수, 캐시 저장 크기)
+FILMSTRIP_FRAMES = 12
+FILMSTRIP_FRAME_SIZE = (160, 90)
+
 # UI 설정 상수
 RESOLUTIONS = ["320", "480", "640", "800", "1280", "1920"]
 DEFAULT_WIDTH = "1280"
@@ -17,6 +63,10 @@ SEQUENCE_FORMATS = ["JPG", "PNG", "WebP", "GIF"]
 DEFAULT_EXPORT_FORMAT = "GIF"
 DEFAULT_SEQ_FORMAT = "PNG"
 
+# GIF 다이렉트(FFMPEG paletteuse) 변환 디더링 방식
+GIF_DITHER_OPTIONS = ["sierra2_4a", "floyd_steinberg", "bayer", "none"]
+GIF_DITHER_DEFAULT = "sierra2_4a"
+
 # 파일 확장자 필터
 FILETYPES_SINGLE = [("Single Files", "*.mp4 *.mkv *.mov *.avi *.webm *.gif")]
 FILETYPES_SEQUENCE = [("Sequence Files", "*.png *.jpg *.jpeg *.gif *.exr *.tga *.bmp *.tiff *.webp")]
@@ -25,6 +75,7 @@ FILETYPES_JSON = [("JSON", "*.json")]
 # 지원 확장자 목록 (로직 판별용)
 VIDEO_EXTS = ('.mp4', '.mkv', '.mov', '.avi', '.webm', '.gif')
 IMAGE_EXTS = ('.gif', '.png', '.jpg', '.jpeg', '.exr', '.tga', '.bmp', '.tiff', '.webp')
+ALPHA_SOURCE_EXTS = ('.gif', '.png', '.webp', '.webm')
 
 # 색보정 기본값 설정 (이름, 최소, 최대, 기본값)
 COLOR_CONFIGS = [
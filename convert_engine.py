@@ -0,0 +1,555 @@
+import os
+import sys
+import re
+import time
+import tempfile
+import threading
+import subprocess
+from contextlib import contextmanager
+from dataclasses import dataclass, field, fields, asdict
+from typing import Any, Dict, List, Optional
+import video_engine
+import constants as const
+from utils import natural_sort_key, get_unique_path
+from constants import ALPHA_SOURCE_EXTS, GIF_DITHER_DEFAULT, VIDEO_EXTS, IMAGE_EXTS
+
+try:
+    from proglog import ProgressBarLogger
+except ImportError:
+    ProgressBarLogger = None
+
+# -------------------------------------------------------------------------
+# UI 없이 사용하는 변환 엔진 (FFMPEG 다이렉트 변환 + MoviePy 변환)
+# control: cancel_requested / batch_paused 속성을 가진 객체 (앱 또는 작업 프로세스의 제어 객체)
+# logger: bars_update('main', index, total)를 받는 진행률 로거 (CTKLogger 등)
+# -------------------------------------------------------------------------
+def ffmpeg_job_duration(job, total_duration):
+    start = job.get('start', 0)
+    end = job.get('end', -1)
+    return (total_duration - start) if end == -1 else (end - start)
+
+def source_has_alpha(job):
+    """다이렉트 변환 소스의 알파 채널 여부 (시퀀스는 첫 이미지, 영상은 확장자로 판별)"""
+    if job.get('is_sequence') and job.get('sequence_paths'):
+        return video_engine.sequence_has_alpha(video_engine.sort_sequence_paths(job['sequence_paths'])[0])
+    return job['path'].lower().endswith(ALPHA_SOURCE_EXTS)
+
+@contextmanager
+def ffmpeg_input(job, duration):
+    """
+    구간(-ss/-t) 및 입력 파일 인자를 만들어 돌려줍니다.
+    - 이미지 시퀀스: concat demuxer 목록 파일을 만들어 FFMPEG가 직접 디코딩 (종료 시 삭제)
+    - 알파가 있는 WebM: libvpx 디코더를 지정해야 알파가 유지됩니다.
+    """
+    if job.get('is_sequence') and job.get('sequence_paths'):
+        list_path, _ = video_engine.write_sequence_concat_list(job['sequence_paths'], job.get('fps', 24), job.get('start', 0), job.get('end', -1))
+        args = ['-f', 'concat', '-safe', '0'] + ffmpeg_thread_args(job)
+        # JPEG 시퀀스를 크게 축소 출력하는 경우 MJPEG 디코더의 저해상도(DCT 축소) 디코딩 사용
+        draft_scale = video_engine.get_jpeg_draft_scale(
+            video_engine.sort_sequence_paths(job['sequence_paths'])[0], job.get('width'),
+            job.get('crop') if job.get('crop_enabled') else None)
+        if draft_scale > 1:
+            args.extend(['-lowres', str(draft_scale.bit_length() - 1)])
+        try:
+            yield args + ['-i', list_path]
+        finally:
+            try: os.remove(list_path)
+            except OSError: pass
+        return
+    args = ['-ss', str(job.get('start', 0)), '-t', str(duration)] + ffmpeg_thread_args(job)
+    if job.get('transparent') and job['path'].lower().endswith('.webm'):
+        args.extend(['-c:v', 'libvpx-vp9'])
+    args.extend(['-i', job['path']])
+    yield args
+
+def ffmpeg_thread_args(job):
+    """
+    일괄 변환 스케줄러가 배정한 디코드 측 스레드(job['decode_threads'])를 디코더와 필터 그래프(1스레드)에 나눠 줍니다.
+    배정이 없으면(즉시 변환) FFMPEG 기본값(코어 수 자동)을 씁니다.
+    """
+    threads = job.get('decode_threads')
+    return ['-threads', str(max(1, threads - 1)), '-filter_threads', '1'] if threads else []
+
+def ffmpeg_fps_filter(job, fps):
+    """
+    fps 필터 문자열. 시퀀스(concat)는 1/fps 반올림 때문에 마지막 프레임이
+    잘릴 수 있어 EOF 시점의 남은 프레임을 그대로 내보냅니다.
+    """
+    return f"fps={fps}:eof_action=pass" if job.get('is_sequence') else f"fps={fps}"
+
+def build_ffmpeg_filters(job, color_settings=None):
+    """
+    크롭/리사이즈/색보정 설정을 FFMPEG 비디오 필터 리스트로 번역합니다.
+    사용자의 색보정(PIL 기반)을 FFMPEG 네이티브 필터로 근사합니다.
+    """
+    vf = []
+    # 1. 크롭 필터 적용
+    if job.get('crop_enabled'):
+        x1, y1, x2, y2 = job['crop']
+        rx1, rx2 = min(x1, x2), max(x1, x2)
+        ry1, ry2 = min(y1, y2), max(y1, y2)
+        cx, cy = f"{rx1}*iw", f"{ry1}*ih"
+        cw, ch = f"{rx2 - rx1}*iw", f"{ry2 - ry1}*ih"
+        vf.append(f"crop={cw}:{ch}:{cx}:{cy}")
+
+    # 2. 리사이즈 필터 적용
+    target_w = job.get('width', 1280)
+    vf.append(f"scale={target_w}:-2")
+
+    # 3. 색보정 필터 적용 (PIL 로직을 FFMPEG 네이티브 필터로 변환)
+    if color_settings and color_settings.get('color_correction'):
+        # 노출, 대비, 감마, 채도 -> eq 필터 사용
+        exp = color_settings.get('exposure', 0) / 100.0  # PIL: 1.0 + val, FFMPEG: -1.0 ~ 1.0 (default 0)
+        cont = 1.0 + (color_settings.get('contrast', 0) / 100.0) # FFMPEG: default 1.0
+        gam = color_settings.get('gamma', 1.0)
+        sat = color_settings.get('saturation', 1.0)
+        vf.append(f"eq=brightness={exp}:contrast={cont}:gamma={gam}:saturation={sat}")
+
+        # 틴트, 색온도 -> colorbalance 필터 사용 (Midtones 조정)
+        temp = color_settings.get('temperature', 0.0)
+        tint = color_settings.get('tint', 0.0)
+        rm, gm, bm = 0.0, 0.0, 0.0
+
+        if temp > 0:
+            rm += temp / 300.0
+            bm -= temp / 300.0
+        elif temp < 0:
+            rm -= abs(temp) / 300.0
+            bm += abs(temp) / 300.0
+
+        if tint > 0:
+            gm += tint / 300.0
+        elif tint < 0:
+            rm -= abs(tint) / 300.0
+            bm -= abs(tint) / 300.0
+
+        # FFMPEG colorbalance limit is -1.0 to 1.0
+        rm = max(-1.0, min(1.0, rm))
+        gm = max(-1.0, min(1.0, gm))
+        bm = max(-1.0, min(1.0, bm))
+
+        if rm != 0.0 or gm != 0.0 or bm != 0.0:
+            vf.append(f"colorbalance=rm={rm}:gm={gm}:bm={bm}")
+    return vf
+
+def run_ffmpeg(cmd, control, logger, duration, progress_offset=0.0, progress_total=None):
+    """
+    FFMPEG 프로세스를 실행하며 진행률(time=)을 로거에 전달하고 취소/일시정지를 처리합니다.
+    progress_offset/progress_total: 여러 패스로 나뉜 작업에서 이 패스의 시작 위치와 전체 길이 (초)
+    """
+    total = max(1, int((progress_total if progress_total is not None else duration) * 10))
+
+    startupinfo = None
+    if sys.platform == "win32":
+        startupinfo = subprocess.STARTUPINFO()
+        startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW
+
+    proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True, universal_newlines=True, startupinfo=startupinfo)
+
+    time_regex = re.compile(r"time=\s*(\d+):(\d+):(\d+\.\d+)")
+
+    for line in proc.stdout:
+        if control.cancel_requested:
+            proc.kill()
+            raise RuntimeError("CANCEL_REQUESTED")
+        while control.batch_paused:
+            time.sleep(0.5)
+            if control.cancel_requested:
+                proc.kill()
+                raise RuntimeError("CANCEL_REQUESTED")
+
+        match = time_regex.search(line)
+        if match and logger:
+            h, m, s = match.groups()
+            t_sec = int(h) * 3600 + int(m) * 60 + float(s)
+            logger.bars_update('main', index=int((progress_offset + min(t_sec, duration)) * 10), total=total)
+
+    proc.wait()
+    if proc.returncode != 0 and not control.cancel_requested:
+        raise RuntimeError(f"FFMPEG Direct Error: {proc.returncode}")
+
+    if logger:
+        logger.bars_update('main', index=min(total, int((progress_offset + duration) * 10)), total=total)
+
+def direct_ffmpeg_export(job, out_path, control, logger, total_duration, color_settings=None):
+    """
+    MoviePy를 우회하여 FFMPEG를 직접 호출합니다. (VFR 최적화 및 속도 대폭 향상)
+    사용자의 색보정(PIL 기반)을 FFMPEG 비디오 필터로 번역하여 함께 적용합니다.
+    """
+    duration = ffmpeg_job_duration(job, total_duration)
+    vf = build_ffmpeg_filters(job, color_settings)
+    vf.append("format=yuv420p")
+
+    with ffmpeg_input(dict(job, transparent=False), duration) as input_args:
+        cmd = [video_engine.get_ffmpeg_exe(), '-y'] + input_args
+        cmd.extend(['-vf', ",".join(vf)])
+
+        bitrate = job.get('bitrate', '2')
+        cmd.extend(['-c:v', 'libx264', '-b:v', f"{bitrate}M", '-preset', 'medium', '-threads', str(job.get('encode_threads') or 0)])
+        cmd.extend(['-c:a', 'aac', '-b:a', '128k'])
+
+        # [핵심] VFR 타임스탬프 유동적 유지 (프레임 강제 재샘플링 방지)
+        cmd.extend(['-vsync', '0']) 
+
+        cmd.append(out_path)
+        run_ffmpeg(cmd, control, logger, duration)
+
+def vp9_thread_args(out_width, threads=None):
+    """
+    코어 수(또는 스케줄러가 배정한 인코드 측 스레드 수)와 출력 폭에 맞춘 libvpx-vp9 병렬화 옵션.
+    VP9 타일은 최소 256px 폭이어야 하므로 tile-columns(log2)를 폭 기준으로 제한합니다.
+    """
+    cores = max(1, threads or os.cpu_count() or 1)
+    threads = min(cores, 16)
+    max_tiles_by_width = max(0, int(out_width) // 256).bit_length() - 1
+    tile_columns = max(0, min(threads.bit_length() - 1, max_tiles_by_width, 6))
+    return ['-row-mt', '1', '-tile-columns', str(tile_columns), '-threads', str(threads)]
+
+def direct_ffmpeg_webm_export(job, out_path, control, logger, total_duration, color_settings=None):
+    """
+    MoviePy를 우회하여 libvpx-vp9로 WebM을 직접 인코딩합니다.
+    투명 소스는 yuva420p(alpha_mode=1)로 알파를 유지하며, 오디오 임시 파일을 만들지 않습니다.
+    """
+    duration = ffmpeg_job_duration(job, total_duration)
+    transparent = bool(job.get('transparent'))
+    vf = [ffmpeg_fps_filter(job, job.get('fps', 24))] + build_ffmpeg_filters(job, color_settings)
+    vf.append("format=yuva420p" if transparent else "format=yuv420p")
+
+    with ffmpeg_input(job, duration) as input_args:
+        cmd = [video_engine.get_ffmpeg_exe(), '-y'] + input_args
+        cmd.extend(['-vf', ",".join(vf)])
+
+        bitrate = job.get('bitrate', '2')
+        cmd.extend(['-c:v', 'libvpx-vp9', '-b:v', f"{bitrate}M", '-deadline', 'good', '-cpu-used', '2'])
+        cmd.extend(vp9_thread_args(job.get('width', 1280), job.get('encode_threads')))
+        if transparent:
+            # 알파 채널은 alt-ref 프레임과 함께 쓸 수 없음
+            cmd.extend(['-auto-alt-ref', '0', '-metadata:s:v:0', 'alpha_mode=1'])
+        cmd.extend(['-c:a', 'libopus', '-b:a', '128k'])
+        cmd.append(out_path)
+        run_ffmpeg(cmd, control, logger, duration)
+
+def direct_ffmpeg_gif_export(job, out_path, control, logger, total_duration, color_settings=None):
+    """
+    FFMPEG palettegen/paletteuse로 GIF를 직접 생성합니다. (프레임별 Python 처리 없음)
+    - 2패스(기본): 1패스에서 전역 팔레트 PNG 생성 -> 2패스에서 디더링 적용. 메모리 일정.
+    - 1패스: split으로 한 번에 처리. 디코딩은 1회지만 팔레트 생성 전까지 프레임을 버퍼링합니다.
+    """
+    duration = ffmpeg_job_duration(job, total_duration)
+    ffmpeg_exe = video_engine.get_ffmpeg_exe()
+    transparent = bool(job.get('transparent'))
+    dither = job.get('gif_dither', GIF_DITHER_DEFAULT)
+    fps = job.get('fps', 24)
+
+    vf = [ffmpeg_fps_filter(job, fps)] + build_ffmpeg_filters(job, color_settings)
+    vf.append("format=rgba" if transparent else "format=rgb24")
+    base = ",".join(vf)
+    gen = f"palettegen=stats_mode=full:reserve_transparent={1 if transparent else 0}"
+    use = f"paletteuse=dither={dither}:diff_mode=rectangle" + (":alpha_threshold=128" if transparent else "")
+    loop_args = ['-loop', str(int(job.get('loop', 0)))]
+
+    with ffmpeg_input(job, duration) as input_args:
+        if not job.get('gif_two_pass', True):
+            graph = f"{base},split[a][b];[a]{gen}[p];[b][p]{use}"
+            cmd = [ffmpeg_exe, '-y'] + input_args + ['-filter_complex', graph, '-an'] + loop_args + [out_path]
+            run_ffmpeg(cmd, control, logger, duration)
+            return
+
+        fd, palette_path = tempfile.mkstemp(prefix="gif_palette_", suffix=".png")
+        os.close(fd)
+        try:
+            # 1패스: 전역 팔레트 생성 (진행률 0~50%)
+            cmd = [ffmpeg_exe, '-y'] + input_args + ['-vf', f"{base},{gen}", '-an', '-update', '1', '-frames:v', '1', palette_path]
+            run_ffmpeg(cmd, control, logger, duration, progress_offset=0, progress_total=duration * 2)
+            # 2패스: 팔레트 적용 및 디더링 (진행률 50~100%)
+            cmd = [ffmpeg_exe, '-y'] + input_args + ['-i', palette_path, '-filter_complex', f"[0:v]{base}[x];[x][1:v]{use}", '-an'] + loop_args + [out_path]
+            run_ffmpeg(cmd, control, logger, duration, progress_offset=duration, progress_total=duration * 2)
+        finally:
+            try: os.remove(palette_path)
+            except OSError: pass
+
+DIRECT_EXPORTS = {"MP4": direct_ffmpeg_export, "GIF": direct_ffmpeg_gif_export, "WebM": direct_ffmpeg_webm_export}
+
+def job_total_duration(job):
+    """다이렉트 변환 구간 계산용 소스 전체 길이 (시퀀스는 이미지 수 / fps)"""
+    if job.get('is_sequence'):
+        return len(job['sequence_paths']) / float(job.get('fps', 24))
+    meta = video_engine.get_video_metadata(job['path'])
+    return meta['duration'] if meta else 0
+
+def job_output_name(job):
+    """대기열 작업의 출력 파일(시퀀스는 폴더) 이름"""
+    base_name, fmt = os.path.splitext(job['filename'])[0], job.get('export_format', "GIF")
+    if fmt == "Thumbnail":
+        return f"{base_name}_thumb.{job.get('seq_format', 'PNG').lower()}"
+    if fmt == "Sequence":
+        return base_name
+    return base_name + {"GIF": ".gif", "MP4": ".mp4", "WebM": ".webm", "WebP": ".webp"}.get(fmt, ".gif")
+
+def reserve_output_path(save_dir, job, lock):
+    """
+    동시에 실행되는 작업끼리 같은 출력 이름을 쓰지 않도록 lock 안에서 고유 경로를 정하고
+    빈 파일(시퀀스는 폴더)로 자리를 만들어 둡니다.
+    """
+    with lock:
+        out_path = get_unique_path(os.path.join(save_dir, job_output_name(job)))
+        if job.get('export_format') == "Sequence":
+            if not os.path.exists(out_path): os.makedirs(out_path)
+        else:
+            open(out_path, 'ab').close()
+    return out_path
+
+def discard_reserved_output(out_path):
+    """변환이 실패해 비어 있는 자리 파일을 정리합니다."""
+    if out_path and os.path.isfile(out_path) and os.path.getsize(out_path) == 0:
+        try: os.remove(out_path)
+        except OSError: pass
+
+# -------------------------------------------------------------------------
+# 폴더 스캔 및 작업 생성
+# -------------------------------------------------------------------------
+def collect_folder_media(folder):
+    """
+    폴더(하위 폴더 포함)의 미디어를 (시퀀스 경로 목록의 리스트, 영상 경로 리스트)로 분류합니다.
+    같은 폴더/접두사/확장자의 번호 붙은 이미지가 2장 이상이면 시퀀스이며, 시퀀스에 쓰인 파일은 영상에서 제외됩니다.
+    """
+    all_files = []
+    for r, d, files in os.walk(folder):
+        for f in files: all_files.append(os.path.join(r, f))
+    return classify_media_files(all_files)
+
+def classify_media_files(all_files):
+    """파일 경로 목록을 (시퀀스 경로 목록의 리스트, 영상 경로 리스트)로 분류합니다. (collect_folder_media 참고)"""
+    sequences = {}
+    for f_path in all_files:
+        if f_path.lower().endswith(IMAGE_EXTS):
+            prefix, num, ext, sep = video_engine.get_sequence_info(os.path.basename(f_path))
+            if num:
+                key = (os.path.dirname(f_path), prefix, ext.lower(), sep)
+                sequences.setdefault(key, []).append(f_path)
+
+    sequence_list, used_in_sequence = [], set()
+    for paths in sequences.values():
+        if len(paths) > 1:
+            used_in_sequence.update(paths)
+            sequence_list.append(sorted(paths, key=lambda x: natural_sort_key(os.path.basename(x))))
+    videos = [v for v in all_files if v.lower().endswith(VIDEO_EXTS) and v not in used_in_sequence]
+    return sequence_list, videos
+
+def make_job(source, preset=None):
+    """
+    영상 경로(str) 또는 시퀀스 경로 목록(list)으로 대기열 작업(dict)을 만듭니다.
+    기본값은 폴더 불러오기와 같으며(영상 GIF / 시퀀스 WebM, 폭 1280, 24fps), preset 값이 기본값을 덮어씁니다.
+    """
+    job = {"status": "대기", "start": 0, "end": -1, "fps": 24, "video_fps": 24, "width": 1280, "loop": 0,
+           "crop": [0, 0, 1, 1], "crop_enabled": False, "thumb_img": None, "transparent": True,
+           "seq_format": const.DEFAULT_SEQ_FORMAT, "bitrate": "2", "color_settings": {}}
+    if isinstance(source, (list, tuple)):
+        job.update({"path": "Image Sequence", "filename": video_engine.get_sequence_display_name(source),
+                    "sequence_paths": list(source), "is_sequence": True, "export_format": "WebM"})
+    else:
+        job.update({"path": source, "filename": os.path.basename(source), "export_format": "GIF"})
+    if preset:
+        job.update({k: v for k, v in preset.items() if k not in ('path', 'filename', 'sequence_paths', 'is_sequence')})
+    return job
+
+def run_job(job, out_path, control, logger=None, threads=None):
+    """
+    대기열 작업(dict) 하나를 out_path로 변환합니다. 실패 시 예외, 취소 시 RuntimeError("CANCEL_REQUESTED").
+    threads: 일괄 변환 스케줄러가 배정한 CPU 스레드 수 (FFMPEG/MoviePy 인코더에 전달)
+    """
+    from moviepy import VideoFileClip
+
+    fmt = job.get('export_format', "GIF")
+    batch_cs = job.get('color_settings', {})
+    # 색보정 설정이 있어도 번역된 필터를 통해 무조건 다이렉트 변환을 사용
+    if fmt in DIRECT_EXPORTS:
+        direct_job = dict(job, transparent=bool(job.get('transparent')) and source_has_alpha(job))
+        if threads:
+            # 배정된 스레드를 디코더와 인코더가 나눠 써서 합이 배정값을 넘지 않도록 함
+            import batch_scheduler  # batch_scheduler가 이 모듈의 DIRECT_EXPORTS를 참조하므로 지연 import
+            direct_job['decode_threads'], direct_job['encode_threads'] = batch_scheduler.split_job_threads(job, threads)
+        DIRECT_EXPORTS[fmt](direct_job, out_path, control, logger, job_total_duration(job), batch_cs)
+        return
+
+    if job.get('is_sequence'):
+        c = video_engine.get_sequence_clip(job['sequence_paths'], job['fps'], target_width=job['width'],
+                                           crop=job['crop'] if (fmt != "Thumbnail" and job.get('crop_enabled')) else None)
+    else:
+        has_alpha = job['path'].lower().endswith(ALPHA_SOURCE_EXTS)
+        c = VideoFileClip(job['path'], has_mask=has_alpha)
+
+    with c:
+        target_w = job['width']
+        if fmt == "Thumbnail":
+            c_res = c.resized(width=target_w) if hasattr(c, 'resized') else c.resize(width=target_w)
+            webp_q = job.get('webp_quality', 80)
+            webp_l = job.get('webp_lossless', False)
+            if not video_engine.perform_write_single_image(c_res, out_path, job['start'], batch_cs, control, webp_q=webp_q, webp_l=webp_l):
+                raise RuntimeError("이미지 저장 실패")
+            return
+
+        st, et = max(0, job['start']), min(c.duration, (job['end'] if job['end'] != -1 else c.duration))
+        sub = c.subclipped(st, et) if hasattr(c, 'subclipped') else c.subclip(st, et)
+        if job.get('crop_enabled'):
+            vw, vh = sub.size; x1, y1, x2, y2 = job['crop']
+            sub = sub.cropped(x1=min(x1,x2)*vw, y1=min(y1,y2)*vh, x2=max(x1,x2)*vw, y2=max(y1,y2)*vh)
+        sub = sub.resized(width=target_w) if hasattr(sub, 'resized') else sub.resize(width=target_w)
+
+        if batch_cs.get('color_correction'):
+            def b_filter(img): return video_engine.apply_color_correction_array(img[..., :3], batch_cs)
+            sub = sub.image_transform(b_filter)
+
+        actual_transparent = job.get('transparent') and sub.mask is not None
+
+        if fmt == "Sequence":
+            img_format = os.path.join(out_path, f"{os.path.basename(out_path)}.%04d.{job.get('seq_format', 'JPG').lower()}")
+            sub.write_images_sequence(img_format, fps=job['fps'], logger=logger)
+        elif fmt == "WebM":
+            temp_audio_path = os.path.join(tempfile.gettempdir(), f"temp_audio_batch_{os.getpid()}_{id(job)}.ogg")
+            pix_fmt = 'yuva420p' if actual_transparent else 'yuv420p'
+            sub.write_videofile(out_path, fps=job['fps'], codec='libvpx-vp9', logger=logger, ffmpeg_params=['-pix_fmt', pix_fmt], temp_audiofile=temp_audio_path, remove_temp=True, threads=threads)
+        elif fmt == "WebP":
+            webp_q = job.get('webp_quality', 80)
+            webp_l = job.get('webp_lossless', False)
+            video_engine.perform_write_webp(sub, out_path, job['fps'], logger, job.get('loop', 0), actual_transparent, control, quality=webp_q, lossless=webp_l)
+        else:
+            video_engine.perform_write_gif(sub, out_path, job['fps'], logger, job.get('loop', 0), actual_transparent, control,
+                                            dither=job.get('gif_dither', GIF_DITHER_DEFAULT))
+
+# -------------------------------------------------------------------------
+# 엔진 API: 작업 사양(JobSpec) / 취소 토큰(CancelToken) / convert()
+# UI 없이 스레드, 작업 프로세스, 다른 Python 서비스에서 바로 호출할 수 있습니다.
+# -------------------------------------------------------------------------
+@dataclass
+class JobSpec:
+    """대기열 작업(dict)과 같은 필드를 갖는 변환 작업 사양"""
+    path: str = ""
+    filename: str = ""
+    export_format: str = "GIF"
+    start: float = 0.0
+    end: float = -1              # -1: 소스 끝까지
+    fps: int = 24
+    width: int = 1280
+    crop: List[float] = field(default_factory=lambda: [0, 0, 1, 1])  # 정규화 좌표 (x1, y1, x2, y2)
+    crop_enabled: bool = False
+    transparent: bool = True     # 소스에 알파가 있을 때만 유지
+    loop: int = 0
+    bitrate: str = "2"           # MP4/WebM 비트레이트 (Mbps)
+    gif_dither: str = GIF_DITHER_DEFAULT
+    gif_two_pass: bool = True
+    webp_quality: int = 80
+    webp_lossless: bool = False
+    seq_format: str = const.DEFAULT_SEQ_FORMAT
+    color_settings: Dict[str, Any] = field(default_factory=dict)
+    is_sequence: bool = False
+    sequence_paths: Optional[List[str]] = None
+    output_path: Optional[str] = None  # 출력 파일(시퀀스는 폴더). 폴더를 주면 그 안에 고유 이름으로 저장
+
+    def __post_init__(self):
+        if self.export_format not in const.EXPORT_FORMATS:
+            raise ValueError(f"지원하지 않는 출력 형식: {self.export_format}")
+        if self.is_sequence:
+            if not self.sequence_paths:
+                raise ValueError("시퀀스 작업에 sequence_paths가 없습니다.")
+            self.path = "Image Sequence"
+            if not self.filename: self.filename = video_engine.get_sequence_display_name(self.sequence_paths)
+        elif not self.path:
+            raise ValueError("작업에 소스 경로(path)가 없습니다.")
+        elif not self.filename:
+            self.filename = os.path.basename(self.path)
+
+    @classmethod
+    def from_dict(cls, job):
+        """대기열 작업(dict)에서 만듭니다. status, thumb_img 등 변환과 무관한 키는 무시합니다."""
+        names = {f.name for f in fields(cls)}
+        return cls(**{k: v for k, v in job.items() if k in names and v is not None})
+
+    def to_dict(self):
+        """run_job 등 기존 dict 기반 함수에 넘길 작업(dict)"""
+        return asdict(self)
+
+class CancelToken:
+    """
+    변환 취소/일시정지 신호. 엔진의 control 규약(cancel_requested / batch_paused)을 따릅니다.
+    다른 프로세스와 공유하려면 multiprocessing.Event를 넘겨 만듭니다.
+    """
+    def __init__(self, cancel_event=None, pause_event=None):
+        self._cancel = cancel_event or threading.Event()
+        self._pause = pause_event or threading.Event()
+
+    def cancel(self): self._cancel.set()
+    def pause(self): self._pause.set()
+    def resume(self): self._pause.clear()
+
+    @property
+    def cancel_requested(self): return self._cancel.is_set()
+
+    @property
+    def batch_paused(self): return self._pause.is_set() and not self._cancel.is_set()
+
+class ConversionCancelled(RuntimeError):
+    """convert() 취소. 기존 코드와의 호환을 위해 str()은 "CANCEL_REQUESTED"입니다."""
+    def __init__(self):
+        super().__init__("CANCEL_REQUESTED")
+
+class ProgressCallbackLogger(ProgressBarLogger or object):
+    """진행률을 callback(index, total)로 전달하는 로거 (MoviePy 로거 호환, 0.1초 간격)"""
+    def __init__(self, callback):
+        if ProgressBarLogger: super().__init__()
+        else: self.state = {'bars': {}}
+        self.progress_callback = callback
+        self.last_sent = 0.0
+
+    def bars_update(self, bar, index, total=None):
+        if bar not in self.state['bars']:
+            self.state['bars'][bar] = {'index': 0, 'total': total if total else 1}
+        if total is not None:
+            self.state['bars'][bar]['total'] = total
+        self.state['bars'][bar]['index'] = index
+        self.callback()
+
+    def callback(self, **changes):
+        now = time.time()
+        for message in self.state['bars'].values():
+            total, index = message.get('total') or 0, message.get('index') or 0
+            if total > 0 and (now - self.last_sent >= 0.1 or index >= total - 1):
+                self.last_sent = now
+                self.progress_callback(index, total)
+
+def _resolve_output_path(spec):
+    """작업의 출력 경로. 지정이 없으면 소스 옆, 폴더면 그 안에 고유 이름으로 정합니다."""
+    out_path = spec.output_path
+    if not out_path or (os.path.isdir(out_path) and spec.export_format != "Sequence"):
+        src = spec.sequence_paths[0] if spec.is_sequence else spec.path
+        out_dir = os.path.abspath(out_path) if out_path else os.path.dirname(os.path.abspath(src))
+        out_path = get_unique_path(os.path.join(out_dir, job_output_name(spec.to_dict())))
+    if spec.export_format == "Sequence":
+        os.makedirs(out_path, exist_ok=True)
+    return out_path
+
+def convert(job, progress_cb=None, cancel_token=None, threads=None):
+    """
+    작업 하나를 변환하고 출력 경로를 돌려줍니다.
+    - job: JobSpec 또는 대기열 작업(dict)
+    - progress_cb: 진행률(0.0~1.0)을 받는 함수, 또는 bars_update를 가진 진행률 로거(CTKLogger 등)
+    - cancel_token: CancelToken 또는 cancel_requested / batch_paused 속성을 가진 객체
+    - threads: FFMPEG/MoviePy 인코더 스레드 수 (없으면 인코더 기본값)
+    실패 시 예외, 취소 시 ConversionCancelled.
+    """
+    spec = job if isinstance(job, JobSpec) else JobSpec.from_dict(job)
+    control = cancel_token or CancelToken()
+    if progress_cb is None or hasattr(progress_cb, 'bars_update'):
+        logger = progress_cb
+    else:
+        logger = ProgressCallbackLogger(lambda index, total: progress_cb(min(1.0, index / total)))
+
+    out_path = _resolve_output_path(spec)
+    try:
+        run_job(spec.to_dict(), out_path, control, logger, threads)
+    except RuntimeError as e:
+        if str(e) == "CANCEL_REQUESTED": raise ConversionCancelled() from None
+        raise
+    if control.cancel_requested:
+        raise ConversionCancelled()
+    return out_path
@@ -0,0 +1,105 @@
+import os
+import time
+import video_engine
+import convert_engine
+import constants as const
+from constants import VIDEO_EXTS, IMAGE_EXTS
+
+MEDIA_EXTS = tuple(sorted(set(VIDEO_EXTS + IMAGE_EXTS)))
+
+class FolderWatcher:
+    """
+    드롭 폴더 감시 (폴링 인덱스, UI 없이 동작)
+    - 폴더마다 수정 시각을 기억해 바뀐 폴더만 다시 읽고, 완료 대기 중인 파일만 stat합니다.
+      같은 초 안의 변경 누락에 대비해 full_rescan_seconds마다 전체를 다시 읽습니다.
+    - 파일 크기/수정 시각이 settle_seconds 동안 그대로면 쓰기가 끝난 것으로 봅니다.
+    - 이미지 시퀀스는 모든 프레임이 완료되고 새 프레임이 settle_seconds 동안 없을 때 한 번에 내보냅니다.
+    네트워크 공유(SMB/NFS)는 inotify 이벤트가 오지 않는 경우가 많아 폴링 방식을 씁니다.
+    """
+    def __init__(self, folder, settle_seconds=const.WATCH_SETTLE_SECONDS, full_rescan_seconds=const.WATCH_FULL_RESCAN_SECONDS,
+                 include_existing=False, exclude=()):
+        self.folder = os.path.abspath(folder)
+        self.settle_seconds = settle_seconds
+        self.full_rescan_seconds = full_rescan_seconds
+        self.exclude = [os.path.abspath(p) for p in exclude]
+        self._dir_mtimes = {}   # 폴더 -> 마지막으로 읽었을 때의 수정 시각
+        self._subdirs = {}      # 폴더 -> 하위 폴더 목록
+        self._pending = {}      # 파일 -> [크기, 수정 시각, 마지막 변경을 본 시각]
+        self._seen = set()      # 이미 내보냈거나 무시하기로 한 파일
+        self._last_full_scan = time.time()
+        if not include_existing:
+            # 시작 시점에 이미 있던 파일은 처리하지 않음
+            self._seen.update(self._scan_changed_dirs())
+
+    def _is_excluded(self, path):
+        return any(path == ex or path.startswith(ex + os.sep) for ex in self.exclude)
+
+    def _scan_changed_dirs(self):
+        """수정 시각이 바뀐 폴더만 다시 읽어 그 안의 미디어 파일 목록을 돌려줍니다."""
+        found, stack = [], [self.folder]
+        while stack:
+            d = stack.pop()
+            try:
+                mtime = os.stat(d).st_mtime
+            except OSError:
+                self._dir_mtimes.pop(d, None); self._subdirs.pop(d, None)
+                continue
+            if self._dir_mtimes.get(d) != mtime:
+                subdirs = []
+                try:
+                    with os.scandir(d) as it:
+                        for entry in it:
+                            if entry.name.startswith('.'): continue
+                            if entry.is_dir(follow_symlinks=False):
+                                if not self._is_excluded(entry.path): subdirs.append(entry.path)
+                            elif entry.name.lower().endswith(MEDIA_EXTS):
+                                found.append(entry.path)
+                except OSError:
+                    continue
+                self._dir_mtimes[d], self._subdirs[d] = mtime, subdirs
+            stack.extend(self._subdirs.get(d, ()))
+        return found
+
+    @staticmethod
+    def _sequence_key(path):
+        if not path.lower().endswith(IMAGE_EXTS): return None
+        prefix, num, ext, sep = video_engine.get_sequence_info(os.path.basename(path))
+        return (os.path.dirname(path), prefix, ext.lower(), sep) if num else None
+
+    def poll(self):
+        """
+        쓰기가 끝난 새 소스 목록을 돌려줍니다. 영상은 경로(str), 시퀀스는 정렬된 경로 목록(list)입니다.
+        번호 없는 단일 이미지 등 변환 대상이 아닌 파일은 무시됩니다.
+        """
+        now = time.time()
+        full_scan = now - self._last_full_scan >= self.full_rescan_seconds
+        if full_scan:
+            self._dir_mtimes.clear(); self._last_full_scan = now
+        found = self._scan_changed_dirs()
+        if full_scan:
+            # 지워진 파일은 인덱스에서 제거 (같은 이름으로 다시 들어오면 새 파일로 처리)
+            self._seen.intersection_update(found)
+        for path in found:
+            if path not in self._seen and path not in self._pending:
+                self._pending[path] = [-1, -1, now]
+
+        for path, state in list(self._pending.items()):
+            try:
+                st = os.stat(path)
+            except OSError:
+                del self._pending[path]; continue
+            if (st.st_size, st.st_mtime) != (state[0], state[1]):
+                self._pending[path] = [st.st_size, st.st_mtime, now]
+
+        # 빈 파일(복사 시작 직후)은 완료로 보지 않음
+        settled = {p for p, s in self._pending.items() if s[0] > 0 and now - s[2] >= self.settle_seconds}
+        # 아직 쓰는 중인 프레임이 있는 시퀀스는 통째로 보류
+        busy = {k for k in (self._sequence_key(p) for p in self._pending if p not in settled) if k}
+        ready = [p for p in settled if self._sequence_key(p) not in busy]
+        if not ready: return []
+
+        for path in ready:
+            del self._pending[path]
+            self._seen.add(path)
+        sequences, videos = convert_engine.classify_media_files(ready)
+        return sequences + sorted(videos)
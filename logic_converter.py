@@ -3,15 +3,16 @@ import sys
 import threading
 import json
 import subprocess
-import tempfile
 import numpy as np
-import re
 import time
 from tkinter import filedialog, messagebox
 from PIL import Image
 import video_engine
+import convert_engine
+import batch_worker
+import batch_scheduler
 from utils import CTKLogger, get_unique_path, RESAMPLING_LANKZOS
-from constants import FILETYPES_JSON
+from constants import FILETYPES_JSON, GIF_DITHER_DEFAULT
 from ui_widgets import QueueWindow
 
 class ConverterMixin:
@@ -53,200 +54,34 @@ class ConverterMixin:
             self.progress_label.grid(row=9, column=0, pady=5)
             self.progress_label.configure(text="변환 준비 중...")
             
+            self.cancel_requested = False
             threading.Thread(target=self._convert_task, args=(save_path,), daemon=True).start()
 
-    def _direct_ffmpeg_export(self, job, out_path, logger, total_duration, color_settings=None):
-        """
-        MoviePy를 우회하여 FFMPEG를 직접 호출합니다. (VFR 최적화 및 속도 대폭 향상)
-        사용자의 색보정(PIL 기반)을 FFMPEG 비디오 필터로 번역하여 함께 적용합니다.
-        """
-        # [수정] imageio_ffmpeg를 통해 환경에 독립적인 확실한 FFMPEG 절대 경로 확보
-        try:
-            import imageio_ffmpeg
-            ffmpeg_exe = imageio_ffmpeg.get_ffmpeg_exe()
-        except Exception:
-            # imageio_ffmpeg가 없는 예외적인 경우에만 시스템 PATH에 의존
-            ffmpeg_exe = "ffmpeg"
-
-        start = job.get('start', 0)
-        end = job.get('end', -1)
-        duration = (total_duration - start) if end == -1 else (end - start)
-        
-        cmd = [ffmpeg_exe, '-y', '-ss', str(start)]
-        cmd.extend(['-i', job['path']])
-        cmd.extend(['-t', str(duration)])
-        
-        vf = []
-        # 1. 크롭 필터 적용
-        if job.get('crop_enabled'):
-            x1, y1, x2, y2 = job['crop']
-            rx1, rx2 = min(x1, x2), max(x1, x2)
-            ry1, ry2 = min(y1, y2), max(y1, y2)
-            cx, cy = f"{rx1}*iw", f"{ry1}*ih"
-            cw, ch = f"{rx2 - rx1}*iw", f"{ry2 - ry1}*ih"
-            vf.append(f"crop={cw}:{ch}:{cx}:{cy}")
-            
-        # 2. 리사이즈 필터 적용
-        target_w = job.get('width', 1280)
-        vf.append(f"scale={target_w}:-2")
-        vf.append("format=yuv420p")
-        
-        # 3. 색보정 필터 적용 (PIL 로직을 FFMPEG 네이티브 필터로 변환)
-        if color_settings and color_settings.get('color_correction'):
-            # 노출, 대비, 감마, 채도 -> eq 필터 사용
-            exp = color_settings.get('exposure', 0) / 100.0  # PIL: 1.0 + val, FFMPEG: -1.0 ~ 1.0 (default 0)
-            cont = 1.0 + (color_settings.get('contrast', 0) / 100.0) # FFMPEG: default 1.0
-            gam = color_settings.get('gamma', 1.0)
-            sat = color_settings.get('saturation', 1.0)
-            vf.append(f"eq=brightness={exp}:contrast={cont}:gamma={gam}:saturation={sat}")
-
-            # 틴트, 색온도 -> colorbalance 필터 사용 (Midtones 조정)
-            temp = color_settings.get('temperature', 0.0)
-            tint = color_settings.get('tint', 0.0)
-            rm, gm, bm = 0.0, 0.0, 0.0
-            
-            if temp > 0:
-                rm += temp / 300.0
-                bm -= temp / 300.0
-            elif temp < 0:
-                rm -= abs(temp) / 300.0
-                bm += abs(temp) / 300.0
-                
-            if tint > 0:
-                gm += tint / 300.0
-            elif tint < 0:
-                rm -= abs(tint) / 300.0
-                bm -= abs(tint) / 300.0
-                
-            # FFMPEG colorbalance limit is -1.0 to 1.0
-            rm = max(-1.0, min(1.0, rm))
-            gm = max(-1.0, min(1.0, gm))
-            bm = max(-1.0, min(1.0, bm))
-            
-            if rm != 0.0 or gm != 0.0 or bm != 0.0:
-                vf.append(f"colorbalance=rm={rm}:gm={gm}:bm={bm}")
-        
-        cmd.extend(['-vf', ",".join(vf)])
-        
-        bitrate = job.get('bitrate', '2')
-        cmd.extend(['-c:v', 'libx264', '-b:v', f"{bitrate}M", '-preset', 'medium', '-threads', '4'])
-        cmd.extend(['-c:a', 'aac', '-b:a', '128k'])
-        
-        # [핵심] VFR 타임스탬프 유동적 유지 (프레임 강제 재샘플링 방지)
-        cmd.extend(['-vsync', '0']) 
-        
-        cmd.append(out_path)
-
-        startupinfo = None
-        if sys.platform == "win32":
-            startupinfo = subprocess.STARTUPINFO()
-            startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW
-
-        proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True, universal_newlines=True, startupinfo=startupinfo)
-        
-        time_regex = re.compile(r"time=\s*(\d+):(\d+):(\d+\.\d+)")
-        
-        for line in proc.stdout:
-            if self.cancel_requested:
-                proc.kill()
-                raise RuntimeError("CANCEL_REQUESTED")
-            while self.batch_paused:
-                time.sleep(0.5)
-                if self.cancel_requested:
-                    proc.kill()
-                    raise RuntimeError("CANCEL_REQUESTED")
-                
-            match = time_regex.search(line)
-            if match and logger:
-                h, m, s = match.groups()
-                t_sec = int(h) * 3600 + int(m) * 60 + float(s)
-                logger.bars_update('main', index=int(t_sec), total=int(duration))
-                
-        proc.wait()
-        if proc.returncode != 0 and not self.cancel_requested:
-            raise RuntimeError(f"FFMPEG Direct Error: {proc.returncode}")
-            
-        if logger:
-            logger.bars_update('main', index=int(duration), total=int(duration))
+    def _current_job_spec(self, save_path):
+        """현재 편집 화면의 설정(타임라인/크롭/출력 옵션/색보정)을 엔진 작업 사양으로 만듭니다."""
+        is_seq = (self.video_path == "Image Sequence")
+        fmt = self.export_format_var.get()
+        color_settings = {"color_correction": self.color_correction_var.get(), "exposure": self.exposure_var.get(), "gamma": self.gamma_var.get(), "contrast": self.contrast_var.get(), "saturation": self.saturation_var.get(), "tint": self.tint_var.get(), "temperature": self.temperature_var.get()}
+        # 썸네일은 재생 헤드 위치의 한 프레임
+        start = self.timeline.play_head * self.duration if fmt == "Thumbnail" else self.timeline.in_point * self.duration
+        return convert_engine.JobSpec(
+            path=self.video_path, is_sequence=is_seq, sequence_paths=self.sequence_paths if is_seq else None,
+            export_format=fmt, start=start, end=self.timeline.out_point * self.duration,
+            fps=int(self.fps_input_var.get() or 24), width=int(self.combo_width.get()),
+            crop=list(self.crop_coords), crop_enabled=self.crop_enabled_var.get(),
+            transparent=self.keep_transparency_var.get(), loop=int(self.loop_count_var.get() or 0),
+            bitrate=self.webm_bitrate_var.get(), gif_dither=self.gif_dither_var.get(),
+            webp_quality=int(self.webp_quality_var.get() or 80), webp_lossless=self.webp_lossless_var.get(),
+            seq_format=self.seq_format_var.get(), color_settings=color_settings, output_path=save_path)
 
     def _convert_task(self, save_path):
         try:
-            from moviepy import VideoFileClip 
-            
             logger = CTKLogger(self, prefix="변환 중...", job_index=None)
-            color_settings = {"color_correction": self.color_correction_var.get(), "exposure": self.exposure_var.get(), "gamma": self.gamma_var.get(), "contrast": self.contrast_var.get(), "saturation": self.saturation_var.get(), "tint": self.tint_var.get(), "temperature": self.temperature_var.get()}
-
-            fmt = self.export_format_var.get()
-            target_w = int(self.combo_width.get())
-
-            # --- [핵심 수정] MP4 다이렉트 변환 분기 (VFR 끊김 해결) ---
-            # 색보정이 켜져 있더라도 번역된 필터를 통해 무조건 다이렉트 변환을 사용하도록 변경!
-            if fmt == "MP4" and self.video_path != "Image Sequence":
-                job_info = {
-                    'start': self.timeline.in_point * self.duration,
-                    'end': self.timeline.out_point * self.duration,
-                    'crop_enabled': self.crop_enabled_var.get(),
-                    'crop': self.crop_coords,
-                    'width': target_w,
-                    'bitrate': self.webm_bitrate_var.get(),
-                    'path': self.video_path
-                }
-                self._direct_ffmpeg_export(job_info, save_path, logger, self.duration, color_settings)
-                if not self.cancel_requested: self.after(0, lambda: messagebox.showinfo("완료", "변환 및 저장이 완료되었습니다."))
-                else: self.after(0, lambda: messagebox.showwarning("취소", "변환이 중단되었습니다."))
-                return # MoviePy 파이프라인 우회 완료
-            # --------------------------------------------------------
-
-            if self.video_path == "Image Sequence":
-                main_clip = video_engine.get_sequence_clip(self.sequence_paths, int(self.fps_input_var.get() or 24))
-            else:
-                has_alpha = self.video_path.lower().endswith(('.gif', '.png', '.webp', '.webm'))
-                main_clip = VideoFileClip(self.video_path, has_mask=has_alpha)
-
-            with main_clip:
-                if fmt == "Thumbnail":
-                    t_pos = self.timeline.play_head * self.duration
-                    sub = main_clip.resized(width=target_w) if hasattr(main_clip, 'resized') else main_clip.resize(width=target_w)
-                    webp_q = int(self.webp_quality_var.get() or 80)
-                    webp_l = self.webp_lossless_var.get()
-                    video_engine.perform_write_single_image(sub, save_path, t_pos, color_settings, self, webp_q=webp_q, webp_l=webp_l)
-                else:
-                    st, et = self.timeline.in_point * self.duration, self.timeline.out_point * self.duration
-                    sub = main_clip.subclipped(st, et) if hasattr(main_clip, 'subclipped') else main_clip.subclip(st, et)
-                    if self.crop_enabled_var.get():
-                        vw, vh = sub.size; x1, y1, x2, y2 = self.crop_coords; rx1, rx2, ry1, ry2 = min(x1, x2), max(x1, x2), min(y1, y2), max(y1, y2)
-                        sub = sub.cropped(x1=rx1*vw, y1=ry1*vh, x2=rx2*vw, y2=ry2*vh) if hasattr(sub, 'cropped') else sub.crop(x1=rx1*vw, y1=ry1*vh, x2=rx2*vw, y2=ry2*vh)
-                    sub = sub.resized(width=target_w) if hasattr(sub, 'resized') else sub.resize(width=target_w)
-
-                    if color_settings.get('color_correction', False):
-                        def color_filter(image):
-                            pil_img = Image.fromarray(image.astype('uint8'))
-                            return np.array(video_engine.apply_color_correction_pil(pil_img, color_settings).convert('RGB'))
-                        sub = sub.image_transform(color_filter)
-
-                    final_fps = int(self.fps_input_var.get() or 30)
-                    actual_transparent = self.keep_transparency_var.get() and sub.mask is not None
-                    
-                    if fmt == "Sequence":
-                        img_format = os.path.join(save_path, f"{os.path.basename(save_path)}.%04d.{self.seq_format_var.get().lower()}")
-                        sub.write_images_sequence(img_format, fps=final_fps, logger=logger)
-                    elif fmt == "WebM":
-                        temp_audio_path = os.path.join(tempfile.gettempdir(), f"temp_audio_single_{os.getpid()}.ogg")
-                        ffmpeg_params = ['-b:v', f"{self.webm_bitrate_var.get()}M", '-auto-alt-ref', '0', '-metadata:s:v:0', 'alpha_mode=1']
-                        ffmpeg_params.extend(['-pix_fmt', 'yuva420p'] if actual_transparent else ['-pix_fmt', 'yuv420p'])
-                        sub.write_videofile(save_path, fps=final_fps, codec='libvpx-vp9', logger=logger, ffmpeg_params=ffmpeg_params, temp_audiofile=temp_audio_path, remove_temp=True)
-                    elif fmt == "WebP": 
-                        webp_q = int(self.webp_quality_var.get() or 80)
-                        webp_l = self.webp_lossless_var.get()
-                        video_engine.perform_write_webp(sub, save_path, final_fps, logger, int(self.loop_count_var.get() or 0), self.keep_transparency_var.get(), self, quality=webp_q, lossless=webp_l)
-                    else: 
-                        video_engine.perform_write_gif(sub, save_path, final_fps, logger, int(self.loop_count_var.get() or 0), actual_transparent, self)
-
-            if not self.cancel_requested: self.after(0, lambda: messagebox.showinfo("완료", "변환 및 저장이 완료되었습니다."))
-            else: self.after(0, lambda: messagebox.showwarning("취소", "변환이 중단되었습니다."))
-        except RuntimeError as e:
-            if str(e) == "CANCEL_REQUESTED": self.after(0, lambda: messagebox.showwarning("취소", "변환이 중단되었습니다."))
-            else: self.after(0, lambda msg=str(e): messagebox.showerror("오류", f"변환 실패: {msg}"))
+            # MP4/GIF/WebM은 FFMPEG 다이렉트 변환, 나머지는 MoviePy 변환 (convert_engine.run_job)
+            convert_engine.convert(self._current_job_spec(save_path), logger, self)
+            self.after(0, lambda: messagebox.showinfo("완료", "변환 및 저장이 완료되었습니다."))
+        except convert_engine.ConversionCancelled:
+            self.after(0, lambda: messagebox.showwarning("취소", "변환이 중단되었습니다."))
         except Exception as e: self.after(0, lambda msg=str(e): messagebox.showerror("오류", f"변환 실패: {msg}"))
         finally: self.after(0, self._finalize_conversion_ui)
 
@@ -289,6 +124,7 @@ class ConverterMixin:
         "bitrate": self.webm_bitrate_var.get(), 
         "webp_quality": int(self.webp_quality_var.get() or 80),
         "webp_lossless": self.webp_lossless_var.get(), # WebP 옵션 처리
+        "gif_dither": self.gif_dither_var.get(),
         "color_settings": cs
         }
 
@@ -342,6 +178,7 @@ class ConverterMixin:
             # WebP 옵션 추가
             self.webp_quality_var.set(str(job.get('webp_quality', 80)))
             self.webp_lossless_var.set(job.get('webp_lossless', False))
+            self.gif_dither_var.set(job.get('gif_dither', GIF_DITHER_DEFAULT))
             fmt = job.get('export_format', "GIF"); self.export_format_var.set(fmt); self._update_export_ui(fmt)
             cs = job.get('color_settings', {})
             self.exposure_var.set(cs.get('exposure', 0.0)); self.gamma_var.set(cs.get('gamma', 1.0))
@@ -415,112 +252,64 @@ class ConverterMixin:
             self.queue_window.update_list()
 
     def _batch_task(self, save_dir, selected_indices):
-        from moviepy import VideoFileClip 
-        
-        total, success_count = len(selected_indices), 0
+        """
+        선택된 작업들을 CPU/메모리 예산 안에서 동시에 실행합니다. 각 작업은 별도 프로세스에서 돌며
+        작업별 스레드 수는 batch_scheduler.estimate_job_resources 추정치로 FFMPEG에 전달됩니다.
+        """
+        total = len(selected_indices)
         self.cancel_requested = False 
+        self._batch_lock = threading.Lock()
+        self._batch_success = 0
+        budget = batch_scheduler.BatchResourceBudget()
         
         self.after(0, lambda: self.queue_window.append_log(f"=== 일괄 변환 프로세스 시작 (총 {total}개 항목) ==="))
-        self.after(0, lambda: self.queue_window.append_log(f"저장 경로: {save_dir}"))
+        self.after(0, lambda: self.queue_window.append_log(f"저장 경로: {save_dir} (CPU {budget.cpu_threads}스레드 / 메모리 {budget.memory_bytes // (1024 * 1024)}MB 예산)"))
 
         try:
-            for i, q_idx in enumerate(selected_indices):
-                if self.cancel_requested: break
-                job = self.queue[q_idx]
-                fname = job['filename']
-                
-                try:
-                    job['status'] = "진행중"; self.after(0, lambda: self.queue_window.update_list() if self.queue_window else None)
-                    self.after(0, lambda n=fname, c=i+1, t=total: self.queue_window.append_log(f"[{c}/{t}] 변환 시작: {n}"))
-                    
-                    base_name, fmt = os.path.splitext(job['filename'])[0], job.get('export_format', "GIF")
-                    
-                    if fmt == "Thumbnail":
-                        ext = f".{job.get('seq_format', 'PNG').lower()}"
-                        out_path = get_unique_path(os.path.join(save_dir, f"{base_name}_thumb{ext}"))
-                    elif fmt == "Sequence":
-                        out_path = get_unique_path(os.path.join(save_dir, base_name))
-                        if not os.path.exists(out_path): os.makedirs(out_path)
-                    else:
-                        ext = {"GIF": ".gif", "MP4": ".mp4", "WebM": ".webm", "WebP": ".webp"}.get(fmt, ".gif")
-                        out_path = get_unique_path(os.path.join(save_dir, f"{base_name}{ext}"))
-
-                    logger = CTKLogger(self, prefix=f"({i+1}/{total})", job_index=q_idx, total_jobs=total)
-                    
-                    # --- [핵심 수정] MP4 다이렉트 처리 (VFR 끊김 해결) ---
-                    batch_cs = job.get('color_settings', {})
-                    # 색보정 설정이 있어도 번역된 필터를 통해 무조건 다이렉트 변환을 사용하도록 변경!
-                    if fmt == "MP4" and not job.get('is_sequence'):
-                        meta = video_engine.get_video_metadata(job['path'])
-                        total_duration = meta['duration'] if meta else 0
-                        
-                        self._direct_ffmpeg_export(job, out_path, logger, total_duration, batch_cs)
-                        job['status'] = "완료"
-                        success_count += 1
-                        self.after(0, lambda n=fname: self.queue_window.append_log(f"완료: {n}"))
-                        continue # MoviePy 로직 스킵
-                    # ----------------------------------------------------
-
-                    if job.get('is_sequence'):
-                        c = video_engine.get_sequence_clip(job['sequence_paths'], job['fps'])
-                    else:
-                        has_alpha = job['path'].lower().endswith(('.gif', '.png', '.webp', '.webm'))
-                        c = VideoFileClip(job['path'], has_mask=has_alpha)
-                    
-                    with c:
-                        target_w = job['width']
-                        if fmt == "Thumbnail":
-                            c_res = c.resized(width=target_w) if hasattr(c, 'resized') else c.resize(width=target_w)
-                            webp_q = job.get('webp_quality', 80)
-                            webp_l = job.get('webp_lossless', False)
-                            video_engine.perform_write_single_image(c_res, out_path, job['start'], job.get('color_settings', {}), self, webp_q=webp_q, webp_l=webp_l)
-                        else:
-                            st, et = max(0, job['start']), min(c.duration, (job['end'] if job['end'] != -1 else c.duration))
-                            sub = c.subclipped(st, et) if hasattr(c, 'subclipped') else c.subclip(st, et)
-                            if job.get('crop_enabled'):
-                                vw, vh = sub.size; x1, y1, x2, y2 = job['crop']
-                                sub = sub.cropped(x1=min(x1,x2)*vw, y1=min(y1,y2)*vh, x2=max(x1,x2)*vw, y2=max(y1,y2)*vh)
-                            sub = sub.resized(width=target_w) if hasattr(sub, 'resized') else sub.resize(width=target_w)
-                            
-                            batch_cs = job.get('color_settings', {})
-                            if batch_cs.get('color_correction'):
-                                def b_filter(img): return np.array(video_engine.apply_color_correction_pil(Image.fromarray(img.astype('uint8')), batch_cs).convert('RGB'))
-                                sub = sub.image_transform(b_filter)
-                            
-                            actual_transparent = job.get('transparent') and sub.mask is not None
-
-                            if fmt == "Sequence":
-                                img_format = os.path.join(out_path, f"{os.path.basename(out_path)}.%04d.{job.get('seq_format', 'JPG').lower()}")
-                                sub.write_images_sequence(img_format, fps=job['fps'], logger=logger)
-                            elif fmt == "WebM":
-                                temp_audio_path = os.path.join(tempfile.gettempdir(), f"temp_audio_batch_{q_idx}_{os.getpid()}.ogg")
-                                pix_fmt = 'yuva420p' if actual_transparent else 'yuv420p'
-                                # [수정] withmask 인자 제거
-                                sub.write_videofile(out_path, fps=job['fps'], codec='libvpx-vp9', logger=logger, ffmpeg_params=['-pix_fmt', pix_fmt], temp_audiofile=temp_audio_path, remove_temp=True)
-                            elif fmt == "WebP":
-                                webp_q = job.get('webp_quality', 80)
-                                webp_l = job.get('webp_lossless', False)
-                                video_engine.perform_write_webp(sub, out_path, job['fps'], logger, job.get('loop', 0), actual_transparent, self, quality=webp_q, lossless=webp_l)                                 
-                            else: 
-                                video_engine.perform_write_gif(sub, out_path, job['fps'], logger, job.get('loop', 0), actual_transparent, self)
-                    
-                    job['status'], success_count = "완료", success_count + 1
-                    self.after(0, lambda n=fname: self.queue_window.append_log(f"완료: {n}"))
-
-                except RuntimeError as e: 
-                    msg = str(e)
-                    job['status'] = "취소됨" if msg == "CANCEL_REQUESTED" else f"실패: {msg[:20]}"
-                    self.after(0, lambda n=fname, m=msg: self.queue_window.append_log(f"오류 ({n}): {m}"))
-                except Exception as e: 
-                    msg = str(e)
-                    job['status'] = f"실패: {msg[:20]}"
-                    self.after(0, lambda n=fname, m=msg: self.queue_window.append_log(f"오류 ({n}): {m}"))
-                self.after(0, lambda: self.queue_window.update_list() if self.queue_window else None)
-            
+            jobs = [self.queue[q_idx] for q_idx in selected_indices]
+            batch_scheduler.run_batch_scheduled(
+                jobs, lambda i, job, threads, memory: self._run_batch_job(save_dir, selected_indices[i], i, total, threads, memory), budget,
+                is_cancelled=lambda: self.cancel_requested, is_paused=lambda: self.batch_paused,
+                on_error=lambda i, job, e: self._fail_batch_job(job, e))
         finally: 
             self.is_batch_converting = False
             self.after(0, self._reset_batch_ui)
-            self.after(0, lambda: self.queue_window.append_log(f"=== 일괄 변환 종료 (성공: {success_count}/{len(selected_indices)}) ==="))
+            self.after(0, lambda c=self._batch_success: self.queue_window.append_log(f"=== 일괄 변환 종료 (성공: {c}/{total}) ==="))
+
+    def _run_batch_job(self, save_dir, q_idx, i, total, threads, memory):
+        """
+        일괄 변환 작업 하나를 별도 작업 프로세스에서 실행하고 상태/로그를 기록합니다. (작업 스레드에서 호출)
+        취소/일시정지는 프로세스 종료/정지로 즉시 반영되고, 작업 프로세스가 죽거나 메모리 한도를 넘으면 이 작업만 실패로 남습니다.
+        """
+        job = self.queue[q_idx]
+        fname = job['filename']
+        out_path = None
+        try:
+            job['status'] = "진행중"; self.after(0, lambda: self.queue_window.update_list() if self.queue_window else None)
+            self.after(0, lambda n=fname, c=i+1, t=total, th=threads: self.queue_window.append_log(f"[{c}/{t}] 변환 시작: {n} ({th}스레드)"))
+            
+            out_path = convert_engine.reserve_output_path(save_dir, job, self._batch_lock)
+            logger = CTKLogger(self, prefix=f"({i+1}/{total})", job_index=q_idx, total_jobs=total)
+            batch_worker.run_job_isolated(job, out_path, self, logger, threads=threads, memory_limit=batch_worker.job_memory_limit(memory))
+            
+            job['status'] = "완료"
+            with self._batch_lock: self._batch_success += 1
+            self.after(0, lambda n=fname: self.queue_window.append_log(f"완료: {n}"))
+
+        except Exception as e: 
+            msg = str(e)
+            job['status'] = "취소됨" if (isinstance(e, RuntimeError) and msg == "CANCEL_REQUESTED") else f"실패: {msg[:20]}"
+            self.after(0, lambda n=fname, m=msg: self.queue_window.append_log(f"오류 ({n}): {m}"))
+            # 출력이 만들어지지 않았으면 미리 잡아둔 빈 자리 파일 정리
+            convert_engine.discard_reserved_output(out_path)
+        self.after(0, lambda: self.queue_window.update_list() if self.queue_window else None)
+
+    def _fail_batch_job(self, job, error):
+        """작업을 시작하기 전(자원 추정 등)에 난 오류로 해당 작업만 실패 처리합니다."""
+        msg = str(error) or type(error).__name__
+        job['status'] = f"실패: {msg[:20]}"
+        self.after(0, lambda n=job.get('filename'), m=msg: self.queue_window.append_log(f"오류 ({n}): {m}"))
+        self.after(0, lambda: self.queue_window.update_list() if self.queue_window else None)
 
     def _reset_batch_ui(self):
         if self.queue_window and self.queue_window.winfo_exists():
@@ -554,11 +343,30 @@ class ConverterMixin:
         if total == 0: self.after(0, self._finalize_processing, []); return
 
         def analysis_thread():
-            valid_items = video_engine.bulk_analyze_items_parallel(items, max_workers=8)
-            self.after(0, lambda: self._finalize_processing(valid_items))
+            # 분석은 완료 순서로 끝나지만 대기열에는 원래 순서대로, 앞에서부터 연속으로 끝난 항목만
+            # 묶어서(최대 0.2초 간격) 바로 반영
+            results, next_idx = [None] * total, 0
+            batch, last_flush = [], time.time()
+            try:
+                for done, (idx, item) in enumerate(video_engine.iter_analyze_items(items), 1):
+                    results[idx] = item
+                    while next_idx < total and results[next_idx] is not None:
+                        batch.append(results[next_idx]); results[next_idx] = None; next_idx += 1
+                    if batch and (time.time() - last_flush >= 0.2 or next_idx == total):
+                        self.after(0, self._append_analyzed_items, batch, done, total)
+                        batch, last_flush = [], time.time()
+            finally:
+                # 분석 중 예외가 나도 끝난 항목은 순서대로 반영하고 로딩 상태는 반드시 해제
+                self.after(0, self._finalize_processing, batch + [r for r in results if r is not None])
         
         threading.Thread(target=analysis_thread, daemon=True).start()
 
+    def _append_analyzed_items(self, items, done, total):
+        self.queue.extend(items)
+        self.progress_bar.set(done / total); self.progress_label.configure(text=f"미디어 분석 중... ({done}/{total})")
+        if self.queue_window and self.queue_window.winfo_exists(): self.queue_window.update_list()
+        else: self.open_queue_window()
+
     def _finalize_processing(self, valid_items):
         self.queue.extend(valid_items); self.progress_bar.grid_remove(); self.progress_label.grid_remove(); self._set_loading_ui_state(False)
         if self.queue_window and self.queue_window.winfo_exists(): self.queue_window.update_list()
@@ -4,8 +4,10 @@ import numpy as np
 from tkinter import filedialog, messagebox
 from PIL import Image
 import video_engine
+import convert_engine
 from utils import natural_sort_key
-from constants import FILETYPES_SINGLE, FILETYPES_SEQUENCE, VIDEO_EXTS, IMAGE_EXTS
+import constants as const
+from constants import FILETYPES_SINGLE, FILETYPES_SEQUENCE
 
 class MediaMixin:
     """파일 및 폴더 로드, 미디어 분석 관련 로직"""
@@ -60,7 +62,7 @@ class MediaMixin:
     def load_new_video(self, path, edit_job=None):
         if self.is_loading: return
         self._set_loading_ui_state(True)
-        self.frame_cache = {} 
+        self.frame_cache.clear() 
         self.video_path = path
         self.progress_bar.set(0)
         self.progress_bar.grid(row=8, column=0, pady=10, padx=50, sticky="ew")
@@ -79,18 +81,37 @@ class MediaMixin:
             
             new_clip = VideoFileClip(path, has_mask=path.lower().endswith('.gif'))
             self.source_clip = new_clip
-            self.duration, self.fps, thumbs, total_thumbs = new_clip.duration, new_clip.fps or 24, [], 12
+            self.duration, self.fps, thumbs, total_thumbs = new_clip.duration, new_clip.fps or 24, [], const.FILMSTRIP_FRAMES
+            if not path.lower().endswith('.gif') and video_engine.metadata_cache.get(path) is None:
+                # 이미 열린 클립 정보로 메타데이터 캐시를 채워 이후 대기열/일괄 변환에서 ffprobe 생략
+                video_engine.metadata_cache.put(path, {'width': new_clip.w, 'height': new_clip.h, 'fps': self.fps, 'duration': self.duration})
             self.proxy_enabled_var.set(False); self.is_proxy_ready = False
             
-            for i in range(total_thumbs):
+            # 디스크 캐시에 필름스트립이 있으면 프레임 디코딩 생략 (대기열 항목 재편집 시)
+            strip_key = video_engine.filmstrip_cache_key([path], total_thumbs)
+            cached = video_engine.thumbnail_cache.get_strip(strip_key, total_thumbs) if strip_key else None
+            thumbs = cached or [None] * total_thumbs
+            
+            # 메타데이터만으로 먼저 편집 가능 상태로 전환하고, 필름스트립은 추출되는 대로 채움
+            if load_id != self.current_load_id: return
+            self.after(0, lambda t=list(thumbs): (setattr(self, 'clip', new_clip), self._init_video_ui(t, edit_job)))
+            if cached: return
+            
+            done = 0
+            for i, img in video_engine.iter_filmstrip_frames(path, self.duration, total_thumbs):
+                if load_id != self.current_load_id: return
+                # 같은 칸이 정확한 프레임으로 다시 올 수 있으므로 채워진 칸 수로 진행률 계산
+                thumbs[i] = img
+                done = sum(t is not None for t in thumbs)
+                self._push_filmstrip_frame(load_id, i, img, done, total_thumbs)
+            for i in [i for i, img in enumerate(thumbs) if img is None]:
+                # FFMPEG 추출 실패분만 MoviePy로 보충
                 if load_id != self.current_load_id: return
                 ft = max(0.01, min(self.duration - 0.01, (self.duration / total_thumbs) * i))
                 with self.clip_access_lock: frame = new_clip.get_frame(ft)
-                thumbs.append(Image.fromarray(frame.astype('uint8')))
-                self.after(0, lambda p=(i + 1)/total_thumbs, c=i+1: (self.progress_bar.set(p), self.progress_label.configure(text=f"데이터 분석 중... ({c}/{total_thumbs})")))
-            
-            if load_id == self.current_load_id: 
-                self.after(0, lambda: (setattr(self, 'clip', new_clip), self._init_video_ui(thumbs, edit_job)))
+                thumbs[i], done = Image.fromarray(frame.astype('uint8')), done + 1
+                self._push_filmstrip_frame(load_id, i, thumbs[i], done, total_thumbs)
+            if strip_key: video_engine.thumbnail_cache.put_strip(strip_key, thumbs)
         except Exception as e:
             if load_id == self.current_load_id:
                 self.after(0, lambda m=str(e): (self._set_loading_ui_state(False), messagebox.showerror("오류", f"파일 로드 실패: {m}")))
@@ -98,10 +119,19 @@ class MediaMixin:
             if load_id == self.current_load_id:
                 self.after(0, lambda: (self.progress_bar.grid_remove(), self.progress_label.grid_remove()))
 
+    def _push_filmstrip_frame(self, load_id, index, img, done, total):
+        """추출된 필름스트립 프레임을 UI 스레드에서 타임라인에 반영 (다른 파일로 전환되었으면 무시)"""
+        def apply():
+            if load_id != self.current_load_id: return
+            self.timeline.set_thumbnail(index, img)
+            self.progress_bar.set(done / total)
+            self.progress_label.configure(text=f"필름스트립 생성 중... ({done}/{total})")
+        self.after(0, apply)
+
     def load_new_sequence(self, paths, edit_job=None):
         if not paths: return
         self._set_loading_ui_state(True)
-        self.frame_cache = {}
+        self.frame_cache.clear()
         self.is_proxy_ready = False; self.is_proxy_active = False; self.proxy_clip = None
         self.video_path, self.sequence_paths = "Image Sequence", paths
         self.export_format_var.set("WebM"); self._update_export_ui(self.export_format_var.get())
@@ -110,7 +140,7 @@ class MediaMixin:
         self.current_load_id += 1; threading.Thread(target=self._load_sequence_task, args=(paths, edit_job, self.current_load_id), daemon=True).start()
 
     def _load_sequence_task(self, paths, edit_job, load_id):
-        self.frame_cache = {}
+        self.frame_cache.clear()
         try:
             target_fps = int(self.fps_input_var.get() or 24)
             self.clip = video_engine.get_sequence_clip(paths, target_fps)
@@ -118,18 +148,26 @@ class MediaMixin:
                 self.after(0, lambda: self._set_loading_ui_state(False)); return
             if load_id != self.current_load_id: 
                 self.after(0, lambda: self._set_loading_ui_state(False)); return
-            self.duration, self.fps, thumbs, total_thumbs = self.clip.duration, target_fps, [], 12
+            self.duration, self.fps, thumbs, total_thumbs = self.clip.duration, target_fps, [], const.FILMSTRIP_FRAMES
             self.source_clip = self.clip; self.is_proxy_ready = True 
             total_frames = len(paths); sample_indices = np.linspace(0, total_frames - 1, total_thumbs, dtype=int)
-            for idx, f_idx in enumerate(sample_indices):
+            sample_paths = [self.clip.frame_source.paths[i] for i in sample_indices]
+            strip_key = video_engine.filmstrip_cache_key(sample_paths, total_thumbs)
+            cached = video_engine.thumbnail_cache.get_strip(strip_key, total_thumbs) if strip_key else None
+            thumbs = cached or [None] * total_thumbs
+            
+            if load_id != self.current_load_id: return
+            self.after(0, lambda t=list(thumbs): self._init_video_ui(t, edit_job))
+            if cached: return
+            
+            done = 0
+            for i, img in video_engine.iter_sequence_filmstrip_frames(sample_paths):
                 if load_id != self.current_load_id: return
-                t_pos = f_idx / target_fps
-                frame = self.clip.get_frame(min(self.duration - 0.001, t_pos))
-                thumbs.append(Image.fromarray(frame.astype('uint8')))
-                p_val = 0.5 + ((idx + 1) / total_thumbs * 0.5)
-                self.after(0, lambda v=p_val: self.progress_bar.set(v))
-            if load_id == self.current_load_id: 
-                self.after(0, lambda: self._init_video_ui(thumbs, edit_job))
+                # 같은 칸이 정확한 프레임으로 다시 올 수 있으므로 채워진 칸 수로 진행률 계산
+                thumbs[i] = img
+                done = sum(t is not None for t in thumbs)
+                self._push_filmstrip_frame(load_id, i, img, done, total_thumbs)
+            if strip_key and None not in thumbs: video_engine.thumbnail_cache.put_strip(strip_key, thumbs)
         except Exception as e:
             if load_id == self.current_load_id:
                 self.after(0, lambda m=str(e): (self._set_loading_ui_state(False), messagebox.showerror("오류", f"시퀀스 로드 실패: {m}")))
@@ -157,35 +195,14 @@ class MediaMixin:
             "tint": self.tint_var.get(), "temperature": self.temperature_var.get()
         }
 
-        all_files = []
-        for r, d, files in os.walk(folder):
-            for f in files: all_files.append(os.path.join(r, f))
-
-        new_jobs, sequences = [], {}
-
-        for f_path in all_files:
-            l_f = f_path.lower()
-            if l_f.endswith(IMAGE_EXTS):
-                prefix, num, ext, sep = video_engine.get_sequence_info(os.path.basename(f_path))
-                if num:
-                    key = (os.path.dirname(f_path), prefix, ext.lower(), sep)
-                    if key not in sequences: sequences[key] = []
-                    sequences[key].append(f_path)
-        
-        used_in_sequence = set()
-        for key, paths in sequences.items():
-            if len(paths) > 1:
-                used_in_sequence.update(paths)
-                display_name = video_engine.get_sequence_display_name(paths)
-                paths.sort(key=lambda x: natural_sort_key(os.path.basename(x)))
-                job = {"path": "Image Sequence", "filename": display_name, "status": "대기", "sequence_paths": paths, "start": 0, "end": -1, "fps": 24, "video_fps": 24, "width": ui_width if is_thumb_mode else 1280, "loop": 0, "crop": [0,0,1,1], "crop_enabled": False, "thumb_img": None, "transparent": True, "export_format": "Thumbnail" if is_thumb_mode else "WebM", "seq_format": self.seq_format_var.get(), "bitrate": "2", "is_sequence": True, "color_settings": ui_color_settings if is_thumb_mode else {}}
-                new_jobs.append(job)
+        # 썸네일 모드에서는 현재 UI의 폭/색보정을 적용, 그 외에는 폴더 불러오기 기본값 사용
+        preset = {"seq_format": self.seq_format_var.get()}
+        if is_thumb_mode:
+            preset.update({"export_format": "Thumbnail", "width": ui_width, "color_settings": ui_color_settings})
 
-        for v in all_files:
-            l_v = v.lower()
-            if l_v.endswith(VIDEO_EXTS) and v not in used_in_sequence:
-                job = {"path": v, "filename": os.path.basename(v), "status": "대기", "start": 0, "end": -1, "fps": 24, "video_fps": 24, "width": ui_width if is_thumb_mode else 1280, "loop": 0, "crop": [0,0,1,1], "crop_enabled": False, "thumb_img": None, "transparent": True, "export_format": "Thumbnail" if is_thumb_mode else "GIF", "seq_format": self.seq_format_var.get(), "bitrate": "2", "color_settings": ui_color_settings if is_thumb_mode else {}}
-                new_jobs.append(job)
+        sequences, videos = convert_engine.collect_folder_media(folder)
+        new_jobs = [convert_engine.make_job(paths, preset) for paths in sequences]
+        new_jobs += [convert_engine.make_job(v, preset) for v in videos]
 
         if not new_jobs:
             self.after(0, lambda: (self._set_loading_ui_state(False), self.progress_bar.grid_remove(), self.progress_label.grid_remove(), messagebox.showinfo("알림", "지원되는 파일이 없습니다.")))
@@ -1,13 +1,13 @@
-import time
-import threading
 from PIL import Image, ImageTk
 from utils import format_timecode, RESAMPLING_BILINEAR, RESAMPLING_LANKZOS
 import video_engine
+import constants as const
 
 class PlayerMixin:
     """재생, 타임라인, 프리뷰 렌더링 및 크롭 관련 로직"""
 
     def _init_video_ui(self, thumbs, edit_job):
+        if self.is_playing: self.toggle_playback()
         self.update()
         is_sequence = (self.video_path == "Image Sequence")
         if is_sequence:
@@ -40,6 +40,7 @@ class PlayerMixin:
             # WebP 옵션 복구
             self.webp_quality_var.set(str(edit_job.get('webp_quality', 80)))
             self.webp_lossless_var.set(edit_job.get('webp_lossless', False))
+            self.gif_dither_var.set(edit_job.get('gif_dither', const.GIF_DITHER_DEFAULT))
 
             # 수동으로 투명도 설정 적용 (원본에 마스크가 있을 때만 체크 값 수용)
             if has_alpha:
@@ -99,12 +100,17 @@ class PlayerMixin:
             d_txt, f_count = format_timecode(end-start, curr_fps), int(round((end-start)*curr_fps))
             self.label_playback_info.configure(text=f"{d_txt} / {f_count}F | {self.clip.w}x{self.clip.h}")
         if fast:
-            if self.preview_update_timer: self.after_cancel(self.preview_update_timer)
-            self.preview_update_timer = self.after(30, lambda: self.update_preview_frame(play_head, scrubbing=True))
+            # 드래그 이벤트는 매번 들어오므로 최신 위치만 기억하고, 대기 중인 갱신이 없을 때만 예약합니다
+            self._scrub_target = play_head
+            if not self.preview_update_timer:
+                self.preview_update_timer = self.after_idle(self._flush_scrub_preview)
         else: self.update_preview_frame(play_head, scrubbing=True)
 
+    def _flush_scrub_preview(self):
+        self.preview_update_timer = None
+        self.update_preview_frame(self._scrub_target, scrubbing=True)
+
     def update_preview_frame(self, t, force_resize=False, scrubbing=False):
-        self.frame_cache = {}
         if not self.clip: return
         acquired = self.render_lock.acquire(blocking= scrubbing)
         if not acquired: return
@@ -112,81 +118,117 @@ class PlayerMixin:
             self.preview_canvas.update_idletasks() 
             cw, ch = self.preview_canvas.winfo_width(), self.preview_canvas.winfo_height()
             if cw < 10 or ch < 10: return
-            safe_t = max(0, min(t, self.duration - 0.001)); cache_key = (round(safe_t, 3), force_resize)
-            if cache_key in self.frame_cache and not force_resize and not self.color_correction_var.get(): img = self.frame_cache[cache_key]
-            else:
-                img = None
-                try:
-                    with self.clip_access_lock: frame = self.clip.get_frame(safe_t); img = Image.fromarray(frame.astype('uint8')) 
-                    img.thumbnail((cw, ch), RESAMPLING_BILINEAR)
-                    if len(self.frame_cache) > 150: self.frame_cache.pop(next(iter(self.frame_cache)))
-                    self.frame_cache[cache_key], self.last_preview_img_data, self.last_preview_time = img, img, t
-                except: img = self.last_preview_img_data
+            try:
+                img = self._get_preview_frame(self.clip, t, (cw, ch))
+                self.last_preview_img_data, self.last_preview_time = img, t
+            except: img = self.last_preview_img_data
             if img:
-                settings = {"color_correction": self.color_correction_var.get(), "exposure": self.exposure_var.get(), "gamma": self.gamma_var.get(), "contrast": self.contrast_var.get(), "saturation": self.saturation_var.get(), "tint": self.tint_var.get(), "temperature": self.temperature_var.get()}
-                c_img = video_engine.apply_color_correction_pil(img, settings); self._render_to_canvas(c_img)
+                c_img = video_engine.apply_color_correction_pil(img, self._get_color_settings()); self._render_to_canvas(c_img)
         finally: self.render_lock.release()
 
+    def _get_preview_frame(self, clip, t, size):
+        """
+        렌더 크기에 맞춘 색보정 전 프리뷰 프레임. 시간은 현재 fps의 프레임 인덱스로 양자화되어
+        스크러빙/재생/크롭/색보정이 같은 캐시 항목을 공유합니다.
+        """
+        fps = self.fps or const.DEFAULT_FPS
+        key = self.frame_cache.make_key(clip, t, fps, size)
+        img = self.frame_cache.get(key)
+        if img is None:
+            safe_t = max(0, min(key[1] / fps, self.duration - 0.001))
+            with self.clip_access_lock: frame = clip.get_frame(safe_t)
+            img = Image.fromarray(frame.astype('uint8')); img.thumbnail(size, RESAMPLING_BILINEAR)
+            self.frame_cache.put(key, img)
+        return img
+
     def _render_to_canvas(self, pil_img):
-        """프리뷰 캔버스 렌더링 및 크롭 가이드 그리기"""
+        """
+        프리뷰 캔버스 렌더링 및 크롭 가이드 그리기.
+        PhotoImage는 프레임 크기가 바뀔 때만 새로 만들고 평소에는 paste로 픽셀만 교체하며,
+        이미지/크롭 가이드 캔버스 항목은 한 번 만든 뒤 coords로 위치만 옮깁니다.
+        """
         try:
-            self.last_preview_img = ImageTk.PhotoImage(pil_img); cw, ch = self.preview_canvas.winfo_width(), self.preview_canvas.winfo_height(); cw, ch = max(cw, 10), max(ch, 10); self.preview_canvas.delete("all"); self.preview_canvas.create_image(cw/2, ch/2, image=self.last_preview_img, anchor="center")
-            if self.crop_enabled_var.get() and self.crop_coords:
-                iw, ih = pil_img.width, pil_img.height; ox, oy = (cw - iw) / 2, (ch - ih) / 2; x1, y1, x2, y2 = self.crop_coords; px1, px2, py1, py2 = ox + min(x1, x2)*iw, ox + max(x1, x2)*iw, oy + min(y1, y2)*ih, oy + max(y1, y2)*ih
-                
-                # 가이드 라인
-                self.preview_canvas.create_rectangle(px1, py1, px2, py2, outline="#ff7700", width=2, dash=(4,4))
-                
-                # 코너 핸들 강조
-                cl, ct, color = 10, 4, "#ff7700" 
-                # 좌상
-                self.preview_canvas.create_line(px1, py1, px1 + cl, py1, fill=color, width=ct)
-                self.preview_canvas.create_line(px1, py1, px1, py1 + cl, fill=color, width=ct)
-                # 우상
-                self.preview_canvas.create_line(px2, py1, px2 - cl, py1, fill=color, width=ct)
-                self.preview_canvas.create_line(px2, py1, px2, py1 + cl, fill=color, width=ct)
-                # 좌하
-                self.preview_canvas.create_line(px1, py2, px1 + cl, py2, fill=color, width=ct)
-                self.preview_canvas.create_line(px1, py2, px1, py2 - cl, fill=color, width=ct)
-                # 우하
-                self.preview_canvas.create_line(px2, py2, px2 - cl, py2, fill=color, width=ct)
-                self.preview_canvas.create_line(px2, py2, px2, py2 - cl, fill=color, width=ct)
-                
+            canvas = self.preview_canvas
+            cw, ch = max(canvas.winfo_width(), 10), max(canvas.winfo_height(), 10)
+            photo = self.last_preview_img
+            if photo is None or (photo.width(), photo.height()) != pil_img.size:
+                self.last_preview_img = ImageTk.PhotoImage(pil_img)
+                if self._preview_image_item is None or canvas.type(self._preview_image_item) != "image":
+                    self._preview_image_item = canvas.create_image(cw/2, ch/2, image=self.last_preview_img, anchor="center")
+                else: canvas.itemconfigure(self._preview_image_item, image=self.last_preview_img)
+            else: photo.paste(pil_img)
+            canvas.coords(self._preview_image_item, cw/2, ch/2)
+            self._update_crop_overlay(pil_img.width, pil_img.height, cw, ch)
             self.update_idletasks()
         except: pass
 
+    def _update_crop_overlay(self, iw, ih, cw, ch):
+        """크롭 가이드(점선 사각형 + 코너 핸들 8개)를 재사용 항목의 좌표 갱신으로 그립니다."""
+        canvas = self.preview_canvas
+        if not self._crop_overlay_items or canvas.type(self._crop_overlay_items[0]) != "rectangle":
+            # 가이드 라인
+            items = [canvas.create_rectangle(0, 0, 0, 0, outline="#ff7700", width=2, dash=(4,4), state="hidden")]
+            # 코너 핸들 강조
+            items += [canvas.create_line(0, 0, 0, 0, fill="#ff7700", width=4, state="hidden") for _ in range(8)]
+            self._crop_overlay_items = items
+        if not (self.crop_enabled_var.get() and self.crop_coords):
+            for item in self._crop_overlay_items: canvas.itemconfigure(item, state="hidden")
+            return
+        ox, oy = (cw - iw) / 2, (ch - ih) / 2; x1, y1, x2, y2 = self.crop_coords; px1, px2, py1, py2 = ox + min(x1, x2)*iw, ox + max(x1, x2)*iw, oy + min(y1, y2)*ih, oy + max(y1, y2)*ih
+        cl = 10
+        coords = [(px1, py1, px2, py2),
+                  (px1, py1, px1 + cl, py1), (px1, py1, px1, py1 + cl),  # 좌상
+                  (px2, py1, px2 - cl, py1), (px2, py1, px2, py1 + cl),  # 우상
+                  (px1, py2, px1 + cl, py2), (px1, py2, px1, py2 - cl),  # 좌하
+                  (px2, py2, px2 - cl, py2), (px2, py2, px2, py2 - cl)]  # 우하
+        for item, c in zip(self._crop_overlay_items, coords):
+            canvas.coords(item, *c); canvas.itemconfigure(item, state="normal")
+
     def toggle_playback(self):
         if not self.clip: return
-        if self.is_playing: self.is_playing = False; self.btn_play.configure(text="▶ 재생")
-        else: self.is_playing = True; self.btn_play.configure(text="■ 정지"); threading.Thread(target=self._playback_loop, daemon=True).start()
-
-    def _playback_loop(self):
-        last_time, st, et, ct = time.time(), self.timeline.in_point * self.duration, self.timeline.out_point * self.duration, self.timeline.play_head * self.duration
-        while self.is_playing:
-            loop_start = time.time(); dt = loop_start - last_time; last_time = loop_start; ct += dt
-            if ct >= et or ct < st: ct = st
-            if self.render_lock.acquire(blocking=False):
-                try:
-                    local_clip, safe_t = self.clip, max(0, min(ct, self.duration - 0.001)); cache_key = (round(safe_t, 3), False)
-                    if cache_key in self.frame_cache and not self.color_correction_var.get(): img = self.frame_cache[cache_key]
-                    else:
-                        try:
-                            with self.clip_access_lock: frame = local_clip.get_frame(safe_t); img = Image.fromarray(frame.astype('uint8')) 
-                            self.preview_canvas.update_idletasks(); cw, ch = self.preview_canvas.winfo_width(), self.preview_canvas.winfo_height()
-                            if cw < 10: img = self.last_preview_img_data
-                            else: img.thumbnail((max(cw,50), max(ch,50)), RESAMPLING_BILINEAR); self.frame_cache[cache_key] = img
-                        except: img = self.last_preview_img_data
-                    if img:
-                        self.last_preview_img_data, self.last_preview_time = img, safe_t
-                        settings = {"color_correction": self.color_correction_var.get(), "exposure": self.exposure_var.get(), "gamma": self.gamma_var.get(), "contrast": self.contrast_var.get(), "saturation": self.saturation_var.get(), "tint": self.tint_var.get(), "temperature": self.temperature_var.get()}
-                        c_img = video_engine.apply_color_correction_pil(img, settings); self.after(0, lambda ci=c_img, t=safe_t: self._sync_pb_v3(ci, t))
-                finally: self.render_lock.release()
-            time.sleep(max(0.001, (1/self.fps) - (time.time() - loop_start)))
-
-    def _sync_pb_v3(self, corrected_img, t):
+        if self.is_playing:
+            self.is_playing = False; self.btn_play.configure(text="▶ 재생")
+            if self.playback_engine: self.playback_engine.stop(); self.playback_engine = None
+            self.label_playback_info.configure(text=self.label_playback_info.cget("text").split(" | ▶")[0])
+        else:
+            cw, ch = self.preview_canvas.winfo_width(), self.preview_canvas.winfo_height()
+            if cw < 10 or ch < 10: return
+            self.is_playing = True; self.btn_play.configure(text="■ 정지")
+            fps, clip, size = self.fps or const.DEFAULT_FPS, self.clip, (cw, ch)
+            st = video_engine.frame_index(self.timeline.in_point * self.duration, fps)
+            et = max(st + 1, video_engine.frame_index(self.timeline.out_point * self.duration, fps))
+            self._playback_present_pending = False
+            self.playback_engine = video_engine.PlaybackEngine(
+                prepare=lambda idx: (self._get_preview_frame(clip, idx / fps, size), self._get_color_settings()),
+                finish=lambda idx, job: (job[0], video_engine.apply_color_correction_pil(job[0], job[1])),
+                present=lambda idx, result: self._queue_playback_frame(result, idx / fps),
+                fps=fps, start_index=st, end_index=et,
+                first_index=video_engine.frame_index(self.timeline.play_head * self.duration, fps),
+                on_stats=lambda achieved, target, dropped: self.after(0, self._show_playback_stats, achieved, target, dropped))
+            self.playback_engine.start()
+
+    def _get_color_settings(self):
+        return {"color_correction": self.color_correction_var.get(), "exposure": self.exposure_var.get(), "gamma": self.gamma_var.get(), "contrast": self.contrast_var.get(), "saturation": self.saturation_var.get(), "tint": self.tint_var.get(), "temperature": self.temperature_var.get()}
+
+    def _queue_playback_frame(self, result, t):
+        """재생 엔진 소비자 스레드에서 호출. UI 스레드가 이전 프레임을 아직 그리지 못했으면 드롭합니다."""
+        if self._playback_present_pending: return False
+        self._playback_present_pending = True
+        self.after(0, self._sync_pb_v3, result, t)
+        return True
+
+    def _sync_pb_v3(self, result, t):
+        self._playback_present_pending = False
         if not self.is_playing: return
+        base_img, corrected_img = result
+        self.last_preview_img_data, self.last_preview_time = base_img, t
         self.timeline.play_head = max(0, min(1, t / self.duration)); self.timeline.draw(); self._render_to_canvas(corrected_img)
 
+    def _show_playback_stats(self, achieved, target, dropped):
+        if not self.is_playing: return
+        info = self.label_playback_info.cget("text").split(" | ▶")[0]
+        self.label_playback_info.configure(text=f"{info} | ▶ {achieved:.1f}/{target:g}fps (드롭 {dropped})")
+
     def _on_fps_slider_move(self, val):
         self.fps_input_var.set(str(int(val))); self.fps = int(val)
         if self.clip and not self.is_playing: 
@@ -199,7 +241,46 @@ class PlayerMixin:
         except: pass
 
     # Crop 관련 기능
-    def reset_crop(self): self.crop_coords = [0.0, 0.0, 1.0, 1.0]; self.update_preview_frame(self.last_preview_time)
+    def _preview_frame_is_current(self):
+        """화면의 프레임(last_preview_img_data)이 재생 헤드와 같은 프레임인지 여부. 재생 중에는 엔진이 프레임을 갱신합니다."""
+        if self.is_playing: return True
+        fps = self.fps or const.DEFAULT_FPS
+        return video_engine.frame_index(self.timeline.play_head * self.duration, fps) == video_engine.frame_index(self.last_preview_time, fps)
+
+    # 색보정 프리뷰
+    def schedule_color_preview(self):
+        """색보정 값 변경 이벤트를 화면 갱신 주기로 합쳐, 대기 중인 갱신이 없을 때만 예약합니다."""
+        if self._color_preview_timer or not self.clip: return
+        self._color_preview_timer = self.after(const.COLOR_PREVIEW_INTERVAL_MS, self._apply_color_preview)
+
+    def _apply_color_preview(self):
+        """
+        보관 중인 프리뷰 크기의 원본 프레임(last_preview_img_data)에 현재 색보정 LUT만 다시 적용합니다.
+        재생 헤드가 다른 프레임으로 옮겨졌을 때만 디코딩하며, 재생 중에는 엔진이 다음 프레임부터 새 값을 씁니다.
+        """
+        self._color_preview_timer = None
+        if not self.clip or self.is_playing: return
+        base = self.last_preview_img_data
+        if base is None or not self._preview_frame_is_current():
+            self.update_preview_frame(self.timeline.play_head * self.duration); return
+        if not self.render_lock.acquire(blocking=False):
+            self.schedule_color_preview(); return  # 다른 렌더가 진행 중이면 다음 주기에 마지막 값으로 다시 시도
+        try: self._render_to_canvas(video_engine.apply_color_correction_pil(base, self._get_color_settings()))
+        finally: self.render_lock.release()
+
+    def reset_crop(self): self.crop_coords = [0.0, 0.0, 1.0, 1.0]; self.refresh_crop_overlay()
+
+    def refresh_crop_overlay(self):
+        """
+        크롭 좌표만 바뀌었을 때 호출. 이미 그려진 프레임은 그대로 두고 가이드 항목만 옮기며,
+        재생 헤드가 화면의 프레임과 다른 프레임으로 옮겨진 경우에만 다시 디코딩합니다.
+        """
+        if not self.clip: return
+        photo = self.last_preview_img
+        if photo is None or not self._preview_frame_is_current():
+            self.update_preview_frame(self.timeline.play_head * self.duration); return
+        canvas = self.preview_canvas
+        self._update_crop_overlay(photo.width(), photo.height(), max(canvas.winfo_width(), 10), max(canvas.winfo_height(), 10))
     
     def start_crop_drag(self, event):
         if not self.last_preview_img or not self.crop_enabled_var.get(): return
@@ -230,7 +311,7 @@ class PlayerMixin:
                 if self.active_crop_handle in ['nw', 'ne', 'sw', 'se', 'new']:
                     if 'n' in self.active_crop_handle or self.active_crop_handle == 'new': (nc.__setitem__(3, nc[1] + td) if self.active_crop_handle == 'sw' else nc.__setitem__(1, nc[3] - td))
                     else: nc[3] = nc[1] + td
-        self.crop_coords = nc; self.update_preview_frame(self.last_preview_time)
+        self.crop_coords = nc; self.refresh_crop_overlay()
 
     def end_crop_drag(self, event):
         x1, y1, x2, y2 = self.crop_coords; nx1, ny1, nx2, ny2 = min(x1, x2), min(y1, y2), max(x1, x2), max(y1, y2)
@@ -1,14 +1,18 @@
 import sys
 import os
-from app_main import VideoToGifApp
+import multiprocessing
 
 def main():
+    # 패키징(PyInstaller) 환경에서 분석용 프로세스 풀 자식 프로세스 지원
+    multiprocessing.freeze_support()
+
     # macOS 포크 안전성 설정
     if sys.platform == "darwin":
         os.environ["OBJC_DISABLE_INITIALIZE_FORK_SAFETY"] = "YES"
         os.environ["OS_ACTIVITY_MODE"] = "disable"
 
-    # 애플리케이션 실행
+    # 애플리케이션 실행 (작업 프로세스가 이 모듈을 다시 불러올 때 UI 모듈을 로드하지 않도록 여기서 import)
+    from app_main import VideoToGifApp
     app = VideoToGifApp()
     app.mainloop()
 
@@ -0,0 +1,270 @@
+import os
+import sys
+import json
+import hashlib
+import tempfile
+import threading
+import multiprocessing
+from contextlib import contextmanager
+from PIL import Image
+import constants as const
+
+# -------------------------------------------------------------------------
+# 사용자 캐시 폴더
+# -------------------------------------------------------------------------
+def get_cache_dir():
+    """OS별 사용자 캐시 폴더 경로 (Windows: LOCALAPPDATA, macOS: ~/Library/Caches, 기타: XDG)"""
+    if sys.platform == "win32":
+        base = os.environ.get("LOCALAPPDATA") or os.path.join(os.path.expanduser("~"), "AppData", "Local")
+    elif sys.platform == "darwin":
+        base = os.path.join(os.path.expanduser("~"), "Library", "Caches")
+    else:
+        base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, const.APP_CACHE_NAME)
+
+def make_file_key(path):
+    """(절대경로, 크기, 수정시각) 캐시 키. 파일이 없으면 None"""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return f"{os.path.abspath(path)}|{st.st_size}|{st.st_mtime_ns}"
+
+@contextmanager
+def _file_lock(lock_path):
+    """
+    프로세스 간 배타 잠금 (POSIX: flock, Windows: msvcrt.locking).
+    앱, 명령줄 실행기, 분석/작업 프로세스가 같은 캐시 파일을 함께 쓰기 때문에 필요합니다.
+    """
+    os.makedirs(os.path.dirname(lock_path), exist_ok=True)
+    with open(lock_path, 'a+b') as f:
+        if sys.platform == "win32":
+            import msvcrt
+            f.seek(0)
+            while True:
+                try:
+                    msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    continue  # LK_LOCK은 10초 뒤 포기하므로 다시 시도
+            try:
+                yield
+            finally:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+        else:
+            import fcntl
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+# -------------------------------------------------------------------------
+# 메타데이터 영구 캐시 (JSON-lines)
+# -------------------------------------------------------------------------
+class MetadataCache:
+    """
+    파일 키 -> 메타데이터(dict)를 JSON-lines 파일에 추가 기록하는 영구 캐시.
+    파일이 수정되면 키가 바뀌므로 자동으로 무효화되며, 오래된 줄은 로드 시 압축됩니다.
+    여러 프로세스가 같은 파일을 쓰므로 읽기/추가/압축은 잠금 파일로 직렬화하며,
+    압축(파일 교체)은 앱/명령줄 실행기 같은 최상위 프로세스에서만 합니다. (분석/작업 프로세스는 추가만)
+    """
+    def __init__(self, path, max_entries=const.METADATA_CACHE_MAX_ENTRIES):
+        self.path = path
+        self.max_entries = max_entries
+        self._entries = None
+        self._key_by_path = {}
+        self._lines = 0
+        self._lock = threading.Lock()
+
+    def _read_records(self):
+        """파일의 유효한 (키, 메타데이터) 기록 목록. 파일 잠금 안에서 호출합니다."""
+        records = []
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        rec = json.loads(line)
+                        records.append((rec['key'], rec['meta']))
+                    except (ValueError, KeyError, TypeError):
+                        continue  # 기록 도중 잘린 줄 등은 무시
+        except OSError:
+            pass
+        return records
+
+    def _load_locked(self):
+        if self._entries is not None: return
+        self._entries = {}
+        try:
+            with _file_lock(self.path + ".lock"):
+                records = self._read_records()
+        except OSError:
+            records = []
+        for key, meta in records:
+            self._set_locked(key, meta)
+        self._lines = len(records)
+        # 갱신/무효화로 죽은 줄이 많거나 상한을 넘으면 다시 작성
+        if self._lines > 2 * len(self._entries) + 100 or len(self._entries) > self.max_entries:
+            self._compact_locked()
+
+    def _set_locked(self, key, meta):
+        # 같은 파일의 이전 버전(크기/수정시각이 다른 키)은 제거
+        file_path = key.rsplit('|', 2)[0]
+        old_key = self._key_by_path.get(file_path)
+        if old_key is not None and old_key != key:
+            self._entries.pop(old_key, None)
+        self._entries.pop(key, None)
+        self._entries[key] = meta
+        self._key_by_path[file_path] = key
+
+    def _compact_locked(self):
+        if multiprocessing.parent_process() is not None:
+            return  # 분석/작업 프로세스는 파일을 교체하지 않음
+        tmp_path = None
+        try:
+            with _file_lock(self.path + ".lock"):
+                # 로드 이후 다른 프로세스가 추가한 기록까지 포함하도록 잠금 안에서 다시 읽음
+                self._entries, self._key_by_path = {}, {}
+                for key, meta in self._read_records():
+                    self._set_locked(key, meta)
+                keep = list(self._entries.items())[-self.max_entries:]
+                self._entries, self._key_by_path = {}, {}
+                for key, meta in keep:
+                    self._set_locked(key, meta)
+                fd, tmp_path = tempfile.mkstemp(prefix=os.path.basename(self.path) + ".", suffix=".tmp",
+                                                dir=os.path.dirname(self.path))
+                with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                    for key, meta in self._entries.items():
+                        f.write(json.dumps({'key': key, 'meta': meta}, ensure_ascii=False) + "\n")
+                os.replace(tmp_path, self.path)
+                tmp_path = None
+                self._lines = len(self._entries)
+        except OSError:
+            pass
+        finally:
+            if tmp_path:
+                try: os.remove(tmp_path)
+                except OSError: pass
+
+    def get(self, path):
+        key = make_file_key(path)
+        if key is None: return None
+        with self._lock:
+            self._load_locked()
+            meta = self._entries.get(key)
+        return dict(meta) if meta is not None else None
+
+    def put(self, path, meta):
+        key = make_file_key(path)
+        if key is None or not meta: return
+        meta = dict(meta)
+        with self._lock:
+            self._load_locked()
+            if self._entries.get(key) == meta: return
+            self._set_locked(key, meta)
+            try:
+                with _file_lock(self.path + ".lock"):
+                    with open(self.path, 'a', encoding='utf-8') as f:
+                        f.write(json.dumps({'key': key, 'meta': meta}, ensure_ascii=False) + "\n")
+                self._lines += 1
+            except OSError:
+                pass
+
+# -------------------------------------------------------------------------
+# 썸네일 영구 캐시 (대기열 썸네일 / 타임라인 필름스트립)
+# -------------------------------------------------------------------------
+class ThumbnailCache:
+    """
+    캐시 키(파일 키 + 용도/크기)별 썸네일을 JPEG로 저장하는 용량 제한 디스크 캐시.
+    적중 시 수정시각을 갱신하고, 용량을 넘으면 가장 오래 쓰이지 않은 파일부터 삭제합니다(LRU).
+    필름스트립은 프레임들을 가로로 이어 붙인 한 장의 이미지로 저장합니다.
+    """
+    def __init__(self, root, max_bytes=const.THUMBNAIL_CACHE_MAX_BYTES):
+        self.root = root
+        self.max_bytes = max_bytes
+        self._total_bytes = None
+        self._lock = threading.Lock()
+
+    def _entry_path(self, key):
+        digest = hashlib.sha1(key.encode('utf-8')).hexdigest()
+        return os.path.join(self.root, digest[:2], digest + ".jpg")
+
+    def _scan_locked(self):
+        entries = []
+        for dirpath, _, filenames in os.walk(self.root):
+            for name in filenames:
+                full = os.path.join(dirpath, name)
+                try:
+                    st = os.stat(full)
+                except OSError:
+                    continue
+                entries.append((st.st_mtime, st.st_size, full))
+        return entries
+
+    def _evict_locked(self):
+        if self._total_bytes is None:
+            self._total_bytes = sum(size for _, size, _ in self._scan_locked())
+        if self._total_bytes <= self.max_bytes:
+            return
+        # 상한의 80%까지 오래된 항목부터 삭제
+        entries = sorted(self._scan_locked())
+        total = sum(size for _, size, _ in entries)
+        for _, size, full in entries:
+            if total <= self.max_bytes * 0.8: break
+            try:
+                os.remove(full)
+                total -= size
+            except OSError:
+                pass
+        self._total_bytes = total
+
+    def get(self, key):
+        path = self._entry_path(key)
+        try:
+            with Image.open(path) as img:
+                img.load()
+                result = img.copy()
+            os.utime(path)
+            return result
+        except Exception:
+            return None
+
+    def put(self, key, img):
+        if img is None: return
+        path = self._entry_path(key)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.{threading.get_ident()}.tmp"
+            img.convert("RGB").save(tmp_path, format="JPEG", quality=90)
+            try:
+                old_size = os.path.getsize(path)  # 덮어쓰는 경우 기존 크기는 빼야 함
+            except OSError:
+                old_size = 0
+            os.replace(tmp_path, path)
+            size = os.path.getsize(path)
+        except Exception:
+            return
+        with self._lock:
+            if self._total_bytes is not None:
+                self._total_bytes += size - old_size
+            self._evict_locked()
+
+    def get_strip(self, key, count):
+        """저장된 필름스트립을 count장의 프레임 리스트로 분할해 반환합니다."""
+        strip = self.get(key)
+        if strip is None or count <= 0 or strip.width % count:
+            return None
+        w = strip.width // count
+        return [strip.crop((i * w, 0, (i + 1) * w, strip.height)) for i in range(count)]
+
+    def put_strip(self, key, frames, frame_size=const.FILMSTRIP_FRAME_SIZE):
+        if not frames: return
+        w, h = frame_size
+        strip = Image.new("RGB", (w * len(frames), h))
+        for i, frame in enumerate(frames):
+            strip.paste(frame.convert("RGB").resize((w, h)), (i * w, 0))
+        self.put(key, strip)
+
+metadata_cache = MetadataCache(os.path.join(get_cache_dir(), "media_metadata.jsonl"))
+thumbnail_cache = ThumbnailCache(os.path.join(get_cache_dir(), "thumbnails"))
@@ -0,0 +1,22 @@
+import os
+import sys
+
+# 저장소 루트의 모듈(video_engine 등)을 바로 import
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import subprocess
+import pytest
+
+
+@pytest.fixture
+def make_clip(tmp_path):
+    """FFMPEG lavfi testsrc로 작은 테스트 영상을 만들어 경로를 돌려줍니다."""
+    import video_engine
+
+    def make(name="clip.mp4", seconds=1, size="96x64", rate=10):
+        path = tmp_path / "src" / name
+        path.parent.mkdir(exist_ok=True)
+        subprocess.run([video_engine.get_ffmpeg_exe(), '-y', '-v', 'error', '-f', 'lavfi', '-i', f"testsrc=size={size}:rate={rate}",
+                        '-t', str(seconds), '-pix_fmt', 'yuv420p', str(path)], check=True)
+        return str(path)
+    return make
@@ -0,0 +1,52 @@
+import pytest
+from PIL import Image
+import media_cache
+import video_engine
+
+
+@pytest.fixture
+def items(tmp_path, monkeypatch):
+    # 빈 캐시로 시작해야 GIF가 프로세스 풀 대상이 됨
+    monkeypatch.setattr(video_engine, 'metadata_cache', media_cache.MetadataCache(str(tmp_path / "meta.jsonl")))
+    monkeypatch.setattr(video_engine, 'thumbnail_cache', media_cache.ThumbnailCache(str(tmp_path / "thumbs")))
+    result = []
+    for i in range(5):
+        path = str(tmp_path / f"anim_{i}.gif")
+        frames = [Image.new('RGB', (32 + i, 24), (j * 40, i * 30, 0)) for j in range(3)]
+        frames[0].save(path, save_all=True, append_images=frames[1:], duration=100)
+        result.append({'path': path})
+    seq = []
+    for j in range(3):
+        seq.append(str(tmp_path / f"seq_{j:04d}.png"))
+        Image.new('RGB', (64, 36), (0, j * 50, 0)).save(seq[-1])
+    result.append({'path': "Image Sequence", 'sequence_paths': seq, 'fps': 10})
+    result.append({'path': str(tmp_path / "missing.mp4")})
+    return result
+
+
+def _collect(items):
+    got = {}
+    for idx, item in video_engine.iter_analyze_items(items):
+        assert idx not in got
+        got[idx] = item
+    return got
+
+
+def _check(items, got):
+    assert sorted(got) == list(range(len(items)))
+    for i in range(5):
+        assert got[i]['status'] == "대기"
+        assert (got[i]['width'], got[i]['height']) == (32 + i, 24)
+    assert (got[5]['width'], got[5]['height'], got[5]['end']) == (64, 36, 0.3)
+    assert got[6]['status'] == "분석 실패"
+
+
+def test_every_item_is_yielded_once(items):
+    assert sum(video_engine._needs_process_pool(item) for item in items) == 5
+    _check(items, _collect(items))
+
+
+def test_falls_back_to_threads_without_process_pool(items, monkeypatch):
+    def broken_pool(*args, **kwargs): raise OSError("no process pool")
+    monkeypatch.setattr(video_engine, 'ProcessPoolExecutor', broken_pool)
+    _check(items, _collect(items))
@@ -0,0 +1,54 @@
+import json
+import os
+import signal
+import pytest
+import batch_cli
+import video_engine
+
+
+@pytest.fixture
+def clip_dir(make_clip):
+    return os.path.dirname(make_clip())
+
+
+@pytest.fixture(autouse=True)
+def keep_signal_handlers():
+    # main()이 SIGINT/SIGTERM 처리기를 바꾸므로 테스트 후 복원
+    saved = {sig: signal.getsignal(sig) for sig in (signal.SIGINT, signal.SIGTERM)}
+    yield
+    for sig, handler in saved.items(): signal.signal(sig, handler)
+
+
+def _events(capsys):
+    return [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+
+
+def test_folder_batch_converts_clip(tmp_path, clip_dir, capsys):
+    out = tmp_path / "out"
+    code = batch_cli.main([str(clip_dir), "-o", str(out), "--format", "GIF", "--width", "48", "--fps", "5", "--cpu-threads", "2"])
+    events = _events(capsys)
+    assert code == 0, events
+    names = [e['event'] for e in events]
+    assert names[0] == "batch" and names[-1] == "summary"
+    assert names.count("start") == names.count("done") == 1
+    assert events[-1]['succeeded'] == 1 and events[-1]['failed'] == 0
+
+    done = next(e for e in events if e['event'] == "done")
+    with video_engine.Image.open(done['output']) as im:
+        assert im.format == "GIF" and im.width == 48 and im.n_frames == 5
+
+
+def test_queue_json_reports_missing_source(tmp_path, capsys):
+    queue = tmp_path / "queue.json"
+    queue.write_text(json.dumps([{"path": "missing.mp4", "filename": "missing.mp4", "export_format": "MP4",
+                                  "start": 0, "end": -1, "fps": 10, "width": 64}]), encoding='utf-8')
+    code = batch_cli.main([str(queue), "-o", str(tmp_path / "out")])
+    events = _events(capsys)
+    assert code == 1
+    assert [e['event'] for e in events].count("failed") == 1
+    assert events[-1]['failed'] == 1
+
+
+def test_format_choices_follow_constants(tmp_path):
+    with pytest.raises(SystemExit):
+        batch_cli.main([str(tmp_path), "-o", str(tmp_path / "out"), "--format", "AVI"])
@@ -0,0 +1,90 @@
+import threading
+import pytest
+import batch_scheduler
+
+
+def _job(fmt="MP4", width=1280):
+    # 경로가 없으면 원본 크기를 출력 폭 기준 16:9로 가정
+    return {'export_format': fmt, 'width': width, 'fps': 24, 'start': 0, 'end': 5}
+
+
+def test_budget_acquire_release():
+    budget = batch_scheduler.BatchResourceBudget(cpu_threads=4, memory_bytes=1000, max_jobs=2)
+    assert budget.acquire(3, 400)
+    assert (budget.used_threads, budget.used_memory, budget.running) == (3, 400, 1)
+    # 스레드 예산을 넘는 두 번째 작업은 기다리다 취소되면 예약 없이 False
+    assert not budget.acquire(2, 100, is_cancelled=lambda: True)
+    assert budget.acquire(1, 600, timeout=0.01)
+    budget.release(3, 400)
+    budget.release(1, 600)
+    assert (budget.used_threads, budget.used_memory, budget.running) == (0, 0, 0)
+
+
+def test_budget_overcommit_runs_alone():
+    budget = batch_scheduler.BatchResourceBudget(cpu_threads=2, memory_bytes=100, max_jobs=4)
+    # 예산보다 큰 작업도 단독이면 시작하며, 스레드 수는 전체 예산으로 잘림
+    assert budget.acquire(16, 10 ** 9)
+    assert budget.used_threads == 2
+    assert not budget.acquire(1, 1, is_cancelled=lambda: True)
+    budget.release(16, 10 ** 9)
+    assert budget.running == 0 and budget.used_threads == 0
+
+
+def test_budget_max_jobs():
+    budget = batch_scheduler.BatchResourceBudget(cpu_threads=8, memory_bytes=10 ** 9, max_jobs=1)
+    assert budget.acquire(1, 1)
+    assert not budget.acquire(1, 1, is_cancelled=lambda: True)
+    budget.release(1, 1)
+
+
+@pytest.mark.parametrize("fmt", ["MP4", "WebM", "GIF"])
+@pytest.mark.parametrize("threads", [1, 2, 3, 5, 8, 64])
+def test_split_job_threads_within_assignment(fmt, threads):
+    decode, encode = batch_scheduler.split_job_threads(_job(fmt), threads)
+    assert decode >= 1 and encode >= 1
+    assert decode + encode <= max(2, threads)
+
+
+def test_direct_formats_follow_convert_engine():
+    import convert_engine
+    for fmt in convert_engine.DIRECT_EXPORTS:
+        threads, _ = batch_scheduler.estimate_job_resources(_job(fmt))
+        assert threads == sum(batch_scheduler.split_job_threads(_job(fmt), 64))
+    assert batch_scheduler.estimate_job_resources(_job("WebP"))[0] == 2
+
+
+def test_run_batch_scheduled_isolates_failures():
+    budget = batch_scheduler.BatchResourceBudget(cpu_threads=4, memory_bytes=10 ** 10, max_jobs=2)
+    # 두 번째 작업은 자원 추정에서, 세 번째 작업은 실행 중에 실패
+    bad = dict(_job("GIF"), gif_two_pass=False, fps="not-a-number")
+    jobs = [_job(), bad, _job("GIF")]
+    ran, failed, lock = [], [], threading.Lock()
+
+    def run_job(index, job, threads, memory):
+        if index == 2: raise RuntimeError("boom")
+        with lock: ran.append(index)
+
+    started = batch_scheduler.run_batch_scheduled(jobs, run_job, budget,
+                                                  on_error=lambda i, job, e: failed.append(i))
+    assert ran == [0]
+    assert sorted(failed) == [1, 2]
+    assert started == 2
+    assert budget.running == 0 and budget.used_threads == 0
+
+
+def test_run_batch_scheduled_waits_when_source_raises():
+    budget = batch_scheduler.BatchResourceBudget(cpu_threads=4, memory_bytes=10 ** 10, max_jobs=2)
+    release, done = threading.Event(), []
+
+    def source():
+        yield _job()
+        release.set()
+        raise OSError("queue source failed")
+
+    def run_job(index, job, threads, memory):
+        release.wait(5)
+        done.append(index)
+
+    with pytest.raises(OSError):
+        batch_scheduler.run_batch_scheduled(source(), run_job, budget)
+    assert done == [0] and budget.running == 0
@@ -0,0 +1,51 @@
+import threading
+import pytest
+import batch_worker
+import convert_engine
+
+
+class _Control:
+    cancel_requested = False
+    batch_paused = False
+
+
+class _Progress:
+    def __init__(self): self.updates = []
+    def bars_update(self, bar, index, total=None): self.updates.append((index, total))
+
+
+def _job(path, **preset):
+    return convert_engine.make_job(path, dict({'export_format': "MP4", 'width': 64, 'fps': 10}, **preset))
+
+
+def test_converts_in_child_process(tmp_path, make_clip):
+    out = tmp_path / "out.mp4"
+    progress = _Progress()
+    batch_worker.run_job_isolated(_job(make_clip()), str(out), _Control(), progress, threads=2)
+    assert out.stat().st_size > 0
+    assert progress.updates
+
+
+def test_child_error_is_raised(tmp_path):
+    with pytest.raises(RuntimeError) as info:
+        batch_worker.run_job_isolated(_job(str(tmp_path / "missing.mp4")), str(tmp_path / "out.mp4"), _Control())
+    assert str(info.value) != "CANCEL_REQUESTED"
+
+
+def test_cancel_kills_child(tmp_path, make_clip):
+    control = _Control()
+    path = make_clip("long.mp4", seconds=20, size="320x240", rate=25)
+    timer = threading.Timer(1.0, lambda: setattr(control, 'cancel_requested', True))
+    timer.start()
+    try:
+        with pytest.raises(RuntimeError, match="CANCEL_REQUESTED"):
+            batch_worker.run_job_isolated(_job(path, export_format="WebM", width=320), str(tmp_path / "out.webm"), control)
+    finally:
+        timer.cancel()
+
+
+def test_memory_limit_fails_only_this_job(tmp_path, make_clip):
+    path = make_clip("long.mp4", seconds=20, size="320x240", rate=25)
+    with pytest.raises(RuntimeError, match="메모리 한도 초과"):
+        batch_worker.run_job_isolated(_job(path, export_format="WebM", width=320), str(tmp_path / "out.webm"),
+                                      _Control(), memory_limit=1)
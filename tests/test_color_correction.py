@@ -0,0 +1,13 @@
+import numpy as np
+from PIL import Image
+import video_engine
+
+
+def test_zero_saturation_is_greyscale():
+    # 채도 0은 "값 없음"이 아니라 완전 탈색
+    src = np.random.default_rng(0).integers(0, 256, (8, 8, 3), dtype='uint8')
+    settings = {'color_correction': True, 'saturation': 0.0}
+    for out in (np.asarray(video_engine.apply_color_correction_pil(Image.fromarray(src), settings)),
+                video_engine.apply_color_correction_array(src, settings)):
+        out = out.astype(int)
+        assert (out[..., 0] == out[..., 1]).all() and (out[..., 1] == out[..., 2]).all()
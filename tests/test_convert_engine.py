@@ -0,0 +1,50 @@
+import os
+import pytest
+from PIL import Image
+import convert_engine
+
+
+def test_jobspec_validation():
+    with pytest.raises(ValueError):
+        convert_engine.JobSpec(path="a.mp4", export_format="AVI")
+    with pytest.raises(ValueError):
+        convert_engine.JobSpec()
+    with pytest.raises(ValueError):
+        convert_engine.JobSpec(is_sequence=True)
+
+    spec = convert_engine.JobSpec(path=os.path.join("clips", "a.mp4"))
+    assert spec.filename == "a.mp4"
+    seq = convert_engine.JobSpec(is_sequence=True, sequence_paths=["shot_0001.png", "shot_0002.png"], path="ignored")
+    assert seq.path == "Image Sequence" and seq.filename
+
+
+def test_jobspec_from_dict_ignores_ui_keys():
+    job = convert_engine.make_job("a.mp4", {'export_format': "MP4", 'width': 320})
+    job.update(status="완료", thumb_img=object(), end=None)
+    spec = convert_engine.JobSpec.from_dict(job)
+    assert (spec.export_format, spec.width, spec.end) == ("MP4", 320, -1)
+    assert 'status' not in spec.to_dict()
+
+
+def test_convert_writes_next_to_output_dir(tmp_path, make_clip):
+    out_dir = tmp_path / "out"
+    out_dir.mkdir()
+    progress = []
+    spec = convert_engine.JobSpec(path=make_clip(), export_format="GIF", width=48, fps=5, output_path=str(out_dir))
+    out_path = convert_engine.convert(spec, progress.append)
+    assert os.path.dirname(out_path) == str(out_dir) and out_path.endswith("clip.gif")
+    with Image.open(out_path) as im:
+        assert im.width == 48 and im.n_frames == 5
+    assert progress and all(0.0 <= p <= 1.0 for p in progress)
+
+    # 같은 폴더에 다시 변환하면 기존 파일을 덮어쓰지 않음
+    assert convert_engine.convert(spec) != out_path
+
+
+def test_convert_cancelled(tmp_path, make_clip):
+    token = convert_engine.CancelToken()
+    token.cancel()
+    spec = convert_engine.JobSpec(path=make_clip(), export_format="MP4", width=64, output_path=str(tmp_path / "out.mp4"))
+    with pytest.raises(convert_engine.ConversionCancelled) as info:
+        convert_engine.convert(spec, cancel_token=token)
+    assert str(info.value) == "CANCEL_REQUESTED"
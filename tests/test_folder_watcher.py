@@ -0,0 +1,69 @@
+import os
+import types
+import pytest
+import folder_watcher
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(folder_watcher, 'time', types.SimpleNamespace(time=lambda: now[0]))
+    return now
+
+
+def _write(path, data=b"x" * 100, mode='wb'):
+    with open(path, mode) as f: f.write(data)
+    return str(path)
+
+
+def test_existing_files_are_skipped_unless_requested(tmp_path, clock):
+    _write(tmp_path / "old.mp4")
+    watcher = folder_watcher.FolderWatcher(str(tmp_path), settle_seconds=2)
+    clock[0] += 5
+    assert watcher.poll() == []
+
+    watcher = folder_watcher.FolderWatcher(str(tmp_path), settle_seconds=2, include_existing=True)
+    watcher.poll()
+    clock[0] += 5
+    assert watcher.poll() == [str(tmp_path / "old.mp4")]
+
+
+def test_video_is_emitted_once_after_settling(tmp_path, clock):
+    watcher = folder_watcher.FolderWatcher(str(tmp_path), settle_seconds=2)
+    path = _write(tmp_path / "new.mp4")
+    assert watcher.poll() == []
+    clock[0] += 1
+    _write(path, b"more", mode='ab')  # 아직 복사 중: 크기가 바뀌면 대기 시간을 다시 셈
+    assert watcher.poll() == []
+    clock[0] += 1.5
+    assert watcher.poll() == []
+    clock[0] += 1
+    assert watcher.poll() == [path]
+    clock[0] += 5
+    assert watcher.poll() == []
+
+
+def test_empty_and_excluded_files_are_ignored(tmp_path, clock):
+    out_dir = tmp_path / "out"
+    out_dir.mkdir()
+    watcher = folder_watcher.FolderWatcher(str(tmp_path), settle_seconds=1, exclude=[str(out_dir)])
+    _write(tmp_path / "empty.mp4", b"")
+    _write(out_dir / "result.mp4")
+    _write(tmp_path / "notes.txt")
+    watcher.poll()
+    clock[0] += 5
+    assert watcher.poll() == []
+
+
+def test_sequence_waits_for_all_frames(tmp_path, clock):
+    watcher = folder_watcher.FolderWatcher(str(tmp_path), settle_seconds=2)
+    frames = [_write(tmp_path / f"shot_{i:04d}.png") for i in range(1, 4)]
+    watcher.poll()
+    clock[0] += 1.5
+    frames.append(_write(tmp_path / "shot_0004.png"))  # 마지막 프레임이 늦게 도착
+    watcher.poll()
+    clock[0] += 1
+    # 앞 프레임 3장은 완료됐지만 4번째가 아직 쓰는 중이면 시퀀스 전체를 보류
+    assert watcher.poll() == []
+    clock[0] += 1.5
+    assert watcher.poll() == [frames]
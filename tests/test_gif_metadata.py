@@ -0,0 +1,50 @@
+import pytest
+from PIL import Image
+import video_engine
+
+
+def _save_gif(path, count, durations, size=(40, 30), **kwargs):
+    frames = [Image.new('RGB', size, (i * 20 % 256, 255 - i * 10 % 256, i * 7 % 256)) for i in range(count)]
+    frames[0].save(path, save_all=True, append_images=frames[1:], duration=durations, loop=0, **kwargs)
+
+
+def _pillow_frames_and_ms(path):
+    with Image.open(path) as im:
+        total_ms = 0
+        for i in range(im.n_frames):
+            im.seek(i)
+            total_ms += im.info.get('duration', 100)
+        return im.size, im.n_frames, total_ms
+
+
+@pytest.mark.parametrize("count, durations", [(1, 100), (5, 40), (7, [20, 30, 40, 50, 60, 70, 80]), (3, 0)])
+def test_matches_pillow(tmp_path, count, durations):
+    # 지연 시간 0은 Pillow가 GCE를 생략하는 프레임이 생기므로 100ms 기본값 규칙까지 함께 확인
+    path = str(tmp_path / "anim.gif")
+    _save_gif(path, count, durations)
+    meta = video_engine.scan_gif_metadata(path)
+    size, n_frames, total_ms = _pillow_frames_and_ms(path)
+    assert n_frames == count
+    assert (meta['width'], meta['height']) == size
+    assert meta['duration'] == pytest.approx(total_ms / 1000.0)
+    assert meta['fps'] * meta['duration'] == pytest.approx(n_frames)
+
+
+def test_local_palettes(tmp_path):
+    # 프레임마다 팔레트가 다르면 로컬 컬러 테이블이 기록됨
+    path = str(tmp_path / "local.gif")
+    frames = [Image.new('P', (16, 16), 0) for _ in range(4)]
+    for i, f in enumerate(frames):
+        f.putpalette([(i * 60 + c) % 256 for c in range(768)])
+    frames[0].save(path, save_all=True, append_images=frames[1:], duration=50)
+    meta = video_engine.scan_gif_metadata(path)
+    _, n_frames, total_ms = _pillow_frames_and_ms(path)
+    assert meta['fps'] * meta['duration'] == pytest.approx(n_frames)
+    assert meta['duration'] == pytest.approx(total_ms / 1000.0)
+
+
+def test_rejects_non_gif(tmp_path):
+    path = tmp_path / "fake.gif"
+    Image.new('RGB', (8, 8)).save(path, format='PNG')
+    with pytest.raises(ValueError):
+        video_engine.scan_gif_metadata(str(path))
@@ -0,0 +1,79 @@
+import numpy as np
+import pytest
+from PIL import Image, ImageSequence
+import video_engine
+
+
+def _decode(path):
+    with Image.open(path) as im:
+        return [np.asarray(f.convert('RGBA')).astype(int) for f in ImageSequence.Iterator(im)]
+
+
+def test_opaque_round_trip_keeps_pixels(tmp_path):
+    # 세로 방향 디테일이 있는 프레임 (인터레이스 플래그가 빠지면 행 순서가 뒤섞임)
+    rows = (np.arange(48) * 5 % 256).astype('uint8')
+    frames = []
+    for i in range(3):
+        arr = np.zeros((48, 64, 3), 'uint8')
+        arr[..., 0] = rows[:, None]
+        arr[..., 1] = (rows[:, None].astype(int) + i * 40) % 256
+        frames.append(Image.fromarray(arr))
+    out = tmp_path / "opaque.gif"
+    with video_engine.GifStreamWriter(str(out), 100) as writer:
+        for f in frames: writer.write_frame(f)
+
+    decoded = _decode(out)
+    assert len(decoded) == len(frames)
+    for got, src in zip(decoded, frames):
+        # 256색 이하 프레임은 palettegen 반올림 오차 외에는 그대로 유지
+        assert np.abs(got[..., :3] - np.asarray(src).astype(int)).max() <= 2
+
+
+def test_transparent_colour_change_is_not_dropped(tmp_path):
+    # 알파는 같고 색만 바뀌는 프레임도 별도 프레임으로 기록되어야 함
+    frames = []
+    for i in range(10):
+        arr = np.zeros((32, 32, 4), 'uint8')
+        arr[8:24, 8:24] = [i * 25, 0, 0, 255]
+        frames.append(Image.fromarray(arr))
+    out = tmp_path / "transparent.gif"
+    with video_engine.GifStreamWriter(str(out), 100, transparent=True) as writer:
+        for f in frames: writer.write_frame(f)
+
+    decoded = _decode(out)
+    assert len(decoded) == len(frames)
+    for got, src in zip(decoded, frames):
+        src = np.asarray(src).astype(int)
+        assert (got[..., 3] > 0).tolist() == (src[..., 3] > 0).tolist()
+        assert np.abs(got[8:24, 8:24, :3] - src[8:24, 8:24, :3]).max() == 0
+
+
+def test_transparent_moving_object_is_cropped(tmp_path):
+    frames = []
+    for i in range(6):
+        arr = np.zeros((32, 48, 4), 'uint8')
+        arr[8:20, i * 4:i * 4 + 12] = [0, 200, i * 30, 255]
+        frames.append(Image.fromarray(arr))
+    out = tmp_path / "moving.gif"
+    with video_engine.GifStreamWriter(str(out), 40, loop=2, transparent=True) as writer:
+        for f in frames: writer.write_frame(f)
+
+    with Image.open(out) as im:
+        assert im.info.get('loop') == 2
+        extents = []
+        for frame in ImageSequence.Iterator(im):
+            assert frame.info.get('duration') == 40
+            extents.append(frame.dispose_extent)
+    # 투명 배경은 기록하지 않고 보이는 사각형만 기록
+    assert extents[1] == (4, 8, 16, 20)
+    for got, src in zip(_decode(out), frames):
+        assert (got[..., 3] > 0).tolist() == (np.asarray(src)[..., 3] > 0).tolist()
+
+
+def test_abort_removes_partial_file(tmp_path):
+    out = tmp_path / "aborted.gif"
+    with pytest.raises(RuntimeError):
+        with video_engine.GifStreamWriter(str(out), 100) as writer:
+            writer.write_frame(Image.new('RGB', (16, 16)))
+            raise RuntimeError("CANCEL_REQUESTED")
+    assert not out.exists()
@@ -0,0 +1,113 @@
+import json
+import multiprocessing
+import os
+import media_cache
+
+
+def _make_files(root, prefix, count):
+    paths = []
+    for i in range(count):
+        p = os.path.join(root, f"{prefix}_{i}.bin")
+        with open(p, 'wb') as f: f.write(b"x" * (i + 1))
+        paths.append(p)
+    return paths
+
+
+def _writer(cache_path, paths, start):
+    start.wait()
+    cache = media_cache.MetadataCache(cache_path)
+    for i, p in enumerate(paths):
+        cache.put(p, {'frames': i, 'owner': os.getpid()})
+
+
+def test_metadata_round_trip_and_invalidation(tmp_path):
+    cache_path = str(tmp_path / "cache" / "meta.jsonl")
+    (path,) = _make_files(str(tmp_path), "a", 1)
+    media_cache.MetadataCache(cache_path).put(path, {'fps': 30})
+    assert media_cache.MetadataCache(cache_path).get(path) == {'fps': 30}
+
+    with open(path, 'ab') as f: f.write(b"more")  # 크기가 바뀌면 키가 달라짐
+    assert media_cache.MetadataCache(cache_path).get(path) is None
+
+
+def test_metadata_compaction_keeps_latest(tmp_path):
+    cache_path = str(tmp_path / "meta.jsonl")
+    paths = _make_files(str(tmp_path), "a", 30)
+    cache = media_cache.MetadataCache(cache_path, max_entries=10)
+    for rev in range(5):
+        for p in paths: cache.put(p, {'rev': rev})
+
+    reloaded = media_cache.MetadataCache(cache_path, max_entries=10)
+    assert reloaded.get(paths[-1]) == {'rev': 4}
+    assert reloaded.get(paths[0]) is None
+    with open(cache_path, encoding='utf-8') as f:
+        assert len(f.readlines()) == 10
+    assert [n for n in os.listdir(tmp_path) if n.endswith(".tmp")] == []
+
+
+def test_metadata_concurrent_processes(tmp_path):
+    cache_path = str(tmp_path / "meta.jsonl")
+    groups = [_make_files(str(tmp_path), name, 150) for name in ("a", "b")]
+    # 압축 조건을 만족하도록 죽은 줄을 미리 채워 둠
+    with open(cache_path, 'w', encoding='utf-8') as f:
+        for i in range(300):
+            f.write(json.dumps({'key': f"/gone/{i}|1|1", 'meta': {'n': i}}) + "\n")
+
+    ctx = multiprocessing.get_context('spawn')
+    start = ctx.Event()
+    procs = [ctx.Process(target=_writer, args=(cache_path, paths, start)) for paths in groups]
+    for p in procs: p.start()
+    start.set()
+    # 자식이 기록하는 동안 부모(최상위 프로세스)는 반복해서 압축
+    while any(p.is_alive() for p in procs):
+        cache = media_cache.MetadataCache(cache_path, max_entries=1000)
+        with cache._lock:
+            cache._load_locked()
+            cache._compact_locked()
+    for p in procs:
+        p.join()
+        assert p.exitcode == 0
+
+    with open(cache_path, encoding='utf-8') as f:
+        for line in f: json.loads(line)  # 깨진 줄이 없어야 함
+    reloaded = media_cache.MetadataCache(cache_path, max_entries=1000)
+    for paths in groups:
+        for i, p in enumerate(paths):
+            assert reloaded.get(p)['frames'] == i
+
+
+
+def test_thumbnail_cache_put_get_and_overwrite(tmp_path):
+    from PIL import Image
+    cache = media_cache.ThumbnailCache(str(tmp_path / "thumbs"), max_bytes=10 ** 7)
+    (path,) = _make_files(str(tmp_path), "v", 1)
+    key = media_cache.make_file_key(path)
+    cache.put(key, Image.new('RGB', (64, 48), (200, 10, 10)))
+    first_total = cache._total_bytes
+    cache.put(key, Image.new('RGB', (64, 48), (200, 10, 10)))
+    assert cache._total_bytes == first_total  # 덮어쓰기는 크기를 두 번 세지 않음
+
+    got = cache.get(key)
+    assert got.size == (64, 48)
+    assert cache.get("missing|1|1") is None
+
+
+def test_sequence_analysis_uses_cache_without_opening(tmp_path, monkeypatch):
+    from PIL import Image
+    import video_engine
+    monkeypatch.setattr(video_engine, 'metadata_cache', media_cache.MetadataCache(str(tmp_path / "meta.jsonl")))
+    monkeypatch.setattr(video_engine, 'thumbnail_cache', media_cache.ThumbnailCache(str(tmp_path / "thumbs")))
+    first = str(tmp_path / "f_0001.png")
+    Image.new('RGB', (320, 180), (0, 120, 0)).save(first)
+
+    def item(): return {'path': "Image Sequence", 'sequence_paths': [first] * 48, 'fps': 24}
+    assert video_engine.analyze_media_item(item())['width'] == 320
+
+    real_open = Image.open
+    def guarded_open(fp, *args, **kwargs):
+        assert fp != first, "cache hit must not open the source image"
+        return real_open(fp, *args, **kwargs)
+    monkeypatch.setattr(video_engine.Image, 'open', guarded_open)
+    got = video_engine.analyze_media_item(item())
+    assert (got['width'], got['height'], got['status'], got['end']) == (320, 180, "대기", 2.0)
+    assert got['thumb_img'].size == (160, 90)
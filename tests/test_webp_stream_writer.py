@@ -0,0 +1,83 @@
+import numpy as np
+import pytest
+from PIL import Image, ImageSequence
+import video_engine
+
+
+def _frames(count=5, alpha=False):
+    frames = []
+    for i in range(count):
+        arr = np.zeros((40, 48, 4 if alpha else 3), 'uint8')
+        arr[..., 0] = (np.arange(48) * 5)[None, :]
+        arr[..., 1] = (np.arange(40) * 6)[:, None]
+        arr[..., 2] = i * 50
+        if alpha:
+            arr[..., 3] = 255
+            arr[:10, :, 3] = 0
+        frames.append(Image.fromarray(arr))
+    return frames
+
+
+def _write(path, frames, **kwargs):
+    with video_engine.WebPStreamWriter(str(path), 100, **kwargs) as writer:
+        for f in frames: writer.write_frame(f)
+
+
+def test_lossless_round_trip(tmp_path):
+    frames = _frames()
+    out = tmp_path / "out.webp"
+    _write(out, frames, loop=3, lossless=True)
+    with Image.open(out) as im:
+        assert im.n_frames == len(frames)
+        assert im.info.get('loop') == 3
+        for got, src in zip(ImageSequence.Iterator(im), frames):
+            got.load()
+            assert im.info.get('duration') == 100
+            assert np.array_equal(np.asarray(got.convert('RGB')), np.asarray(src))
+
+
+def test_lossless_keeps_alpha(tmp_path):
+    frames = _frames(alpha=True)
+    out = tmp_path / "alpha.webp"
+    _write(out, frames, lossless=True, transparent=True)
+    with Image.open(out) as im:
+        assert im.n_frames == len(frames)
+        for got, src in zip(ImageSequence.Iterator(im), frames):
+            got = np.asarray(got.convert('RGBA')).astype(int)
+            assert got[..., 3].tolist() == np.asarray(src)[..., 3].astype(int).tolist()
+
+
+def test_lossy_keeps_alpha(tmp_path):
+    # 원형 + 반투명 알파: 인코더가 ALPH 청크를 쓰고 먹서가 헤더 알파 플래그를 켬 (헤더를 직접 고치지 않음)
+    yy, xx = np.mgrid[:40, :48]
+    frames = []
+    for i in range(4):
+        arr = np.zeros((40, 48, 4), 'uint8')
+        arr[..., 1] = 100 + i * 40
+        arr[..., 3] = np.where((yy - 20) ** 2 + (xx - 24) ** 2 < 150, 255, 0)
+        arr[:3, :, 3] = 200
+        frames.append(Image.fromarray(arr))
+    out = tmp_path / "alpha.webp"
+    _write(out, frames, quality=90, transparent=True)
+    with Image.open(out) as im:
+        assert im.n_frames == len(frames)
+        for got, src in zip(ImageSequence.Iterator(im), frames):
+            got, src = np.asarray(got.convert('RGBA')).astype(int), np.asarray(src).astype(int)
+            assert (got[..., 3] > 127).tolist() == (src[..., 3] > 127).tolist()
+            opaque = src[..., 3] == 255
+            assert np.abs(got[opaque][:, :3] - src[opaque][:, :3]).mean() < 8
+
+
+def test_missing_encoder_fails_fast(tmp_path, monkeypatch):
+    monkeypatch.setattr(video_engine, 'has_ffmpeg_encoder', lambda exe, name: False)
+    with pytest.raises(RuntimeError, match="libwebp_anim"):
+        video_engine.WebPStreamWriter(str(tmp_path / "out.webp"), 100)
+
+
+def test_abort_removes_partial_file(tmp_path):
+    out = tmp_path / "aborted.webp"
+    with pytest.raises(RuntimeError):
+        with video_engine.WebPStreamWriter(str(out), 100) as writer:
+            writer.write_frame(_frames(1)[0])
+            raise RuntimeError("CANCEL_REQUESTED")
+    assert not out.exists()
@@ -1,5 +1,4 @@
 import sys
-import time
 import tkinter as tk
 import customtkinter as ctk
 from datetime import datetime
@@ -11,19 +10,25 @@ import constants as const
 # 타임라인 슬라이더 UI (Timeline Slider)
 # -------------------------------------------------------------------------
 class TimelineSlider(ctk.CTkCanvas):
+    """
+    캔버스 아이템을 한 번만 만들고 이후에는 좌표/텍스트만 갱신하는 리테인드 모드 타임라인.
+    드래그 중 draw()가 가벼우므로 마우스 이벤트마다 바로 콜백을 보냅니다.
+    """
     def __init__(self, master, width=860, height=100, **kwargs):
         super().__init__(master, width=width, height=height, bg="#222222", highlightthickness=0, **kwargs)
         self.width, self.height, self.padding = width, height, 30 
         self.in_point, self.out_point, self.play_head, self.duration, self.fps = 0.0, 1.0, 0.0, 1.0, 24
-        self.thumbnails, self.dim_layer_images, self.active_handle, self.on_change_callback = [], [], None, None
+        self.thumbnails, self.thumbnail_sources, self.active_handle, self.on_change_callback = [], [], None, None
         
         # 사용자 조작 시작/종료 콜백 (충돌 방지용)
         self.on_press_callback = None
         self.on_release_callback = None
         
-        # 이벤트 스로틀링을 위한 시간 변수
-        self.last_update_time = 0
-        self.update_interval = 0.05  # 50ms (초당 약 20회로 제한)
+        # 리테인드 아이템: 이름 -> 캔버스 아이템 ID, 필름스트립 칸 -> 이미지 아이템 ID
+        self._items = {}
+        self._thumb_items = {}
+        # 트랙 너비별로 미리 렌더링한 어두운 오버레이 (좌/우 영역이 같은 이미지를 공유)
+        self._dim_images = {}
 
         self.bind("<Button-1>", self.on_click); self.bind("<B1-Motion>", self.on_drag); self.bind("<ButtonRelease-1>", self.on_release); self.bind("<Configure>", self.on_resize)
     
@@ -34,62 +39,120 @@ class TimelineSlider(ctk.CTkCanvas):
         self.on_press_callback = on_press
         self.on_release_callback = on_release
 
-    def on_resize(self, event): self.width = event.width; self.draw()
+    def on_resize(self, event):
+        if event.width == self.width and self._items: return
+        self.width = event.width
+        # 칸 너비가 바뀌므로 필름스트립은 새 크기로 다시 만듭니다
+        if self.thumbnail_sources: self.set_thumbnails(self.thumbnail_sources)
+        else: self.draw()
+
+    def _thumbnail_span(self, index, count):
+        track_w = max(1, self.width - (2 * self.padding))
+        x_start = self.padding + (index * track_w / count)
+        w = int(self.padding + ((index + 1) * track_w / count)) - int(x_start) + 1
+        return int(x_start), w
+
+    def _make_thumbnail(self, index):
+        img = self.thumbnail_sources[index]
+        if img is None: return None
+        x, w = self._thumbnail_span(index, len(self.thumbnail_sources))
+        if w <= 0: return None
+        try: return ImageTk.PhotoImage(img.resize((w, 60), RESAMPLING_LANKZOS))
+        except: return None
+
+    def _place_thumbnail(self, index):
+        photo, item = self.thumbnails[index], self._thumb_items.pop(index, None)
+        if photo is None:
+            if item is not None: self.delete(item)
+            return
+        x, _ = self._thumbnail_span(index, len(self.thumbnail_sources))
+        if item is None:
+            item = self.create_image(x, 10, image=photo, anchor="nw", tags=("thumb",))
+            # 필름스트립은 배경 바로 위, 어두운 오버레이/핸들 아래에 둡니다
+            if self._items: self.tag_raise(item, self._items['bg'])
+        else:
+            self.coords(item, x, 10); self.itemconfigure(item, image=photo)
+        self._thumb_items[index] = item
     
     def set_thumbnails(self, thumbnail_images):
-        self.thumbnails = []
-        if not thumbnail_images: self.draw(); return
-        track_w = max(1, self.width - (2 * self.padding))
-        for i, img in enumerate(thumbnail_images):
-            x_start = self.padding + (i * track_w / len(thumbnail_images))
-            w = int(self.padding + ((i + 1) * track_w / len(thumbnail_images))) - int(x_start) + 1
-            if w <= 0: continue
-            try:
-                photo = ImageTk.PhotoImage(img.resize((w, 60), RESAMPLING_LANKZOS))
-                self.thumbnails.append((photo, int(x_start)))
-            except: continue
+        # None 자리는 아직 추출되지 않은 프레임 (필름스트립 점진적 채우기)
+        self.thumbnail_sources = list(thumbnail_images or [])
+        self.thumbnails = [self._make_thumbnail(i) for i in range(len(self.thumbnail_sources))]
+        for index in [i for i in self._thumb_items if i >= len(self.thumbnails)]:
+            self.delete(self._thumb_items.pop(index))
+        if not self._items: self.draw()
+        for i in range(len(self.thumbnails)): self._place_thumbnail(i)
         self.draw()
         
+    def set_thumbnail(self, index, img):
+        """필름스트립의 한 칸만 갱신합니다."""
+        if 0 <= index < len(self.thumbnail_sources):
+            self.thumbnail_sources[index] = img
+            self.thumbnails[index] = self._make_thumbnail(index)
+            self._place_thumbnail(index)
+        
     def get_x_pos(self, ratio): return self.padding + (ratio * max(1, self.width - (2 * self.padding)))
     def get_ratio_from_x(self, x): return max(0.0, min(1.0, (x - self.padding) / max(1, self.width - (2 * self.padding))))
     
-    def draw_dimmed_area(self, x_s, x_e):
-        w = int(x_e) - int(x_s)
-        if w <= 0: return
-        photo = ImageTk.PhotoImage(Image.new('RGBA', (w, 60), (0, 0, 0, 180)))
-        self.dim_layer_images.append(photo); self.create_image(x_s, 10, image=photo, anchor="nw")
+    def _get_dim_image(self):
+        """현재 트랙 너비의 반투명 오버레이. 너비별로 한 번만 렌더링합니다."""
+        track_w = max(1, int(self.width - (2 * self.padding)))
+        photo = self._dim_images.get(track_w)
+        if photo is None:
+            if len(self._dim_images) > 4: self._dim_images.clear()
+            photo = ImageTk.PhotoImage(Image.new('RGBA', (track_w, 60), (0, 0, 0, 180)))
+            self._dim_images[track_w] = photo
+        return photo
+
+    def _create_items(self):
+        """타임라인 아이템을 쌓는 순서대로 한 번 생성합니다."""
+        it, color = self._items, "#2a2a2a"
+        it['bg'] = self.create_rectangle(0, 0, 0, 0, fill="#111111", outline="")
+        # 오버레이는 트랙 전체 너비 이미지를 in/out 지점에 맞춰 밀어 넣고, 트랙 밖으로 나온 부분은 여백 색으로 가립니다
+        it['dim_l'] = self.create_image(0, 10, anchor="ne")
+        it['dim_r'] = self.create_image(0, 10, anchor="nw")
+        it['mask_l'] = self.create_rectangle(0, 0, 0, 0, fill="#222222", outline="")
+        it['mask_r'] = self.create_rectangle(0, 0, 0, 0, fill="#222222", outline="")
+        # 메인 선택 영역 박스 및 모서리 강조
+        it['sel'] = self.create_rectangle(0, 0, 0, 0, outline=color, width=1)
+        it['corners'] = [self.create_line(0, 0, 0, 0, fill=color, width=3) for _ in range(8)]
+        # 핸들 표시 [ ]
+        it['in'] = self.create_rectangle(0, 0, 0, 0, fill="#3b8ed0", outline="")
+        it['in_text'] = self.create_text(0, 40, text="[", fill="white", font=("Arial", 12, "bold"))
+        it['out'] = self.create_rectangle(0, 0, 0, 0, fill="#e67e22", outline="")
+        it['out_text'] = self.create_text(0, 40, text="]", fill="white", font=("Arial", 12, "bold"))
+        it['head'] = self.create_line(0, 0, 0, 0, fill="#ff4444", width=2)
+        it['head_mark'] = self.create_polygon(0, 0, 0, 0, 0, 0, fill="#ff4444")
+        it['head_text'] = self.create_text(0, 88, text="", fill="#ff4444", font=("Courier", 9, "bold"))
+        self.tag_raise("thumb", it['bg'])
 
     def draw(self):
-        self.delete("all"); self.dim_layer_images = []
-        self.create_rectangle(self.padding, 10, self.width - self.padding, 70, fill="#111111", outline="")
-        if self.thumbnails:
-            for p, x in self.thumbnails: self.create_image(x, 10, image=p, anchor="nw")
+        if not self._items: self._create_items()
+        it, pad, right = self._items, self.padding, self.width - self.padding
         x_i, x_o, x_p = self.get_x_pos(self.in_point), self.get_x_pos(self.out_point), self.get_x_pos(self.play_head)
-        self.draw_dimmed_area(self.padding, x_i); self.draw_dimmed_area(x_o, self.width - self.padding)
-
-        # 메인 선택 영역 박스
-        self.create_rectangle(x_i, 10, x_o, 70, outline="#2a2a2a", width=1)
-        
-        # 선택 영역 모서리 강조
-        cl, ct, color = 10, 3, "#2a2a2a"
-        # 좌상
-        self.create_line(x_i, 10, x_i+cl, 10, fill=color, width=ct)
-        self.create_line(x_i, 10, x_i, 10+cl, fill=color, width=ct)
-        # 우상
-        self.create_line(x_o, 10, x_o-cl, 10, fill=color, width=ct)
-        self.create_line(x_o, 10, x_o, 10+cl, fill=color, width=ct)
-        # 좌하
-        self.create_line(x_i, 70, x_i+cl, 70, fill=color, width=ct)
-        self.create_line(x_i, 70, x_i, 70-cl, fill=color, width=ct)
-        # 우하
-        self.create_line(x_o, 70, x_o-cl, 70, fill=color, width=ct)
-        self.create_line(x_o, 70, x_o, 70-cl, fill=color, width=ct)
 
-        # 핸들 표시 [ ]
-        self.create_rectangle(x_i, 10, x_i+14, 70, fill="#3b8ed0", outline=""); self.create_text(x_i+7, 40, text="[", fill="white", font=("Arial", 12, "bold"))
-        self.create_rectangle(x_o-14, 10, x_o, 70, fill="#e67e22", outline=""); self.create_text(x_o-7, 40, text="]", fill="white", font=("Arial", 12, "bold"))
-        self.create_line(x_p, 5, x_p, 75, fill="#ff4444", width=2); self.create_polygon(x_p-6, 5, x_p+6, 5, x_p, 15, fill="#ff4444")
-        self.create_text(max(65, min(self.width-65, x_p)), 88, text=f"{format_timecode(self.play_head*self.duration, self.fps)}/{int(round(self.play_head*self.duration*self.fps))}F", fill="#ff4444", font=("Courier", 9, "bold"))
+        self.coords(it['bg'], pad, 10, right, 70)
+        dim = self._get_dim_image()
+        self.itemconfigure(it['dim_l'], image=dim); self.coords(it['dim_l'], x_i, 10)
+        self.itemconfigure(it['dim_r'], image=dim); self.coords(it['dim_r'], x_o, 10)
+        self.coords(it['mask_l'], 0, 10, pad, 70)
+        self.coords(it['mask_r'], right, 10, self.width, 70)
+
+        self.coords(it['sel'], x_i, 10, x_o, 70)
+        cl = 10
+        corner_coords = (
+            (x_i, 10, x_i+cl, 10), (x_i, 10, x_i, 10+cl),  # 좌상
+            (x_o, 10, x_o-cl, 10), (x_o, 10, x_o, 10+cl),  # 우상
+            (x_i, 70, x_i+cl, 70), (x_i, 70, x_i, 70-cl),  # 좌하
+            (x_o, 70, x_o-cl, 70), (x_o, 70, x_o, 70-cl),  # 우하
+        )
+        for item, c in zip(it['corners'], corner_coords): self.coords(item, *c)
+
+        self.coords(it['in'], x_i, 10, x_i+14, 70); self.coords(it['in_text'], x_i+7, 40)
+        self.coords(it['out'], x_o-14, 10, x_o, 70); self.coords(it['out_text'], x_o-7, 40)
+        self.coords(it['head'], x_p, 5, x_p, 75); self.coords(it['head_mark'], x_p-6, 5, x_p+6, 5, x_p, 15)
+        self.coords(it['head_text'], max(65, min(self.width-65, x_p)), 88)
+        self.itemconfigure(it['head_text'], text=f"{format_timecode(self.play_head*self.duration, self.fps)}/{int(round(self.play_head*self.duration*self.fps))}F")
 
     def on_click(self, e):
         # [복구] 조작 시작 시 콜백 호출 (재생 중지 요청)
@@ -134,14 +197,7 @@ class TimelineSlider(ctk.CTkCanvas):
         if self.on_release_callback: self.on_release_callback()
     
     def trigger_callback(self, fast=False):
-        # [수정] 스로틀링(Throttling) 로직 적용
-        # 드래그(fast=True) 중일 때 너무 잦은 업데이트 방지 (시스템 다운 방지)
-        if fast:
-            current_time = time.time()
-            if current_time - self.last_update_time < self.update_interval:
-                return # 너무 빠르면 무시
-            self.last_update_time = current_time
-
+        # 드래그(fast=True) 중 프리뷰 디코딩은 수신 측(on_timeline_change)에서 최신 위치 하나로 합쳐집니다
         if self.on_change_callback: 
             self.on_change_callback(self.in_point*self.duration, self.out_point*self.duration, self.play_head*self.duration, fast)
 
@@ -274,6 +330,13 @@ class BulkEditWindow(ctk.CTkToplevel):
         self.entry_webp_quality = ctk.CTkEntry(self.webp_opt_container, width=35, textvariable=self.webp_quality_var)
         self.entry_webp_quality.pack(side="left", padx=2)
 
+        # GIF 디더링 옵션
+        self.gif_opt_container = ctk.CTkFrame(self.dynamic_opt_frame, fg_color="transparent")
+        ctk.CTkLabel(self.gif_opt_container, text="Dither:", font=("Arial", 11)).pack(side="left", padx=(5, 2))
+        self.gif_dither_var = ctk.StringVar(value=const.GIF_DITHER_DEFAULT)
+        self.combo_gif_dither = ctk.CTkComboBox(self.gif_opt_container, values=const.GIF_DITHER_OPTIONS, width=120, variable=self.gif_dither_var, state="readonly")
+        self.combo_gif_dither.pack(side="left", padx=2)
+
         # 3. 색보정 설정 (비활성화 고정)
         etc_frame = ctk.CTkFrame(options_row, fg_color="#2b2b2b", corner_radius=8)
         etc_frame.pack(side="left", fill="y", padx=5)
@@ -308,7 +371,7 @@ class BulkEditWindow(ctk.CTkToplevel):
     def _update_ui_visibility(self, choice):
         self.check_alpha.pack_forget(); self.combo_seq_format.pack_forget()
         # self.bitrate_container.pack_forget(); self.loop_container.pack_forget()
-        self.webp_opt_container.pack_forget();
+        self.webp_opt_container.pack_forget(); self.gif_opt_container.pack_forget()
         
         fps_state = "disabled" if choice == "Thumbnail" else "normal"
         self.fps_slider.configure(state=fps_state); self.entry_fps.configure(state=fps_state)
@@ -318,6 +381,7 @@ class BulkEditWindow(ctk.CTkToplevel):
         # Export Format 콤보박스 선택에 따른 이벤트 설정
         if choice == "GIF":
             self.check_alpha.pack(side="left", padx=10); self.loop_container.pack(side="left", padx=5)
+            self.gif_opt_container.pack(side="left", padx=5)
         elif choice == "WebM":
             self.check_alpha.pack(side="left", padx=10); self.bitrate_container.pack(side="left", padx=5)
         elif choice == "WebP":
@@ -365,7 +429,8 @@ class BulkEditWindow(ctk.CTkToplevel):
                 "bitrate": self.bitrate_var.get(),
                 "seq_format": self.seq_format_var.get(),
                 "webp_quality": int(self.webp_quality_var.get() or 80),
-                "webp_lossless": self.webp_lossless_var.get()
+                "webp_lossless": self.webp_lossless_var.get(),
+                "gif_dither": self.gif_dither_var.get()
             }
             self.app.bulk_update_selected_items(self.indices, settings)
             
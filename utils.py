@@ -22,16 +22,6 @@ if sys.platform == "darwin":
     os.environ["OBJC_DISABLE_INITIALIZE_FORK_SAFETY"] = "YES"
     os.environ["OS_ACTIVITY_MODE"] = "disable"
 
-# -------------------------------------------------------------------------
-# Drag and Drop 라이브러리 가용성 확인
-# -------------------------------------------------------------------------
-HAS_DND = False
-try:
-    from tkinterdnd2 import DND_FILES, TkinterDnD
-    HAS_DND = True
-except (ImportError, RuntimeError, Exception):
-    HAS_DND = False
-
 # -------------------------------------------------------------------------
 # 유틸리티 함수
 # -------------------------------------------------------------------------
@@ -1,14 +1,25 @@
 import os
+import sys
 import time
 import numpy as np
 import re
 import subprocess
 import json
+import struct
+import mmap
+import tempfile
+import threading
+import itertools
+import multiprocessing
+from collections import OrderedDict
 from io import BytesIO
-from PIL import Image, ImageEnhance, ImageSequence
+from functools import lru_cache
+from PIL import Image, ImageSequence
 from moviepy import VideoFileClip, VideoClip
 from utils import natural_sort_key, RESAMPLING_LANKZOS
-from concurrent.futures import ThreadPoolExecutor, as_completed
+import constants as const
+from media_cache import metadata_cache, thumbnail_cache, make_file_key
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed, wait, FIRST_COMPLETED
 
 def get_sequence_info(filename):
     """
@@ -38,17 +49,33 @@ def get_sequence_display_name(paths):
     start_info, end_info = frame_data[0], frame_data[-1]
     return f"{start_info[2]}{start_info[3]} ({start_info[1]}-{end_info[1]})"
 
-def get_video_metadata(path):
+def get_video_metadata(path, use_cache=True):
     """
     비디오 및 GIF 메타데이터 추출. 
     단일 파일로 처리될 때 호출됩니다.
+    결과는 (절대경로, 크기, 수정시각) 키의 영구 캐시에 저장되어 재스캔 시 ffprobe를 생략합니다.
     """
     if not os.path.exists(path):
         return None
-    
+    if use_cache:
+        meta = metadata_cache.get(path)
+        if meta is not None:
+            return meta
+    meta = _probe_video_metadata(path)
+    if meta is not None and use_cache:
+        metadata_cache.put(path, meta)
+    return meta
+
+def _probe_video_metadata(path):
+    """캐시를 거치지 않는 실제 메타데이터 추출 (GIF: PIL, 기타: ffprobe, 실패 시 MoviePy)"""
     if path.lower().endswith('.gif'):
         try:
-            # GIF 파일은 PIL을 사용하여 정확한 프레임 정보를 읽음
+            # 블록 헤더만 훑어서 프레임 수/지연 시간 계산 (픽셀 데이터 디코딩 없음)
+            return scan_gif_metadata(path)
+        except Exception:
+            pass
+        try:
+            # 헤더 스캔 실패(손상 파일 등) 시 PIL로 전체 프레임을 읽음
             with Image.open(path) as img:
                 duration = 0
                 frame_count = 0
@@ -90,13 +117,92 @@ def get_video_metadata(path):
     except Exception:
         return None
 
-def extract_thumbnail_fast(path, output_w=160):
+def _skip_gif_sub_blocks(data, pos):
+    """GIF 데이터 서브 블록 체인을 건너뛰고 종료 블록 다음 위치를 반환합니다."""
+    while True:
+        n = data[pos]
+        pos += 1
+        if n == 0:
+            return pos
+        pos += n
+
+def scan_gif_metadata(path):
+    """
+    GIF 블록 구조(논리 화면 기술자, 그래픽 제어 확장, 이미지 기술자)만 읽어
+    크기, 프레임 수, 총 재생 시간을 계산합니다. LZW 픽셀 데이터는 길이만 보고 건너뜁니다.
+    지연 시간 규칙은 Pillow와 같습니다. (GCE가 없는 프레임은 100ms)
+    """
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        if data[:6] not in (b'GIF87a', b'GIF89a'):
+            raise ValueError("GIF 헤더가 아닙니다.")
+        width, height = struct.unpack('<HH', data[6:10])
+        packed = data[10]
+        pos = 13
+        if packed & 0x80:  # 전역 컬러 테이블
+            pos += 3 * (2 ** ((packed & 0x07) + 1))
+
+        size = len(data)
+        frame_count, total_ms, frame_delay = 0, 0, None
+        while pos < size:
+            block = data[pos]
+            if block == 0x3B:  # 트레일러
+                break
+            if block == 0x21:  # 확장 블록
+                label = data[pos + 1]
+                pos += 2
+                if label == 0xF9 and data[pos] >= 4:
+                    frame_delay = struct.unpack('<H', data[pos + 2:pos + 4])[0] * 10
+                pos = _skip_gif_sub_blocks(data, pos)
+            elif block == 0x2C:  # 이미지 기술자
+                packed = data[pos + 9]
+                pos += 10
+                if packed & 0x80:  # 로컬 컬러 테이블
+                    pos += 3 * (2 ** ((packed & 0x07) + 1))
+                pos = _skip_gif_sub_blocks(data, pos + 1)  # LZW 최소 코드 크기 다음부터 데이터
+                total_ms += 100 if frame_delay is None else frame_delay
+                frame_count, frame_delay = frame_count + 1, None
+            else:
+                raise ValueError(f"알 수 없는 GIF 블록: {block:#x}")
+
+    if frame_count == 0:
+        raise ValueError("GIF 프레임이 없습니다.")
+    duration = total_ms / 1000.0
+    return {
+        'width': width,
+        'height': height,
+        'fps': (frame_count / duration) if duration > 0 else 10.0,
+        'duration': duration if duration > 0 else 0.1
+    }
+
+def extract_thumbnail_fast(path, output_w=160, use_cache=True):
     """
     매우 빠른 썸네일 추출.
+    결과는 디스크 썸네일 캐시에 저장되어 같은 파일을 다시 불러올 때 디코딩을 생략합니다.
     """
     if not os.path.exists(path):
         return None
+    key = f"{make_file_key(path)}|thumb|{output_w}" if use_cache else None
+    if key:
+        thumb = thumbnail_cache.get(key)
+        if thumb is not None:
+            return thumb
+    thumb = _extract_thumbnail(path, output_w)
+    if key and thumb is not None:
+        thumbnail_cache.put(key, thumb)
+    return thumb
+
+def filmstrip_cache_key(paths, count=const.FILMSTRIP_FRAMES):
+    """
+    타임라인 필름스트립 캐시 키. 단일 파일은 [path], 시퀀스는 샘플링된 프레임 경로 리스트를 넘깁니다.
+    파일이 하나라도 없으면 None을 반환합니다.
+    """
+    keys = [make_file_key(p) for p in paths]
+    if not keys or None in keys:
+        return None
+    w, h = const.FILMSTRIP_FRAME_SIZE
+    return "|".join(keys) + f"|strip|{count}|{w}x{h}"
 
+def _extract_thumbnail(path, output_w):
     if path.lower().endswith('.gif'):
         try:
             with Image.open(path) as img:
@@ -127,6 +233,112 @@ def extract_thumbnail_fast(path, output_w=160):
     except:
         return None
 
+def get_ffmpeg_exe():
+    """imageio_ffmpeg 번들 FFMPEG 경로 (없으면 시스템 PATH의 ffmpeg)"""
+    try:
+        import imageio_ffmpeg
+        return imageio_ffmpeg.get_ffmpeg_exe()
+    except Exception:
+        return "ffmpeg"
+
+def _filmstrip_times(duration, count):
+    return [max(0.01, min(duration - 0.01, (duration / count) * i)) for i in range(count)]
+
+def _grab_small_frame(ffmpeg_exe, path, t, frame_size, keyframe_only=False):
+    """
+    입력 탐색(-ss)으로 t 시점 한 프레임만 frame_size 크기의 RGB 원시 데이터로 받아옵니다.
+    keyframe_only이면 t 직전 키프레임 하나만 디코딩합니다. (GOP 중간 프레임 디코딩 생략)
+    """
+    w, h = frame_size
+    cmd = [ffmpeg_exe, '-v', 'error']
+    if keyframe_only:
+        cmd.extend(['-skip_frame', 'nokey', '-noaccurate_seek'])
+    cmd.extend(['-ss', f"{t:.3f}", '-i', path, '-frames:v', '1', '-an', '-sn',
+                '-vf', f'scale={w}:{h}', '-f', 'rawvideo', '-pix_fmt', 'rgb24', '-'])
+    startupinfo = None
+    if os.name == 'nt':
+        startupinfo = subprocess.STARTUPINFO()
+        startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW
+    result = subprocess.run(cmd, capture_output=True, timeout=15, startupinfo=startupinfo)
+    if len(result.stdout) < w * h * 3:
+        return None
+    return Image.frombytes('RGB', (w, h), result.stdout[:w * h * 3])
+
+def iter_filmstrip_frames(path, duration, count=const.FILMSTRIP_FRAMES, frame_size=const.FILMSTRIP_FRAME_SIZE, max_workers=4):
+    """
+    타임라인 필름스트립 프레임을 (인덱스, PIL 이미지) 형태로 완료되는 순서대로 내보냅니다.
+    - 각 지점 직전 키프레임만 병렬 디코딩하고 끝나는 즉시 내보냅니다. (축소 출력이라 원본 해상도 프레임을 Python으로 옮기지 않음)
+    - 키프레임 간격이 넓어 다른 칸과 같은 프레임이 나온 지점(뒤쪽 칸)과 실패한 지점만 정확한 탐색으로 다시 추출합니다.
+      이미 내보낸 칸이 다시 추출되면 같은 인덱스로 한 번 더 내보내므로 호출 측은 덮어써야 합니다.
+    추출에 끝내 실패한 인덱스는 건너뛰므로 호출 측에서 보충해야 합니다.
+    """
+    ffmpeg_exe = get_ffmpeg_exe()
+    times = _filmstrip_times(duration, count)
+    executor = ThreadPoolExecutor(max_workers=max_workers)
+    try:
+        # future -> (인덱스, 키프레임 단계 여부)
+        futures = {executor.submit(_grab_small_frame, ffmpeg_exe, path, t, frame_size, True): (i, True) for i, t in enumerate(times)}
+        owners, retried = {}, set()  # 키프레임 내용 -> 그 프레임을 표시하는 가장 앞 칸
+
+        def retry(i):
+            if i not in retried:
+                retried.add(i)
+                futures[executor.submit(_grab_small_frame, ffmpeg_exe, path, times[i], frame_size)] = (i, False)
+
+        pending = set(futures)
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                i, keyframe = futures.pop(future)
+                try:
+                    img = future.result()
+                except Exception:
+                    img = None
+                if not keyframe:
+                    if img is None: continue
+                    # 정확한 프레임이 다른 칸의 키프레임과 같으면 그 칸이 엉뚱한 시점을 표시하는 것이므로 다시 추출
+                    owner = owners.get(img.tobytes())
+                    if owner is not None and owner != i: retry(owner)
+                    yield i, img
+                    continue
+                if img is None:
+                    retry(i)
+                    continue
+                digest = img.tobytes()
+                owner = owners.get(digest)
+                if owner is None:
+                    owners[digest] = i
+                    yield i, img
+                elif owner < i:
+                    retry(i)
+                else:
+                    # 뒤쪽 칸이 먼저 표시된 경우: 앞 칸을 표시하고 뒤쪽 칸은 정확한 프레임으로 교체
+                    owners[digest] = i
+                    retry(owner)
+                    yield i, img
+            pending = set(futures)  # 처리하지 않은 작업 + 새로 추가한 재추출
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+def _load_small_image(path, frame_size):
+    with Image.open(path) as img:
+        # JPEG는 DCT 축소 디코딩으로 필요한 해상도만 읽음
+        img.draft('RGB', (frame_size[0], frame_size[1]))
+        return img.convert('RGB').resize(frame_size, RESAMPLING_LANKZOS)
+
+def iter_sequence_filmstrip_frames(paths, frame_size=const.FILMSTRIP_FRAME_SIZE, max_workers=4):
+    """시퀀스 샘플 경로들을 병렬로 축소 디코딩하여 (인덱스, PIL 이미지)를 완료 순서대로 내보냅니다."""
+    executor = ThreadPoolExecutor(max_workers=max_workers)
+    try:
+        futures = {executor.submit(_load_small_image, p, frame_size): i for i, p in enumerate(paths)}
+        for future in as_completed(futures):
+            try:
+                yield futures[future], future.result()
+            except Exception:
+                continue
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
 def analyze_media_item(item):
     """단일 항목 분석 워커"""
     path = item.get('path')
@@ -134,18 +346,27 @@ def analyze_media_item(item):
         seq_paths = item.get('sequence_paths', [])
         if seq_paths:
             try:
-                # 시퀀스의 경우 첫 번째 이미지를 썸네일로 사용
-                with Image.open(seq_paths[0]) as img:
-                    thumb = img.convert("RGB").copy()
-                    thumb.thumbnail((160, 90), RESAMPLING_LANKZOS)
-                    item['thumb_img'] = thumb
-                    item['width'] = img.size[0]
-                    item['height'] = img.size[1]
-                    item['status'] = "대기"
-                    # 시퀀스인 경우 전체 파일 개수를 기반으로 종료 시간 계산
-                    fps = item.get('fps', 24)
-                    item['end'] = len(seq_paths) / fps
-                    item['video_fps'] = fps
+                # 시퀀스의 경우 첫 번째 이미지를 썸네일로 사용 (디스크 캐시 우선, 둘 다 적중하면 파일을 열지 않음)
+                first = seq_paths[0]
+                key = f"{make_file_key(first)}|thumb|160x90"
+                thumb = thumbnail_cache.get(key)
+                size = metadata_cache.get(first)
+                if thumb is None or not size or 'width' not in size:
+                    with Image.open(first) as img:
+                        size = {'width': img.size[0], 'height': img.size[1]}
+                        metadata_cache.put(first, size)
+                        if thumb is None:
+                            thumb = img.convert("RGB").copy()
+                            thumb.thumbnail((160, 90), RESAMPLING_LANKZOS)
+                            thumbnail_cache.put(key, thumb)
+                item['thumb_img'] = thumb
+                item['width'] = size['width']
+                item['height'] = size['height']
+                item['status'] = "대기"
+                # 시퀀스인 경우 전체 파일 개수를 기반으로 종료 시간 계산
+                fps = item.get('fps', 24)
+                item['end'] = len(seq_paths) / fps
+                item['video_fps'] = fps
             except:
                 item['status'] = "시퀀스 분석 실패"
         return item
@@ -159,137 +380,479 @@ def analyze_media_item(item):
         item['status'] = "분석 실패"
     return item
 
-def bulk_analyze_items_parallel(items, progress_callback=None, max_workers=4):
+def _measure_io_latency(items, samples=5):
+    """앞쪽 항목 몇 개의 stat 평균 시간 (NAS 등 원격 경로 판별용)"""
+    paths = []
+    for item in items:
+        p = item.get('sequence_paths', [None])[0] if item.get('path') == "Image Sequence" else item.get('path')
+        if p: paths.append(p)
+        if len(paths) >= samples: break
+    if not paths: return 0.0
+    t0 = time.perf_counter()
+    for p in paths:
+        try: os.stat(p)
+        except OSError: pass
+    return (time.perf_counter() - t0) / len(paths)
+
+def _needs_process_pool(item):
+    """PIL로 GIF 전체를 파싱해야 하는 항목 (캐시에 없는 GIF)"""
+    path = item.get('path') or ""
+    return path.lower().endswith('.gif') and metadata_cache.get(path) is None
+
+def get_analysis_concurrency(items):
     """
-    멀티 스레딩 분석 및 실시간 진행률 업데이트.
-    progress_callback: (현재_완료_수, 전체_수)를 인자로 받는 함수
+    (스레드 수, 프로세스 수) 결정.
+    스레드는 ffprobe/ffmpeg 하위 프로세스 대기와 파일 I/O 위주이므로 코어 수보다 많이,
+    접근 지연이 큰 경로(NAS)일수록 더 많이 사용합니다. 프로세스는 코어 수 - 1.
     """
-    results = [None] * len(items)
-    with ThreadPoolExecutor(max_workers=max_workers) as executor:
-        # 각 아이템에 대한 future 객체 생성 및 인덱스 매핑
-        future_to_idx = {executor.submit(analyze_media_item, item): i for i, item in enumerate(items)}
-        
-        completed_count = 0
-        for future in as_completed(future_to_idx):
-            idx = future_to_idx[future]
+    cpu = os.cpu_count() or 2
+    io_factor = 4 if _measure_io_latency(items) > const.ANALYSIS_SLOW_IO_SECONDS else 2
+    return max(2, min(32, cpu * io_factor)), max(1, min(8, cpu - 1))
+
+def iter_analyze_items(items, max_workers=None):
+    """
+    항목 분석을 스케줄링하여 (인덱스, 분석된 항목)을 완료되는 순서대로 내보냅니다.
+    - 캐시에 없는 GIF(PIL 파싱, GIL 점유): 프로세스 풀
+    - 그 외(ffprobe/ffmpeg 호출, 시퀀스 첫 이미지): 스레드 풀
+    프로세스 풀을 쓸 수 없는 환경이면 해당 항목은 스레드 풀에서 다시 처리합니다.
+    """
+    if not items: return
+    thread_workers, process_workers = get_analysis_concurrency(items)
+    if max_workers: thread_workers = max_workers
+    gif_set = {i for i, item in enumerate(items) if _needs_process_pool(item)}
+    if len(gif_set) < const.ANALYSIS_PROCESS_MIN_ITEMS: gif_set = set()
+
+    threads = ThreadPoolExecutor(max_workers=thread_workers)
+    processes = None
+    try:
+        if gif_set:
             try:
-                results[idx] = future.result()
+                # 멀티스레드인 Tk 프로세스에서 fork하지 않도록 spawn 사용 (batch_worker와 동일)
+                processes = ProcessPoolExecutor(max_workers=min(process_workers, len(gif_set)),
+                                                mp_context=multiprocessing.get_context("spawn"))
             except Exception:
-                results[idx] = items[idx]
-                results[idx]['status'] = "심각한 오류"
-            
-            completed_count += 1
-            if progress_callback:
-                progress_callback(completed_count, len(items))
-                
+                gif_set = set()
+        futures = {}
+        for i, item in enumerate(items):
+            future = None
+            if i in gif_set:
+                try: future = processes.submit(analyze_media_item, item)
+                except Exception: gif_set.discard(i)
+            futures[future or threads.submit(analyze_media_item, item)] = i
+
+        pending = set(futures)
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                idx = futures[future]
+                try:
+                    yield idx, future.result()
+                except Exception:
+                    if idx in gif_set:
+                        # 프로세스 풀 실패(BrokenProcessPool 등) -> 스레드에서 재시도
+                        gif_set.discard(idx)
+                        retry = threads.submit(analyze_media_item, items[idx])
+                        futures[retry] = idx
+                        pending.add(retry)
+                        continue
+                    items[idx]['status'] = "심각한 오류"
+                    yield idx, items[idx]
+    finally:
+        threads.shutdown(wait=False, cancel_futures=True)
+        if processes is not None:
+            processes.shutdown(wait=False, cancel_futures=True)
+
+def bulk_analyze_items_parallel(items, progress_callback=None, max_workers=None):
+    """
+    병렬 분석 및 실시간 진행률 업데이트. (iter_analyze_items 결과를 원래 순서로 모아 반환)
+    progress_callback: (현재_완료_수, 전체_수)를 인자로 받는 함수
+    """
+    results = [None] * len(items)
+    for completed_count, (idx, item) in enumerate(iter_analyze_items(items, max_workers), 1):
+        results[idx] = item
+        if progress_callback:
+            progress_callback(completed_count, len(items))
     return results
 
+# -------------------------------------------------------------------------
+# 색보정 엔진 (LUT 컴파일 + NumPy 채도 처리)
+# -------------------------------------------------------------------------
+_COLOR_KEYS = (("exposure", 0.0), ("contrast", 0.0), ("saturation", 1.0),
+               ("temperature", 0.0), ("tint", 0.0), ("gamma", 1.0))
+
+# PIL의 RGB -> L 변환과 동일한 고정소수점 계수 테이블
+_LUMA_R = np.arange(256, dtype=np.uint32) * 19595
+_LUMA_G = np.arange(256, dtype=np.uint32) * 38470
+_LUMA_B = np.arange(256, dtype=np.uint32) * 7471
+
+def _color_settings_key(settings):
+    """색보정 설정 dict를 캐시 키로 사용할 수 있는 튜플로 변환 (값이 없을 때만 기본값, 채도 0 등은 그대로)"""
+    values = ((settings.get(k), d) for k, d in _COLOR_KEYS)
+    return tuple(round(float(d if v is None else v), 4) for v, d in values)
+
+def _scale_lut(factor):
+    """i * factor 를 0~255로 자르는 LUT (PIL의 int() 절사 동작과 동일)"""
+    return np.clip(np.floor(np.arange(256, dtype=np.float64) * factor), 0, 255).astype(np.uint8)
+
+@lru_cache(maxsize=const.COLOR_LUT_CACHE_SIZE)
+def _compile_color_program(key):
+    """
+    설정 튜플을 한 번만 컴파일하여 채널별 LUT로 만듭니다.
+    - pre: 노출(밝기) LUT (대비 계산 전 단계)
+    - contrast / saturation: 프레임 의존 단계의 계수 (1.0이면 None)
+    - post: 색온도 -> 틴트 -> 감마를 합성한 최종 LUT
+    """
+    exposure, contrast, saturation, temp, tint, gamma = key
+    identity = np.arange(256, dtype=np.uint8)
+
+    pre = _scale_lut(1.0 + exposure / 100.0) if exposure != 0 else identity
+    pre = np.stack([pre, pre, pre])
+
+    r_lut, g_lut, b_lut = identity, identity, identity
+    # 색온도: R/B 채널을 반대 방향으로 스케일
+    if temp > 0:
+        r_lut, b_lut = _scale_lut(1 + temp / 300)[r_lut], _scale_lut(1 - temp / 300)[b_lut]
+    elif temp < 0:
+        at = abs(temp)
+        r_lut, b_lut = _scale_lut(1 - at / 300)[r_lut], _scale_lut(1 + at / 300)[b_lut]
+    # 틴트: 양수는 G 강조, 음수는 R 감소/B 증가
+    if tint > 0:
+        g_lut = _scale_lut(1 + tint / 300)[g_lut]
+    elif tint < 0:
+        at = abs(tint)
+        r_lut, b_lut = _scale_lut(1 - at / 300)[r_lut], _scale_lut(1 + at / 300)[b_lut]
+    post = np.stack([r_lut, g_lut, b_lut])
+    # 감마
+    if gamma != 1.0:
+        g_table = np.minimum(255, np.floor(255 * (np.arange(256) / 255.0) ** (1 / gamma))).astype(np.uint8)
+        post = g_table[post]
+
+    return {
+        'pre': pre,
+        'contrast': (1.0 + contrast / 100.0) if contrast != 0 else None,
+        'saturation': saturation if saturation != 1.0 else None,
+        'post': post,
+    }
+
+def _frame_stage_luts(program, histogram):
+    """
+    프레임의 채널 히스토그램(768개)으로 평균 휘도를 구해 대비를 pre LUT에 합성합니다.
+    ImageEnhance.Contrast와 같이 노출 적용 후 L 채널 평균을 기준으로 합니다.
+    """
+    pre = program['pre']
+    factor = program['contrast']
+    if factor is None:
+        return pre
+    hist = np.asarray(histogram, dtype=np.float64).reshape(3, 256)
+    total = max(1.0, hist[0].sum())
+    means = [(hist[c] * pre[c]).sum() / total for c in range(3)]
+    mean = int((19595 * means[0] + 38470 * means[1] + 7471 * means[2]) / 65536 + 0.5)
+    staged = np.trunc(mean + (pre.astype(np.float64) - mean) * factor)
+    return np.clip(staged, 0, 255).astype(np.uint8)
+
+def _apply_saturation(rgb, factor):
+    """채도 보정 (PIL의 L 변환 계수로 회색 기준을 만든 뒤 한 번에 블렌딩)"""
+    gray = (_LUMA_R[rgb[..., 0]] + _LUMA_G[rgb[..., 1]] + _LUMA_B[rgb[..., 2]] + 0x8000) >> 16
+    gray = (gray * (1.0 - factor)).astype(np.float32)
+    out = rgb.astype(np.float32)
+    out *= factor
+    out += gray[..., None]
+    np.clip(out, 0, 255, out=out)
+    return out.astype(np.uint8)
+
+def apply_color_correction_array(frame, settings):
+    """
+    NumPy 프레임(H, W, 3 또는 4)에 색보정 적용.
+    MoviePy image_transform에서 PIL 왕복 없이 바로 사용할 수 있습니다.
+    """
+    if not settings.get('color_correction', False) or frame is None:
+        return frame
+    program = _compile_color_program(_color_settings_key(settings))
+    frame = np.asarray(frame)
+    if frame.dtype != np.uint8:
+        frame = np.clip(frame, 0, 255).astype(np.uint8)
+    rgb = frame[..., :3]
+
+    if program['contrast'] is not None:
+        sample = rgb[::2, ::2]
+        histogram = np.concatenate([np.bincount(sample[..., c].ravel(), minlength=256) for c in range(3)])
+    else:
+        histogram = None
+    stage = _frame_stage_luts(program, histogram)
+
+    if program['saturation'] is None:
+        # 채도 변경이 없으면 모든 단계를 하나의 LUT로 합성
+        lut = np.stack([program['post'][c][stage[c]] for c in range(3)])
+        out = np.stack([lut[c][rgb[..., c]] for c in range(3)], axis=-1)
+    else:
+        out = np.stack([stage[c][rgb[..., c]] for c in range(3)], axis=-1)
+        out = _apply_saturation(out, program['saturation'])
+        out = np.stack([program['post'][c][out[..., c]] for c in range(3)], axis=-1)
+
+    if frame.shape[-1] == 4:
+        out = np.concatenate([out, frame[..., 3:4]], axis=-1)
+    return out
+
 def apply_color_correction_pil(pil_img, settings):
-    """PIL 이미지를 사용하여 색보정 필터 적용"""
+    """PIL 이미지를 사용하여 색보정 필터 적용 (컴파일된 LUT 캐시 사용)"""
     if not settings.get('color_correction', False) or pil_img is None:
         return pil_img
-    
+
     # 알파 채널 확인 및 모드 변환
     has_alpha = 'A' in pil_img.mode or pil_img.mode == 'P'
     temp_img = pil_img.convert('RGBA') if has_alpha else pil_img.convert('RGB')
-    alpha = temp_img.split()[-1] if 'A' in temp_img.mode else None
-    img = temp_img.convert('RGB')
-    
-    # 노출, 대비, 채도 보정
-    if settings.get('exposure', 0) != 0:
-        img = ImageEnhance.Brightness(img).enhance(1.0 + (settings['exposure'] / 100.0))
-    if settings.get('contrast', 0) != 0:
-        img = ImageEnhance.Contrast(img).enhance(1.0 + (settings['contrast'] / 100.0))
-    if settings.get('saturation', 1.0) != 1.0:
-        img = ImageEnhance.Color(img).enhance(settings['saturation'])
-    
-    # 색온도 보정
-    temp = settings.get('temperature', 0)
-    if temp != 0:
-        r, g, b = img.split()
-        if temp > 0:
-            r = r.point(lambda i: min(255, int(i * (1 + temp/300))))
-            b = b.point(lambda i: max(0, int(i * (1 - temp/300))))
-        else:
-            at = abs(temp)
-            r = r.point(lambda i: max(0, int(i * (1 - at/300))))
-            b = b.point(lambda i: min(255, int(i * (1 + at/300))))
-        img = Image.merge('RGB', (r, g, b))
-        
-    # 틴트 보정
-    tint = settings.get('tint', 0)
-    if tint != 0:
-        r, g, b = img.split()
-        if tint > 0:
-            g = g.point(lambda i: min(255, int(i * (1 + tint/300))))
-        else:
-            at = abs(tint)
-            r = r.point(lambda i: max(0, int(i * (1 - abs(at)/300))))
-            b = b.point(lambda i: min(255, int(i * (1 + abs(at)/300))))
-        img = Image.merge('RGB', (r, g, b))
-        
-    # 감마 보정
-    gamma = settings.get('gamma', 1.0)
-    if gamma != 1.0:
-        img = img.point(lambda i: min(255, int(255 * (i / 255) ** (1 / gamma))))
-        
+    alpha = temp_img.getchannel('A') if 'A' in temp_img.mode else None
+    img = temp_img.convert('RGB') if alpha else temp_img
+
+    program = _compile_color_program(_color_settings_key(settings))
+    stage = _frame_stage_luts(program, img.histogram() if program['contrast'] is not None else None)
+
+    if program['saturation'] is None:
+        # 노출/대비/색온도/틴트/감마를 768개 테이블 하나로 합성하여 point 1회로 처리
+        lut = np.stack([program['post'][c][stage[c]] for c in range(3)])
+        img = img.point(lut.ravel().tolist())
+    else:
+        img = img.point(stage.ravel().tolist())
+        img = Image.fromarray(_apply_saturation(np.asarray(img), program['saturation']))
+        img = img.point(program['post'].ravel().tolist())
+
     # 알파 채널 복구
     if alpha:
-        img = Image.merge('RGBA', (*img.split(), alpha))
+        img.putalpha(alpha)
     return img
 
-def get_sequence_clip(paths, fps):
+def sort_sequence_paths(paths):
+    """시퀀스 경로를 절대 경로로 바꾸고 파일명 기준 natural sort"""
+    return sorted((os.path.abspath(p) for p in paths), key=lambda x: natural_sort_key(os.path.basename(x)))
+
+def sequence_has_alpha(path):
+    """시퀀스 첫 이미지에 알파 채널이 있는지 확인"""
+    try:
+        with Image.open(path) as img:
+            return (img.mode in ('RGBA', 'LA') or
+                    (img.mode == 'P' and 'transparency' in img.info))
+    except Exception:
+        return False
+
+def write_sequence_concat_list(paths, fps, start=0, end=-1):
+    """
+    FFMPEG concat demuxer용 목록 파일(ffconcat)을 임시 폴더에 생성합니다.
+    start/end(초)에 해당하는 프레임만 담으며, 각 이미지는 1/fps 동안 표시됩니다.
+    디코딩은 FFMPEG 네이티브 스레드에서 처리되므로 Python 측 프레임 로딩이 없습니다.
+    """
+    ordered = sort_sequence_paths(paths)
+    fps = float(fps)
+    first = max(0, int(start * fps + 0.0001))
+    last = len(ordered) if end is None or end < 0 else min(len(ordered), int(np.ceil(end * fps - 0.0001)))
+    selected = ordered[first:max(first + 1, last)]
+
+    frame_duration = 1.0 / fps
+    lines = ["ffconcat version 1.0"]
+    for p in selected:
+        # 작은따옴표 이스케이프, Windows 경로는 슬래시로 통일
+        safe = p.replace('\\', '/').replace("'", "'\\''")
+        lines.append(f"file '{safe}'")
+        lines.append(f"duration {frame_duration:.6f}")
+
+    fd, list_path = tempfile.mkstemp(prefix="seq_concat_", suffix=".ffconcat")
+    with os.fdopen(fd, 'w', encoding='utf-8') as f:
+        f.write("\n".join(lines) + "\n")
+    return list_path, len(selected) / fps
+
+_prefetch_pool = None
+_prefetch_pool_lock = threading.Lock()
+
+def _get_prefetch_pool():
+    """시퀀스 선읽기용 공유 스레드 풀 (Pillow 디코딩은 GIL을 해제하므로 병렬 효과가 있음)"""
+    global _prefetch_pool
+    with _prefetch_pool_lock:
+        if _prefetch_pool is None:
+            workers = max(2, min(8, os.cpu_count() or 2))
+            _prefetch_pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="seq-prefetch")
+        return _prefetch_pool
+
+def get_jpeg_draft_scale(path, target_width=None, crop=None):
+    """
+    최종 출력 폭(target_width)과 크롭 범위(정규화 좌표)를 기준으로, 해상도 손실 없이
+    JPEG DCT 축소 디코딩(draft)에 쓸 수 있는 가장 큰 배율(1, 2, 4, 8)을 반환합니다.
+    """
+    if not target_width: return 1
+    try:
+        with Image.open(path) as img:
+            if img.format != 'JPEG': return 1
+            src_w = img.size[0]
+    except Exception:
+        return 1
+    span = 1.0
+    if crop:
+        span = abs(crop[2] - crop[0]) or 1.0
+    for scale in const.JPEG_DRAFT_SCALES:
+        if src_w * span / scale >= target_width:
+            return scale
+    return 1
+
+class SequenceFrameSource:
+    """
+    시퀀스 이미지를 인덱스 단위로 디코딩해 RGB/RGBA uint8 배열로 보관하는 공유 계층.
+    RGB 클립과 마스크 클립이 같은 소스를 바라보므로 파일 하나는 한 번만 디코딩됩니다.
+    순차 접근이 감지되면 다음 프레임들을 스레드 풀에서 미리 디코딩하고,
+    스크러빙처럼 접근 위치가 튀면 진행 중인 선읽기를 버립니다.
+    """
+    def __init__(self, paths, fps, size, has_alpha, cache_frames=const.SEQUENCE_FRAME_CACHE_SIZE,
+                 prefetch_frames=const.SEQUENCE_PREFETCH_FRAMES, max_bytes=const.SEQUENCE_PREFETCH_MAX_BYTES,
+                 draft_scale=1):
+        self.paths = tuple(paths)
+        self.fps = float(fps)
+        self.size = size
+        self.has_alpha = has_alpha
+        self.draft_scale = draft_scale
+        # 메모리 상한: 캐시(선읽기 + 여유 2장)와 진행 중 작업을 합쳐 max_bytes 이내
+        frame_bytes = max(1, size[0] * size[1] * (4 if has_alpha else 3))
+        self.prefetch_frames = max(0, min(int(prefetch_frames), max_bytes // (2 * frame_bytes) - 1))
+        self.cache_frames = max(2, int(cache_frames), self.prefetch_frames + 2)
+        self._cache = OrderedDict()
+        self._pending = {}
+        self._generation = 0
+        self._last_idx = None
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.paths)
+
+    def index_at(self, t):
+        # 부동 소수점 오차 보정을 위해 아주 작은 값을 더한 뒤 인덱스 계산
+        idx = int(t * self.fps + 0.0001)
+        return max(0, min(len(self.paths) - 1, idx))
+
+    def _decode(self, idx):
+        mode = 'RGBA' if self.has_alpha else 'RGB'
+        try:
+            # Pillow의 내부 캐시를 우회하기 위해 파일을 명시적으로 다시 엶
+            with Image.open(self.paths[idx]) as img:
+                if self.draft_scale > 1 and img.format == 'JPEG':
+                    # DCT 단계에서 축소 디코딩 (1/2, 1/4, 1/8)
+                    img.draft(mode, (img.size[0] // self.draft_scale, img.size[1] // self.draft_scale))
+                if img.mode != mode:
+                    img = img.convert(mode)
+                if self.draft_scale > 1 and img.size != self.size:
+                    img = img.resize(self.size, RESAMPLING_LANKZOS)
+                arr = np.array(img)
+        except Exception:
+            w, h = self.size
+            arr = np.zeros((h, w, len(mode)), dtype=np.uint8)
+            if self.has_alpha: arr[..., 3] = 255
+        arr.flags.writeable = False
+        return arr
+
+    def _store_locked(self, idx, arr):
+        self._cache[idx] = arr
+        self._cache.move_to_end(idx)
+        while len(self._cache) > self.cache_frames:
+            self._cache.popitem(last=False)
+
+    def _discard_pending_locked(self):
+        for fut in self._pending.values():
+            fut.cancel()
+        self._pending.clear()
+        self._generation += 1
+
+    def _prefetch_task(self, idx, generation):
+        arr = self._decode(idx)
+        with self._lock:
+            if generation == self._generation:
+                self._store_locked(idx, arr)
+                self._pending.pop(idx, None)
+        return arr
+
+    def _schedule_locked(self, idx):
+        last, self._last_idx = self._last_idx, idx
+        if self.prefetch_frames <= 0 or idx == last:
+            return
+        if last is not None and not (last < idx <= last + self.prefetch_frames):
+            # 역방향 이동이나 선읽기 범위를 벗어난 점프 -> 진행 중인 선읽기 폐기
+            self._discard_pending_locked()
+        pool = _get_prefetch_pool()
+        generation = self._generation
+        for j in range(idx + 1, min(len(self.paths), idx + 1 + self.prefetch_frames)):
+            if j in self._cache or j in self._pending:
+                continue
+            self._pending[j] = pool.submit(self._prefetch_task, j, generation)
+
+    def get(self, idx):
+        """인덱스의 디코딩된 프레임(H, W, 3|4 uint8). 반환 배열은 캐시 공유이므로 읽기 전용입니다."""
+        with self._lock:
+            arr = self._cache.get(idx)
+            if arr is not None:
+                self._cache.move_to_end(idx)
+            fut = self._pending.get(idx) if arr is None else None
+            self._schedule_locked(idx)
+        if arr is not None:
+            return arr
+        if fut is not None:
+            try:
+                return fut.result()
+            except Exception:
+                pass
+        arr = self._decode(idx)
+        with self._lock:
+            self._store_locked(idx, arr)
+        return arr
+
+    def close(self):
+        """진행 중인 선읽기를 취소하고 캐시를 비웁니다."""
+        with self._lock:
+            self._discard_pending_locked()
+            self._cache.clear()
+            self._last_idx = None
+
+    def rgb_at(self, t):
+        arr = self.get(self.index_at(t))
+        return np.ascontiguousarray(arr[..., :3]) if self.has_alpha else arr.copy()
+
+    def alpha_at(self, t):
+        """알파 채널을 uint8(0~255) 평면으로 반환합니다."""
+        arr = self.get(self.index_at(t))
+        if not self.has_alpha:
+            return np.full(arr.shape[:2], 255, dtype=np.uint8)
+        return np.ascontiguousarray(arr[..., 3])
+
+def get_sequence_clip(paths, fps, target_width=None, crop=None):
     """
     이미지 파일 리스트를 MoviePy 비디오 클립으로 변환합니다.
     캐싱 문제를 방지하기 위해 VideoClip을 사용하며 현재 경로 리스트를 튜플로 고정합니다.
+    RGB와 마스크 클립은 SequenceFrameSource를 공유하여 프레임당 한 번만 디코딩합니다.
+    target_width/crop(정규화 좌표)을 넘기면 JPEG 시퀀스는 필요한 만큼만 축소 디코딩되며,
+    클립 크기도 축소된 해상도가 됩니다. (이후의 비율 기반 크롭/리사이즈는 그대로 동작)
     """
     if not paths: return None
     
-    # 경로 리스트를 튜플로 변환하여 불변 상태로 캡처 (클로저 오염 방지)
-    current_paths = tuple([os.path.abspath(p) for p in paths])
-    # 정렬 (natural_sort 사용)
-    current_paths = tuple(sorted(current_paths, key=lambda x: natural_sort_key(os.path.basename(x))))
+    # 경로 리스트를 튜플로 변환하여 불변 상태로 캡처 (클로저 오염 방지, natural_sort 정렬)
+    current_paths = tuple(sort_sequence_paths(paths))
     
     current_fps = float(fps)
-    num_frames = len(current_paths)
-    duration = num_frames / current_fps
+    duration = len(current_paths) / current_fps
     
+    draft_scale = get_jpeg_draft_scale(current_paths[0], target_width, crop)
     try:
         with Image.open(current_paths[0]) as first_img:
+            if draft_scale > 1:
+                first_img.draft('RGB', (first_img.size[0] // draft_scale, first_img.size[1] // draft_scale))
             current_size = first_img.size
             has_alpha = (first_img.mode in ('RGBA', 'LA') or 
                          (first_img.mode == 'P' and 'transparency' in first_img.info))
     except Exception:
         return None
 
-    def make_rgb_frame(t):
-        # 부동 소수점 오차 보정을 위해 아주 작은 값을 더한 뒤 인덱스 계산
-        idx = int(t * current_fps + 0.0001)
-        idx = max(0, min(num_frames - 1, idx))
-        try:
-            # Pillow의 내부 캐시를 우회하기 위해 파일을 명시적으로 다시 엶
-            with Image.open(current_paths[idx]) as img:
-                if img.mode != 'RGB':
-                    img = img.convert('RGB')
-                return np.array(img)
-        except Exception:
-            return np.zeros((current_size[1], current_size[0], 3), dtype=np.uint8)
+    source = SequenceFrameSource(current_paths, current_fps, current_size, has_alpha, draft_scale=draft_scale)
 
     # VideoClip 생성 (ImageSequenceClip의 자동 캐싱을 피함)
-    rgb_clip = VideoClip(make_rgb_frame, duration=duration)
+    rgb_clip = VideoClip(source.rgb_at, duration=duration)
     
     if has_alpha:
+        # MoviePy 마스크 이펙트(resize 등)는 0~1 float을 가정하므로 경계에서만 변환
+        inv_255 = np.float32(1.0 / 255.0)
         def make_mask_frame(t):
-            idx = int(t * current_fps + 0.0001)
-            idx = max(0, min(num_frames - 1, idx))
-            try:
-                with Image.open(current_paths[idx]) as img:
-                    if img.mode != 'RGBA':
-                        img = img.convert('RGBA')
-                    alpha_channel = img.getchannel('A')
-                    return np.array(alpha_channel, dtype=np.float32) / 255.0
-            except Exception:
-                return np.ones((current_size[1], current_size[0]), dtype=np.float32)
+            return source.alpha_at(t) * inv_255
         
         mask_clip = VideoClip(make_mask_frame, is_mask=True, duration=duration)
         
@@ -299,43 +862,219 @@ def get_sequence_clip(paths, fps):
             rgb_clip = rgb_clip.with_mask(mask_clip)
         else:
             rgb_clip.mask = mask_clip
+    rgb_clip.frame_source = source
+    # 클립 정리 시 선읽기 작업과 디코딩 캐시도 함께 해제
+    clip_close = rgb_clip.close
+    def close():
+        source.close()
+        clip_close()
+    rgb_clip.close = close
             
     return rgb_clip
 
-def perform_write_webp(clip, filename, fps, logger, loop, transparent, app_instance, quality=80, lossless=False):
-    """Pillow를 사용하여 WebP 애니메이션을 저장하며, 품질, 무손실, 고효율 압축을 적용합니다."""
-    frames = []
-    total_frames = int(clip.duration * fps)
-    for i in range(total_frames):
-        if app_instance.cancel_requested: raise RuntimeError("CANCEL_REQUESTED")
-        while app_instance.batch_paused: time.sleep(0.5)
-        t = i / fps
-        frame = clip.get_frame(t)
-        img = Image.fromarray(frame.astype('uint8'))
-        if transparent and clip.mask is not None:
-            mask_frame = clip.mask.get_frame(t)
-            if len(mask_frame.shape) == 3: mask_frame = mask_frame[:, :, 0]
-            mask_img = Image.fromarray((mask_frame * 255).astype('uint8'), mode='L')
-            img.putalpha(mask_img)
-        frames.append(img)
-        if logger and i % 5 == 0:
-            logger.bars_update('main', index=i + 1, total=total_frames)
-    if frames:
-        if logger: logger.bars_update('main', index=total_frames, total=total_frames)
-
-        # 메타데이터 강제 제거
-        for frame in frames:
-            frame.info.pop('exif', None)
-            frame.info.pop('xmp', None)
-            frame.info.pop('icc_profile', None)
-
-        # method=6 고정으로 최상의 압축률 적용
-        frames[0].save(filename, save_all=True, append_images=frames[1:], 
-                       duration=int(1000/fps), loop=loop, quality=quality, method=6, lossless=lossless)
-
-def perform_write_gif(clip, filename, fps, logger, loop, transparent, app_instance):
-    """Pillow를 사용하여 GIF 저장"""
-    frames = []
+# -------------------------------------------------------------------------
+# 프리뷰 프레임 캐시 (스크러빙 / 재생 / 크롭 / 색보정 공용)
+# -------------------------------------------------------------------------
+_clip_ids = itertools.count(1)
+
+def clip_cache_id(clip):
+    """클립 객체마다 고유한 캐시 식별자 (id() 재사용으로 다른 클립의 프레임이 섞이지 않도록 부여)"""
+    cid = getattr(clip, '_preview_cache_id', None)
+    if cid is None:
+        cid = next(_clip_ids)
+        try: clip._preview_cache_id = cid
+        except AttributeError: return id(clip)
+    return cid
+
+def frame_index(t, fps):
+    """시간을 fps 기준 프레임 인덱스로 양자화 (부동 소수점 오차 보정 포함)"""
+    return int(max(0.0, t) * fps + 0.0001)
+
+class PreviewFrameCache:
+    """
+    (클립 식별자, 프레임 인덱스, 렌더 크기) 키로 색보정 전 프리뷰 이미지를 보관하는 LRU.
+    보관 중인 이미지의 총 바이트가 max_bytes를 넘으면 가장 오래 쓰이지 않은 것부터 버립니다.
+    """
+    def __init__(self, max_bytes=const.PREVIEW_CACHE_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._items = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(clip, t, fps, size):
+        return (clip_cache_id(clip), frame_index(t, fps), tuple(size))
+
+    @staticmethod
+    def _image_bytes(img):
+        return img.width * img.height * len(img.getbands())
+
+    def get(self, key):
+        with self._lock:
+            img = self._items.get(key)
+            if img is None:
+                self.misses += 1
+                return None
+            self._items.move_to_end(key)
+            self.hits += 1
+            return img
+
+    def put(self, key, img):
+        size = self._image_bytes(img)
+        if size > self.max_bytes: return
+        with self._lock:
+            old = self._items.pop(key, None)
+            if old is not None: self._bytes -= self._image_bytes(old)
+            self._items[key] = img
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                _, evicted = self._items.popitem(last=False)
+                self._bytes -= self._image_bytes(evicted)
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+            self._bytes = 0
+
+    def stats(self):
+        with self._lock:
+            total = self.hits + self.misses
+            return {'hits': self.hits, 'misses': self.misses, 'entries': len(self._items), 'bytes': self._bytes,
+                    'hit_rate': (self.hits / total) if total else 0.0}
+
+    def __len__(self):
+        return len(self._items)
+
+# -------------------------------------------------------------------------
+# 재생 엔진 (생산자/소비자 + 선디코딩 링 버퍼 + 프레임 드롭)
+# -------------------------------------------------------------------------
+class PlaybackEngine:
+    """
+    벽시계 기준 미리보기 재생기.
+    - 생산자 스레드: 재생 위치보다 buffer_frames 만큼 앞선 프레임을 순서대로 prepare(idx)로 준비합니다.
+      (MoviePy 리더는 역방향 탐색 시 재초기화되므로 디코딩은 순차 유지)
+      prepare 결과의 후처리(finish)는 워커 풀에서 병렬로 실행되어 링 버퍼에 들어갑니다.
+    - 소비자 스레드: 시작 시각 기준으로 표시할 틱을 계산해 present(idx, result)를 호출하고,
+      표시 시점을 놓친 프레임은 건너뜁니다. 1초마다 on_stats(실제 fps, 목표 fps, 누적 드롭 수)를 호출합니다.
+    틱은 단조 증가하며 [start_index, end_index) 구간을 반복하는 프레임 인덱스로 변환됩니다.
+    """
+    def __init__(self, prepare, finish, present, fps, start_index, end_index, first_index=None,
+                 buffer_frames=const.PLAYBACK_BUFFER_FRAMES, workers=None, on_stats=None):
+        self.prepare, self.finish, self.present, self.on_stats = prepare, finish, present, on_stats
+        self.fps = float(fps)
+        self.start_index = int(start_index)
+        self.length = max(1, int(end_index) - self.start_index)
+        first = self.start_index if first_index is None else int(first_index)
+        self.first_tick = first - self.start_index if 0 <= first - self.start_index < self.length else 0
+        self.buffer_frames = max(2, int(buffer_frames))
+        self.presented = 0
+        self.dropped = 0
+        self._buffer = {}
+        self._cursor = self.first_tick
+        self._running = False
+        self._cond = threading.Condition()
+        self._pool = ThreadPoolExecutor(max_workers=workers or max(2, min(4, os.cpu_count() or 2)), thread_name_prefix="playback")
+
+    def frame_at(self, tick):
+        return self.start_index + (tick % self.length)
+
+    def start(self):
+        self._running = True
+        threading.Thread(target=self._produce, daemon=True).start()
+        threading.Thread(target=self._consume, daemon=True).start()
+
+    def stop(self):
+        with self._cond:
+            self._running = False
+            self._buffer.clear()
+            self._cond.notify_all()
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+    @property
+    def running(self):
+        return self._running
+
+    def _produce(self):
+        tick, cost = self.first_tick, 0.0
+        while True:
+            with self._cond:
+                while self._running and tick - self._cursor >= self.buffer_frames:
+                    self._cond.wait()
+                if not self._running: return
+                # 소비자가 앞서 나갔으면 늦은 프레임은 건너뛰고, 준비 시간만큼 앞선 프레임부터 다시 준비
+                if tick < self._cursor:
+                    tick = self._cursor + min(self.buffer_frames - 1, int(cost * self.fps) + 1)
+            idx = self.frame_at(tick)
+            t_start = time.perf_counter()
+            try:
+                base = self.prepare(idx)
+                future = self._pool.submit(self.finish, idx, base)
+            except Exception:
+                if not self._running: return
+                future = None
+            cost = 0.7 * cost + 0.3 * (time.perf_counter() - t_start)
+            with self._cond:
+                if not self._running: return
+                if future is not None:
+                    self._buffer[tick] = future
+                    future.add_done_callback(self._notify)
+            tick += 1
+
+    def _notify(self, _future):
+        with self._cond:
+            self._cond.notify_all()
+
+    def _consume(self):
+        # 프레임이 준비될 때까지 기다린 뒤 시계를 시작 (프리롤). 첫 프레임 준비가 실패해도 멈추지 않도록
+        # 가장 먼저 완성된 틱부터 시작하며, 제한 시간 안에 완성된 프레임이 없으면 그냥 시작합니다.
+        deadline, start_tick = time.perf_counter() + const.PLAYBACK_PREROLL_TIMEOUT, self.first_tick
+        with self._cond:
+            while self._running and time.perf_counter() < deadline:
+                done_ticks = [t for t, f in self._buffer.items() if f.done()]
+                if done_ticks:
+                    start_tick = min(done_ticks); break
+                self._cond.wait(0.05)
+        t0 = time.perf_counter() - (start_tick - self.first_tick) / self.fps
+        last_shown, window_start, window_count = self.first_tick - 1, t0, 0
+        while self._running:
+            now = time.perf_counter()
+            due = self.first_tick + int((now - t0) * self.fps)
+            with self._cond:
+                self._cursor = due
+                # 표시 시점이 지난 틱 중 완성된 가장 최근 프레임만 남기고 버림
+                ready = [t for t, f in self._buffer.items() if last_shown < t <= due and f.done()]
+                show_tick = max(ready) if ready else None
+                for tick in [t for t in self._buffer if t < due and t != show_tick]:
+                    self._buffer.pop(tick).cancel()
+                self._cond.notify_all()
+                future = self._buffer.pop(show_tick) if show_tick is not None else None
+            if future is not None:
+                self.dropped += max(0, show_tick - last_shown - 1)
+                last_shown = show_tick
+                try:
+                    shown = self.present(self.frame_at(show_tick), future.result()) is not False
+                except Exception:
+                    shown = False
+                if shown:
+                    self.presented += 1; window_count += 1
+                else:
+                    self.dropped += 1
+            if self.on_stats and now - window_start >= 1.0:
+                self.on_stats(window_count / (now - window_start), self.fps, self.dropped)
+                window_start, window_count = now, 0
+            # 다음 틱의 표시 시점까지 대기 (그 전에 프레임이 완성되면 깨어남)
+            next_deadline = t0 + (max(due, last_shown) + 1 - self.first_tick) / self.fps
+            with self._cond:
+                if self._running:
+                    self._cond.wait(max(0.0, min(next_deadline - time.perf_counter(), 0.05)))
+
+def _iter_clip_frames(clip, fps, transparent, app_instance, logger=None):
+    """
+    클립을 fps 간격으로 한 프레임씩 PIL 이미지로 꺼내는 제너레이터.
+    취소/일시정지 확인과 진행률 갱신을 함께 처리하며 프레임을 모아두지 않습니다.
+    """
     total_frames = int(clip.duration * fps)
     for i in range(total_frames):
         if app_instance.cancel_requested: raise RuntimeError("CANCEL_REQUESTED")
@@ -346,16 +1085,165 @@ def perform_write_gif(clip, filename, fps, logger, loop, transparent, app_instan
         if transparent and clip.mask is not None:
             mask_frame = clip.mask.get_frame(t)
             if len(mask_frame.shape) == 3: mask_frame = mask_frame[:, :, 0]
-            mask_img = Image.fromarray((mask_frame * 255).astype('uint8'), mode='L')
+            if mask_frame.dtype != np.uint8:
+                mask_frame = (mask_frame * 255).astype('uint8')
+            mask_img = Image.fromarray(mask_frame)
             img.putalpha(mask_img)
-        frames.append(img.convert("RGBA") if transparent else img.convert("RGB"))
+        yield i, total_frames, img
         if logger and i % 5 == 0:
             logger.bars_update('main', index=i + 1, total=total_frames)
-    if frames:
-        if logger: logger.bars_update('main', index=total_frames, total=total_frames)
-        save_args = {"save_all": True, "append_images": frames[1:], "duration": int(1000 / fps), "loop": loop, "optimize": True}
-        if transparent: frames[0].save(filename, **save_args, transparency=0, disposal=2)
-        else: frames[0].save(filename, **save_args)
+    if logger and total_frames:
+        logger.bars_update('main', index=total_frames, total=total_frames)
+
+@lru_cache(maxsize=None)
+def has_ffmpeg_encoder(ffmpeg_exe, name):
+    """FFMPEG 빌드에 해당 인코더가 있는지 확인 (실행 파일별로 한 번만 조회)"""
+    try:
+        out = subprocess.run([ffmpeg_exe, '-hide_banner', '-encoders'], capture_output=True, text=True, timeout=10).stdout
+    except (OSError, subprocess.SubprocessError):
+        return False
+    return any(line.split()[1:2] == [name] for line in out.splitlines())
+
+class _FfmpegPipeWriter:
+    """
+    프레임을 받는 즉시 원시(rawvideo) 바이트로 FFMPEG 표준 입력에 넘기는 스트리밍 작성기의 공통부.
+    원본 프레임을 모아두지 않으므로 클립 길이와 무관하게 메모리가 일정합니다.
+    하위 클래스는 name(오류 메시지용)과 _output_args()를 정의합니다.
+    """
+    name = "FFMPEG"
+
+    def __init__(self, filename, duration_ms, loop=0, transparent=False):
+        self.filename = filename
+        self.duration = duration_ms
+        self.loop = loop
+        self.mode = 'RGBA' if transparent else 'RGB'
+        self.proc = None
+        self.stderr = None
+        self.size = None
+        self.ffmpeg_exe = get_ffmpeg_exe()
+        self.frame_count = 0
+
+    def __enter__(self): return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None: self.close()
+        else: self.abort()
+        return False
+
+    def _output_args(self):
+        raise NotImplementedError
+
+    def _open_encoder(self, size):
+        self.size = size
+        cmd = [self.ffmpeg_exe, '-y', '-v', 'error',
+               '-f', 'rawvideo', '-pix_fmt', 'rgba' if self.mode == 'RGBA' else 'rgb24',
+               '-s', f"{size[0]}x{size[1]}", '-framerate', f"1000/{max(1, int(self.duration))}", '-i', '-',
+               ] + self._output_args() + ['-an', self.filename]
+        startupinfo = None
+        if sys.platform == "win32":
+            startupinfo = subprocess.STARTUPINFO()
+            startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW
+        self.stderr = tempfile.TemporaryFile()
+        self.proc = subprocess.Popen(cmd, stdin=subprocess.PIPE, stdout=subprocess.DEVNULL, stderr=self.stderr, startupinfo=startupinfo)
+
+    def _encoder_error(self):
+        self.stderr.seek(0)
+        message = self.stderr.read().decode('utf-8', 'replace').strip()
+        return OSError(f"{self.name} 인코딩 실패: {message or self.proc.returncode}")
+
+    def write_frame(self, img):
+        img = img.convert(self.mode)
+        if self.proc is None:
+            self._open_encoder(img.size)
+        elif img.size != self.size:
+            img = img.resize(self.size)
+        try:
+            self.proc.stdin.write(img.tobytes())
+        except (BrokenPipeError, OSError):
+            self.proc.wait()
+            raise self._encoder_error()
+        self.frame_count += 1
+
+    def close(self):
+        if self.proc is None: return
+        try:
+            self.proc.stdin.close()
+            if self.proc.wait() != 0:
+                raise self._encoder_error()
+        finally:
+            self.stderr.close()
+            self.proc = None
+
+    def abort(self):
+        """취소/오류 시 인코더를 종료하고 작성 중이던 파일을 삭제"""
+        if self.proc is None: return
+        try: self.proc.kill()
+        except OSError: pass
+        self.proc.wait()
+        self.stderr.close()
+        self.proc = None
+        try: os.remove(self.filename)
+        except OSError: pass
+
+class GifStreamWriter(_FfmpegPipeWriter):
+    """
+    프레임을 FFMPEG palettegen/paletteuse로 넘겨 프레임마다 로컬 팔레트를 만들어 기록하는 GIF 작성기.
+    (stats_mode=single + new=1이므로 팔레트를 위해 전체 프레임을 버퍼링하지 않음)
+    - 불투명: 직전 프레임과 달라진 사각형만 다시 디더링/기록 (diff_mode=rectangle)
+    - 투명: 반투명 이하(128 미만) 픽셀은 투명 처리하고, 보이는 영역만 잘라 배경으로 복원 (disposal=2)
+    """
+    name = "GIF"
+
+    def __init__(self, filename, duration_ms, loop=0, transparent=False, dither=const.GIF_DITHER_DEFAULT):
+        super().__init__(filename, duration_ms, loop=loop, transparent=transparent)
+        self.dither = dither
+
+    def _output_args(self):
+        transparent = self.mode == 'RGBA'
+        gen = f"palettegen=stats_mode=single:reserve_transparent={1 if transparent else 0}"
+        use = f"paletteuse=new=1:dither={self.dither}:diff_mode=rectangle" + (":alpha_threshold=128" if transparent else "")
+        # loop=None이면 반복 확장 블록을 쓰지 않음 (FFMPEG GIF 먹서의 -1)
+        return ['-filter_complex', f"split[a][b];[a]{gen}[p];[b][p]{use}",
+                '-loop', str(-1 if self.loop is None else int(self.loop)), '-f', 'gif']
+
+class WebPStreamWriter(_FfmpegPipeWriter):
+    """
+    프레임을 받는 즉시 FFMPEG(libwebp_anim) 표준 입력으로 넘겨 압축하는 WebP 작성기.
+    메타데이터(EXIF/XMP/ICC)는 기록하지 않으며 method(compression_level)=6 고정입니다.
+    FFMPEG에 libwebp_anim이 없으면 프레임을 모두 메모리에 모아야 하므로 시작하지 않고 오류를 냅니다.
+    제한: 손실 압축에서 투명 영역이 프레임 가장자리의 직사각형뿐이면 인코더가 알파(ALPH) 없이 프레임을
+    잘라서만 표현하고, FFMPEG WebP 먹서는 이때 VP8X 헤더의 알파 플래그를 켜지 않습니다. 그런 파일은
+    일부 디코더(Pillow 등)가 잘린 영역을 불투명 배경으로 표시하므로 그 경우에는 무손실을 사용하세요.
+    """
+    name = "WebP"
+
+    def __init__(self, filename, duration_ms, loop=0, quality=80, lossless=False, transparent=False):
+        super().__init__(filename, duration_ms, loop=loop, transparent=transparent)
+        self.quality = quality
+        self.lossless = lossless
+        self.method = 6
+        if not has_ffmpeg_encoder(self.ffmpeg_exe, 'libwebp_anim'):
+            raise RuntimeError(f"FFMPEG에 libwebp_anim 인코더가 없어 WebP 애니메이션을 만들 수 없습니다: {self.ffmpeg_exe}")
+
+    def _output_args(self):
+        # libwebp가 직접 RGB -> YUV 변환과 알파 처리를 하도록 bgra로 전달 (Pillow 저장과 동일한 경로)
+        return ['-c:v', 'libwebp_anim', '-pix_fmt', 'bgra', '-lossless', '1' if self.lossless else '0',
+                '-quality', str(self.quality), '-compression_level', str(self.method),
+                '-loop', str(int(self.loop)), '-f', 'webp']
+
+def perform_write_webp(clip, filename, fps, logger, loop, transparent, app_instance, quality=80, lossless=False):
+    """WebP 애니메이션을 프레임 단위로 인코딩하며, 품질, 무손실, 고효율 압축을 적용합니다."""
+    actual_transparent = transparent and clip.mask is not None
+    with WebPStreamWriter(filename, int(1000 / fps), loop=loop, quality=quality, lossless=lossless,
+                          transparent=actual_transparent) as writer:
+        for _, _, img in _iter_clip_frames(clip, fps, actual_transparent, app_instance, logger):
+            writer.write_frame(img)
+
+def perform_write_gif(clip, filename, fps, logger, loop, transparent, app_instance, dither=const.GIF_DITHER_DEFAULT):
+    """프레임을 하나씩 FFMPEG GIF 인코더로 넘겨 파일에 바로 기록 (메모리 사용량 일정)"""
+    with GifStreamWriter(filename, int(1000 / fps), loop=loop, transparent=transparent, dither=dither) as writer:
+        for _, _, img in _iter_clip_frames(clip, fps, transparent, app_instance, logger):
+            writer.write_frame(img)
 
 def perform_write_single_image(clip, filename, timestamp, settings, app_instance, webp_q=80, webp_l=False):
     """한 프레임을 단일 이미지(JPG, PNG, WebP, GIF)로 저장하며 WebP 특화 옵션을 적용합니다."""
@@ -391,4 +1279,4 @@ def perform_write_single_image(clip, filename, timestamp, settings, app_instance
         return True
     except Exception as e:
         print(f"이미지 저장 실패: {e}")
-        return False
\ No newline at end of file
+        return False